@@ -2,14 +2,16 @@ import os
 from typing import Any, Union, cast
 
 from src.config.config_handler import load_config, save_config
-from src.config.models.config import AppConfig, AutomationConfig
+from src.config.models.config import AppConfig
+from src.config.snapshot import ConfigSnapshot, ConfigStore
 
 parent_dir = os.path.dirname(os.path.abspath(__file__))
 config_file = os.path.join(parent_dir, "config.yml")
 
 
-app_config: AppConfig = load_config(config_file)
-automation_config: AutomationConfig = cast(AutomationConfig, app_config.get("automation", {}))
+# Validated, immutable view of config.yml; swapped atomically on every accepted change.
+# There is no module-level config dict: read current_config(), or config_store.source() for a plain copy
+config_store = ConfigStore(load_config(config_file))
 
 
 
@@ -20,3 +22,7 @@ def save_app_config(config: Union[AppConfig, dict[str, Any]]) -> None:
 
 def get_app_config() -> AppConfig:
     return load_config(config_file)
+
+
+def current_config() -> ConfigSnapshot:
+    return config_store.snapshot
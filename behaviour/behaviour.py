@@ -1,17 +1,23 @@
-﻿import platform
+﻿import logging
+import platform
 import threading
-from typing import Mapping
+from typing import Mapping, Union
 
-from app_config import app_config
+from app_config import current_config
+from behaviour.events import OUTCOME_EVENTS, event_stream
 from behaviour.ids import BehaviourId
-from behaviour.models import BehaviourCategory
+from behaviour.models import BehaviourCategory, BehaviourOutcome
 from cleanup_manager import CleanupManager, CleanupTask
 from lib.autogui.actions.browser import Browser, Edge, Firefox
-from lib.cancellable_futures import CancellableThreadPoolExecutor, OperationCancelled, _current_executor
+from lib.cancellable_futures import CancellableThreadPoolExecutor, OperationCancelled, Step, _current_executor
+from lib.clock import clock
+from lib.selenium.command_profiler import command_profiler
 from lib.selenium.email_web_client import BaseEmailWebClient
 from lib.selenium.models import EmailClient, EmailClientUser
 from lib.selenium.selenium_controller import SeleniumController, getSeleniumController
 from lib.selenium.user import build_email_client_user
+from lib.tracing import Span, span, tracer
+from src.config.snapshot import UserSettings
 from src.logger import app_logger
 
 
@@ -24,6 +30,8 @@ class BaseBehaviour(threading.Thread):
         display_name: str - Human-readable name
         category: BehaviourCategory - Category (IDLE or ATTACK)
         description: str - Description of what the behaviour does
+        assets: tuple[str, ...] - Image assets (catalog names) the behaviour looks up on screen
+        pool_workers: int - Size of the behaviour's task pool (bounds how many steps overlap)
 
     Methods to override:
         is_available() - Class method to check if behaviour can run on this system
@@ -35,9 +43,11 @@ class BaseBehaviour(threading.Thread):
     display_name: str = "BaseBehaviour"
     category: BehaviourCategory = BehaviourCategory.IDLE
     description: str = ""
+    assets: tuple[str, ...] = ()
+    pool_workers: int = 4
 
     os_type: str = platform.system()
-    landscape_id = app_config["app"]["landscape_id"]
+    landscape_id: int = current_config().app.landscape_id
 
     def __init__(self, cleanup_manager: CleanupManager, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -45,8 +55,14 @@ class BaseBehaviour(threading.Thread):
         self.cleanup_manager = cleanup_manager
 
         self._cancel_event = threading.Event()
-        self.pool = CancellableThreadPoolExecutor(max_workers=1)
+        self.pool = CancellableThreadPoolExecutor(max_workers=self.pool_workers)
         self.pool._global_event = self._cancel_event
+        self.trace_id: str | None = None
+        self.outcome: BehaviourOutcome | None = None
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.error_type: str | None = None
+        self.cleanup_duration: float | None = None
 
     @classmethod
     def is_available(cls) -> bool:
@@ -59,18 +75,95 @@ class BaseBehaviour(threading.Thread):
     def request_cancel(self) -> None:
         self._cancel_event.set()
 
+    @property
+    def duration(self) -> float:
+        """Seconds the behaviour has run (so far, while still running)."""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or clock.monotonic()) - self.started_at
+
     def run(self):
         _current_executor.set(self.pool)
-        try:
-            self.run_behaviour()
-        except OperationCancelled:
-            app_logger.info(f"{self.__class__.__name__} cancelled")
-        except SystemExit:
-            app_logger.info(f"{self.__class__.__name__} interrupted via SystemExit")
-        except Exception as e:
-            app_logger.error(f"Error in {self.__class__.__name__}: {e}", exc_info=True)
-        finally:
-            self.cleanup()
+        self.started_at = clock.monotonic()
+        profile_id = None
+        with span(f"behaviour:{self.id}", behaviour=self.id) as root:
+            if root is not None:
+                self.trace_id = root.trace_id
+            else:
+                # Tracing is off: no span to attribute WebDriver commands to
+                profile_id = command_profiler.start_run(self.id)
+            event_stream.emit(
+                "behaviour_started", behaviour=self.id, trace_id=self.trace_id, category=self.category.value
+            )
+            try:
+                self.run_behaviour()
+                self.outcome = BehaviourOutcome.SUCCESS
+            except OperationCancelled:
+                self.outcome = BehaviourOutcome.CANCELLED
+                self._set_root_status(root, "cancelled")
+                app_logger.info(f"{self.__class__.__name__} cancelled")
+            except SystemExit:
+                # Actions call sys.exit() on their own failures too, not only on cancellation
+                self.outcome = BehaviourOutcome.CANCELLED if self.cancel_requested else BehaviourOutcome.FAILED
+                if self.outcome == BehaviourOutcome.FAILED:
+                    self.error_type = "SystemExit"
+                self._set_root_status(root, "cancelled")
+                app_logger.info(f"{self.__class__.__name__} interrupted via SystemExit")
+            except Exception as e:
+                self.outcome = BehaviourOutcome.FAILED
+                self.error_type = type(e).__name__
+                self._set_root_status(root, "error", self.error_type)
+                app_logger.error(f"Error in {self.__class__.__name__}: {e}", exc_info=True)
+            finally:
+                cleanup_started = clock.monotonic()
+                self.cleanup()
+                self.finished_at = clock.monotonic()
+                self.cleanup_duration = self.finished_at - cleanup_started
+                self._emit_finished()
+
+        if root is not None:
+            self._log_trace_summary(root.trace_id)
+            command_profiler.finish_run(root.trace_id)
+        else:
+            command_profiler.finish_run(profile_id)
+
+    def _emit_finished(self) -> None:
+        outcome = self.outcome or BehaviourOutcome.FAILED
+        event_stream.emit(
+            OUTCOME_EVENTS[outcome],
+            behaviour=self.id,
+            trace_id=self.trace_id,
+            duration=round(self.duration, 3),
+            cleanup_duration=round(self.cleanup_duration or 0.0, 3),
+            error=self.error_type,
+        )
+
+    @staticmethod
+    def _set_root_status(root: Span | None, status: str, error: str | None = None) -> None:
+        if root is not None:
+            root.status = status
+            root.error = error
+
+    def _log_trace_summary(self, trace_id: str, top: int = 5) -> None:
+        if not app_logger.isEnabledFor(logging.DEBUG):
+            return
+        summary = list(tracer.summarize(trace_id).items())[:top]
+        steps = ", ".join(f"{name} x{count} {total:.2f}s" for name, (count, total) in summary)
+        app_logger.debug("%s trace %s: %s", self.__class__.__name__, trace_id, steps)
+
+    def run_steps(self, *steps: Step, timeout: float | None = None) -> dict:
+        """Run *steps* on the behaviour pool, independent ones concurrently; returns results by step name.
+
+        Example::
+
+            results = self.run_steps(
+                Step("corpus", EmailManager),
+                Step("selenium", self.setup_web_email_behaviour, (self.user, self.email_client_type)),
+                Step("open_mail", lambda: self.browser.search_by_url(url), after=("selenium",)),
+            )
+        """
+        with span("steps", steps=len(steps)):
+            return self.pool.run_steps(steps, timeout=timeout)
 
     def run_behaviour(self):
         raise NotImplementedError("Subclasses must implement run_behaviour()")
@@ -138,7 +231,7 @@ class WebEmailBehaviour(WebBehaviour):
 
     def setup_web_email_behaviour(
         self,
-        user: Mapping[str, str],
+        user: Union[Mapping[str, str], UserSettings],
         email_client_type: EmailClient,
         force_external_credentials: bool = False,
         startup_sleep: float = 4,
@@ -0,0 +1,168 @@
+"""Priority queue of behaviours waiting to run.
+
+A binary heap ordered by ``(priority, seq)``.  Lower priorities run first,
+and ``seq`` is a monotonic counter, so equal priorities run in the order
+they were queued instead of by behaviour id.  Push and pop are O(log n).
+Cancelling by id is O(1): the entry is only marked, and pop skips it when it
+reaches the top.
+
+Each entry may carry a deadline (absolute ``time.time()``) or a TTL.  The
+queue does not check availability or expiry itself.  ``BehaviourManager``
+does that when it takes an entry off the queue, and reports the result to
+the entry's ``on_dequeue`` callback as a :class:`DequeueReason`.
+
+Usage::
+
+    queue = BehaviourQueue()
+    entry = queue.push("work_emails", priority=1, ttl=600, source="server")
+    queue.snapshot()          # [{"queue_id": "...", "behaviour_id": "work_emails", ...}]
+    queue.cancel(entry.queue_id)
+    queue.pop()               # None
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Optional
+
+from behaviour.ids import BehaviourId
+from src.logger import app_logger
+
+
+class DequeueReason(Enum):
+    STARTED = "started"
+    EXPIRED = "expired"
+    # Disabled or no longer available on this system when its turn came
+    UNAVAILABLE = "unavailable"
+    CANCELLED = "cancelled"
+    FAILED = "failed"
+
+
+@dataclass(order=True, slots=True)
+class QueuedBehaviour:
+    priority: int
+    seq: int
+    behaviour_id: BehaviourId = field(compare=False)
+    queue_id: str = field(compare=False)
+    deadline: Optional[float] = field(default=None, compare=False)
+    source: str = field(default="local", compare=False)
+    queued_at: float = field(default_factory=time.time, compare=False)
+    # Called exactly once when the entry leaves the queue: on_dequeue(entry, reason)
+    on_dequeue: Optional[Callable[["QueuedBehaviour", DequeueReason], None]] = field(
+        default=None, compare=False, repr=False
+    )
+    cancelled: bool = field(default=False, compare=False)
+
+    def expired(self, now: Optional[float] = None) -> bool:
+        return self.deadline is not None and (now or time.time()) > self.deadline
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "queue_id": self.queue_id,
+            "behaviour_id": self.behaviour_id,
+            "priority": self.priority,
+            "source": self.source,
+            "queued_at": self.queued_at,
+            "deadline": self.deadline,
+        }
+
+
+class BehaviourQueue:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._heap: list[QueuedBehaviour] = []
+        self._entries: dict[str, QueuedBehaviour] = {}
+        self._seq = itertools.count()
+
+    def push(
+        self,
+        behaviour_id: BehaviourId,
+        priority: int = 0,
+        deadline: Optional[float] = None,
+        ttl: Optional[float] = None,
+        source: str = "local",
+        on_dequeue: Optional[Callable[[QueuedBehaviour, DequeueReason], None]] = None,
+        queue_id: Optional[str] = None,
+    ) -> QueuedBehaviour:
+        """Queue *behaviour_id*; with both *deadline* and *ttl* the earlier one applies."""
+        if ttl is not None:
+            ttl_deadline = time.time() + ttl
+            deadline = ttl_deadline if deadline is None else min(deadline, ttl_deadline)
+
+        with self._lock:
+            queue_id = queue_id or uuid.uuid4().hex[:12]
+            if queue_id in self._entries:
+                raise ValueError(f"Queue id '{queue_id}' is already queued")
+
+            entry = QueuedBehaviour(
+                priority, next(self._seq), behaviour_id, queue_id, deadline, source, on_dequeue=on_dequeue
+            )
+            heapq.heappush(self._heap, entry)
+            self._entries[queue_id] = entry
+            return entry
+
+    def pop(self) -> Optional[QueuedBehaviour]:
+        """Remove and return the next live entry, or ``None`` if the queue is empty."""
+        with self._lock:
+            while self._heap:
+                entry = heapq.heappop(self._heap)
+                if not entry.cancelled:
+                    del self._entries[entry.queue_id]
+                    return entry
+            return None
+
+    def cancel(self, queue_id: str) -> Optional[QueuedBehaviour]:
+        """Cancel a queued entry; returns it, or ``None`` if it is not (or no longer) queued."""
+        with self._lock:
+            entry = self._entries.pop(queue_id, None)
+            if entry is None:
+                return None
+            entry.cancelled = True
+            self._compact()
+        self.notify(entry, DequeueReason.CANCELLED)
+        return entry
+
+    def cancel_behaviour(self, behaviour_id: BehaviourId) -> list[QueuedBehaviour]:
+        """Cancel every queued entry of *behaviour_id*."""
+        with self._lock:
+            entries = [e for e in self._entries.values() if e.behaviour_id == behaviour_id]
+        return [entry for entry in map(self.cancel, [e.queue_id for e in entries]) if entry is not None]
+
+    def _compact(self) -> None:
+        # Drop cancelled entries once they are the majority, so the heap stays O(live entries)
+        if len(self._heap) > 2 * len(self._entries) + 16:
+            self._heap = [entry for entry in self._heap if not entry.cancelled]
+            heapq.heapify(self._heap)
+
+    @staticmethod
+    def notify(entry: QueuedBehaviour, reason: DequeueReason) -> None:
+        """Report why *entry* left the queue to its ``on_dequeue`` callback."""
+        if entry.on_dequeue is None:
+            return
+        try:
+            entry.on_dequeue(entry, reason)
+        except Exception as ex:
+            app_logger.error(f"Error in dequeue callback for '{entry.behaviour_id}': {ex}")
+
+    def get(self, queue_id: str) -> Optional[QueuedBehaviour]:
+        with self._lock:
+            return self._entries.get(queue_id)
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """Live entries in the order they would run."""
+        with self._lock:
+            entries = sorted(self._entries.values())
+        return [entry.to_dict() for entry in entries]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def empty(self) -> bool:
+        return len(self) == 0
@@ -1,6 +1,6 @@
 from typing import Type, TypeVar, overload
 
-from app_config import automation_config
+from app_config import current_config
 from behaviour.models.exceptions import BehaviourException
 
 T = TypeVar("T")
@@ -24,9 +24,10 @@ def get_behaviour_cfg(behaviour_id: str, cfg_type: type = object, required: bool
         required: If True, raises BehaviourException when config not found
 
     Returns:
-        Behaviour configuration dict, or empty dict if not found and not required
+        Read-only behaviour configuration mapping from the current config snapshot,
+        or an empty mapping if not found and not required
     """
-    config = automation_config.get("behaviours", {}).get(behaviour_id, {})
+    config = current_config().behaviour(behaviour_id)
     if not config and required:
         raise BehaviourException(f"Configuration for task '{behaviour_id}' not found")
     return config
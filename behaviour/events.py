@@ -0,0 +1,279 @@
+"""Behaviour lifecycle events streamed to the server.
+
+The periodic status update only shows the behaviour running at that moment.
+Every behaviour run here also emits structured events:
+
+- ``behaviour_started``
+- ``step_completed``: one per finished pool task (``task:*`` span), with its
+  duration and status.  These come from the tracer, so they are only emitted
+  while ``tracing.enabled`` is on
+- ``behaviour_completed`` / ``behaviour_cancelled`` / ``behaviour_failed``:
+  with duration, ``cleanup_duration`` and, for failures, the exception class
+
+Each event carries the ``session`` id of the process that emitted it and a
+sequence number, so the server can order and de-duplicate them.  Events are
+buffered in memory and sent in batches with each server-connection cycle
+(``{"type": "events", "events": [...]}``).  While the client is offline, or
+when the buffer fills up, buffered events are spilled to an append-only
+JSON-lines file.  On reconnect that file is sent first, so events arrive in
+order.  The spool keeps at most ``max_spooled_events``; beyond that the oldest
+events are dropped (and logged), so a long outage cannot fill the disk.  The
+number of spooled events is counted once and then tracked, so
+:attr:`EventStream.pending` stays cheap however large the spool is.
+
+Usage::
+
+    event_stream.configure(current_config().raw.get("events"))
+    event_stream.emit("behaviour_started", behaviour="work_emails", trace_id=trace_id)
+
+    event_stream.flush(websocket.send)   # connected: send spooled, then buffered events
+    event_stream.spill()                 # offline: move buffered events to disk
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Callable, Optional
+
+from behaviour.models import BehaviourOutcome
+from lib.tracing import Span, tracer
+from src.config.models.config import EventsConfig
+from src.logger import app_logger
+
+DEFAULT_SPOOL_PATH: str = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "behaviour_events.jsonl"
+)
+DEFAULT_BUFFER_SIZE: int = 1000
+DEFAULT_BATCH_SIZE: int = 100
+DEFAULT_MAX_SPOOLED_EVENTS: int = 50_000
+# Share of max_spooled_events kept when the spool is trimmed, so it is not rewritten on every spill
+SPOOL_TRIM_RATIO: float = 0.9
+
+OUTCOME_EVENTS: dict[BehaviourOutcome, str] = {
+    BehaviourOutcome.SUCCESS: "behaviour_completed",
+    BehaviourOutcome.CANCELLED: "behaviour_cancelled",
+    BehaviourOutcome.FAILED: "behaviour_failed",
+}
+
+
+class _StepExporter:
+    """Tracer exporter that turns finished pool tasks of a behaviour run into ``step_completed`` events."""
+
+    def __init__(self, stream: "EventStream"):
+        self._stream = stream
+
+    def export(self, span: Span) -> None:
+        if span.behaviour and span.name.startswith("task:"):
+            self._stream.emit(
+                "step_completed",
+                behaviour=span.behaviour,
+                trace_id=span.trace_id,
+                step=span.step,
+                duration=round(span.duration, 3),
+                status=span.status,
+                error=span.error,
+            )
+
+    def close(self) -> None:
+        pass
+
+
+class EventStream:
+    def __init__(
+        self,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        spool_path: Optional[str] = DEFAULT_SPOOL_PATH,
+        max_spooled_events: int = DEFAULT_MAX_SPOOLED_EVENTS,
+    ):
+        self.enabled = True
+        self.buffer_size = buffer_size
+        self.batch_size = batch_size
+        self.spool_path = spool_path
+        self.max_spooled_events = max_spooled_events
+        # Events in the spool file; None until counted
+        self._spooled: Optional[int] = None
+        self.session = uuid.uuid4().hex
+        self._seq = 0
+        self._lock = threading.Lock()
+        # Serialises flush/spill, which touch the spool file; never held while emitting
+        self._io_lock = threading.Lock()
+        self._buffer: deque[dict[str, Any]] = deque()
+        self._exporter: Optional[_StepExporter] = None
+        # Set in a supervised worker: events go to the parent process instead of the buffer
+        self._redirect: Optional[Callable[[str, dict[str, Any]], None]] = None
+
+    def configure(self, config: Optional[EventsConfig]) -> None:
+        config = config or {}
+        self.enabled = config.get("enabled", True)
+        self.buffer_size = int(config.get("buffer_size", DEFAULT_BUFFER_SIZE))
+        self.batch_size = int(config.get("batch_size", DEFAULT_BATCH_SIZE))
+        self.max_spooled_events = int(config.get("max_spooled_events", DEFAULT_MAX_SPOOLED_EVENTS))
+        spool_path = config.get("spool_path") or DEFAULT_SPOOL_PATH
+        if spool_path != self.spool_path:
+            self.spool_path = spool_path
+            self._spooled = None
+
+        if self.enabled and self._exporter is None:
+            self._exporter = _StepExporter(self)
+            tracer.add_exporter(self._exporter)
+
+    def redirect(self, sink: Optional[Callable[[str, dict[str, Any]], None]]) -> None:
+        """Hand every emitted event to ``sink(event_type, fields)`` instead of buffering it; ``None`` restores."""
+        self._redirect = sink
+
+    # -- producing -----------------------------------------------------------
+
+    def emit(self, event_type: str, **fields: Any) -> None:
+        if not self.enabled:
+            return
+        if self._redirect is not None:
+            self._redirect(event_type, fields)
+            return
+
+        with self._lock:
+            self._seq += 1
+            event = {"type": event_type, "session": self.session, "seq": self._seq, "ts": time.time(), **fields}
+            self._buffer.append(event)
+            full = len(self._buffer) >= self.buffer_size
+        if full:
+            self.spill()
+
+    @property
+    def pending(self) -> int:
+        """Events not yet sent (buffered in memory plus spooled on disk)."""
+        with self._lock:
+            buffered = len(self._buffer)
+        return buffered + self._spooled_count()
+
+    # -- spool ---------------------------------------------------------------
+
+    def _spooled_count(self) -> int:
+        spooled = self._spooled
+        if spooled is not None:
+            return spooled
+        with self._io_lock:
+            if self._spooled is None:
+                self._spooled = self._count_spool()
+            return self._spooled
+
+    def _count_spool(self) -> int:
+        if not self.spool_path or not os.path.exists(self.spool_path):
+            return 0
+        try:
+            with open(self.spool_path, "rb") as f:
+                return sum(1 for line in f if line.strip())
+        except OSError:
+            return 0
+
+    def _read_spool(self) -> list[dict[str, Any]]:
+        if not self.spool_path or not os.path.exists(self.spool_path):
+            return []
+
+        events = []
+        with open(self.spool_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    # Half-written last line after a hard kill
+                    continue
+        return events
+
+    def _write_spool(self, events: list[dict[str, Any]], mode: str) -> bool:
+        if not self.spool_path:
+            return False
+        tmp_path = f"{self.spool_path}.tmp" if mode == "w" else self.spool_path
+        try:
+            with open(tmp_path, mode, encoding="utf-8") as f:
+                f.writelines(json.dumps(event, default=str) + "\n" for event in events)
+            if mode == "w":
+                os.replace(tmp_path, self.spool_path)
+            return True
+        except OSError as e:
+            app_logger.warning("Could not spool %d behaviour event(s) to %s: %s", len(events), self.spool_path, e)
+            return False
+
+    def spill(self) -> None:
+        """Move buffered events to the spool file (offline, or buffer full)."""
+        with self._io_lock:
+            with self._lock:
+                events, self._buffer = list(self._buffer), deque()
+            if not events:
+                return
+            if not self._write_spool(events, "a"):
+                # Keep them in memory rather than lose them; the oldest go first if that overflows too
+                with self._lock:
+                    self._buffer.extendleft(reversed(events[-self.buffer_size :]))
+                return
+
+            spooled = (self._count_spool() if self._spooled is None else self._spooled) + len(events)
+            self._spooled = spooled
+            if spooled > self.max_spooled_events:
+                self._trim_spool()
+
+    def _trim_spool(self) -> None:
+        """Drop the oldest spooled events down to ``SPOOL_TRIM_RATIO`` of the cap; holds ``_io_lock``."""
+        events = self._read_spool()
+        keep = int(self.max_spooled_events * SPOOL_TRIM_RATIO)
+        dropped = max(0, len(events) - keep)
+        if dropped and self._write_spool(events[dropped:], "w"):
+            self._spooled = len(events) - dropped
+            app_logger.warning(
+                "Behaviour event spool exceeded %d events; dropped the %d oldest", self.max_spooled_events, dropped
+            )
+        else:
+            self._spooled = len(events)
+
+    # -- sending -------------------------------------------------------------
+
+    def _batch_message(self, events: list[dict[str, Any]]) -> str:
+        return json.dumps({"type": "events", "hostname": socket.gethostname(), "events": events}, default=str)
+
+    def flush(self, send: Callable[[str], Any]) -> int:
+        """Send spooled, then buffered events in batches through *send*; returns the number sent.
+
+        If *send* raises, the unsent events are kept (on disk) and the error propagates.
+        """
+        with self._io_lock:
+            spooled = self._read_spool()
+            with self._lock:
+                buffered, self._buffer = list(self._buffer), deque()
+            events = spooled + buffered
+            if not events:
+                return 0
+
+            sent = 0
+            try:
+                while sent < len(events):
+                    batch = events[sent : sent + self.batch_size]
+                    send(self._batch_message(batch))
+                    sent += len(batch)
+            finally:
+                remaining = events[sent:]
+                if remaining:
+                    if self._write_spool(remaining, "w"):
+                        self._spooled = len(remaining)
+                    else:
+                        self._spooled = None
+                        with self._lock:
+                            self._buffer.extendleft(reversed(remaining[-self.buffer_size :]))
+                elif spooled and self.spool_path:
+                    try:
+                        os.remove(self.spool_path)
+                        self._spooled = 0
+                    except OSError as e:
+                        self._spooled = None
+                        app_logger.warning("Could not remove sent behaviour events from %s: %s", self.spool_path, e)
+                else:
+                    self._spooled = 0
+            return sent
+
+
+event_stream = EventStream()
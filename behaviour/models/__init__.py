@@ -4,3 +4,9 @@ from enum import Enum
 class BehaviourCategory(Enum):
     IDLE = "Idle"
     ATTACK = "Attack"
+
+
+class BehaviourOutcome(Enum):
+    SUCCESS = "success"
+    CANCELLED = "cancelled"
+    FAILED = "failed"
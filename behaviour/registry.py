@@ -13,6 +13,10 @@ from behaviours.work_emails import BehaviourWorkEmails
 from behaviours.work_organization_web import BehaviourWorkOrganizationWeb
 from behaviours.work_presentation import BehaviourWorkPresentation
 from behaviours.work_spreadsheet import BehaviourWorkSpreadsheet
+from lib.autogui.actions.apps import ms_office
+from lib.autogui.actions.roundcube_web import roundcube_web
+from lib.autogui.actions.win_utils import win_utils
+from lib.autogui.assets import asset_catalog
 
 BEHAVIOURS: list[Type[BaseBehaviour]] = [
     BehaviourAttackPhishing,
@@ -28,6 +32,9 @@ BEHAVIOURS: list[Type[BaseBehaviour]] = [
     BehaviourWorkPresentation,
 ]
 
+# Action helpers that look up images on behalf of behaviours; every module lists its images in ``ASSETS``
+ASSET_MODULES = (ms_office, roundcube_web, win_utils)
+
 
 def get_registered_behaviour_ids(
     behaviour_classes: list[Type[BaseBehaviour]] = BEHAVIOURS,
@@ -59,3 +66,19 @@ def validate_behaviour_registry(
     if duplicate_ids:
         duplicates = ", ".join(sorted(duplicate_ids))
         raise ValueError(f"Duplicate behaviour IDs detected in registry: {duplicates}")
+
+    validate_behaviour_assets(behaviour_classes)
+
+
+def validate_behaviour_assets(
+    behaviour_classes: list[Type[BaseBehaviour]] = BEHAVIOURS,
+) -> None:
+    """Fail at start-up on missing or stale image assets instead of mid-behaviour after a lookup timeout."""
+    problems: list[str] = []
+    for behaviour_class in behaviour_classes:
+        problems += [f"{behaviour_class.id}: {problem}" for problem in asset_catalog.validate(behaviour_class.assets)]
+    for module in ASSET_MODULES:
+        problems += [f"{module.__name__}: {problem}" for problem in asset_catalog.validate(module.ASSETS)]
+
+    if problems:
+        raise ValueError("Invalid image assets in registry:\n  " + "\n  ".join(problems))
@@ -0,0 +1,331 @@
+"""Idle behaviour schedulers.
+
+``BehaviourManager`` asks its scheduler for the next idle behaviour whenever
+nothing is queued.  Two schedulers ship by default, selected by
+``automation.idle_cycle.scheduler``:
+
+- ``uniform``: uniform random pick that avoids the most recent behaviours.
+  This was the original behaviour.
+- ``weighted`` (default): the same recency rule on top of per-behaviour
+  weights, working-hours windows (with per-window weight overrides),
+  expected durations that must fit in the rest of the window (configured, or
+  learned from the run statistics in :mod:`behaviour.stats`), daily run-time
+  budgets and cooldowns between starts.
+
+Both honour ``idle_cycle.procrastination_chance`` (negative disables it).
+The roll only chooses among candidates that are eligible right now, so it
+never bypasses working hours, budgets or cooldowns.
+All bookkeeping uses bounded structures, so a pick costs O(candidates)
+however long the client has been running.  More schedulers can be added with
+:func:`register_scheduler`.
+
+Usage::
+
+    scheduler = create_scheduler(current_config().idle_cycle, stats_store)
+    behaviour_id = scheduler.pick(["work_emails", "work_document", "procrastination"])
+    scheduler.record_start(behaviour_id)
+    ...
+    scheduler.record_finish(behaviour_id)
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import threading
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from datetime import time as dt_time
+from typing import Iterator, Optional, Sequence, Type
+
+from behaviour.ids import BehaviourId
+from behaviour.stats import StatsStore
+from lib.clock import clock
+from lib.general.random_choice import weighted_random_choice
+from src.config.models.config import IdleCycle, WorkingHours
+
+DEFAULT_SCHEDULER: str = "weighted"
+DEFAULT_HISTORY_SIZE: int = 32
+DEFAULT_WORKING_DAYS: tuple[int, ...] = (0, 1, 2, 3, 4)
+PROCRASTINATION_ID: BehaviourId = "procrastination"
+# Runs needed before the recorded p95 duration stands in for a missing expected duration
+MIN_RUNS_FOR_ESTIMATE: int = 5
+
+
+class RecentHistory:
+    """The last ``maxlen`` starts with O(1) append and membership test."""
+
+    def __init__(self, maxlen: int):
+        self._entries: deque[BehaviourId] = deque(maxlen=max(0, maxlen))
+        self._counts: Counter[BehaviourId] = Counter()
+
+    @property
+    def maxlen(self) -> int:
+        return self._entries.maxlen or 0
+
+    def append(self, behaviour_id: BehaviourId) -> None:
+        if not self.maxlen:
+            return
+        if len(self._entries) == self.maxlen:
+            self._forget(self._entries[0])
+        self._entries.append(behaviour_id)
+        self._counts[behaviour_id] += 1
+
+    def _forget(self, behaviour_id: BehaviourId) -> None:
+        self._counts[behaviour_id] -= 1
+        if self._counts[behaviour_id] <= 0:
+            del self._counts[behaviour_id]
+
+    def resize(self, maxlen: int) -> None:
+        """Keep the newest *maxlen* entries; only called when the candidate set changes size."""
+        maxlen = max(0, maxlen)
+        if maxlen == self.maxlen:
+            return
+        entries = list(self._entries)[-maxlen:] if maxlen else []
+        self._entries = deque(entries, maxlen=maxlen)
+        self._counts = Counter(entries)
+
+    def __contains__(self, behaviour_id: object) -> bool:
+        return behaviour_id in self._counts
+
+    def __iter__(self) -> Iterator[BehaviourId]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@dataclass(slots=True)
+class Window:
+    start: dt_time
+    # None for no working hours at all: the window never ends
+    end: Optional[dt_time]
+    weights: dict[BehaviourId, float] = field(default_factory=dict)
+
+    def seconds_left(self, now: datetime) -> float:
+        if self.end is None:
+            return math.inf
+        return (datetime.combine(now.date(), self.end) - now).total_seconds()
+
+
+def _parse_time(value: str) -> dt_time:
+    try:
+        return datetime.strptime(str(value), "%H:%M").time()
+    except ValueError:
+        raise ValueError(f"Invalid working hours time '{value}', expected HH:MM") from None
+
+
+def _parse_amounts(values: Optional[dict], setting: str) -> dict[BehaviourId, float]:
+    """Per-behaviour numbers of *setting* (weights, budgets, cooldowns); each must be finite and non-negative."""
+    amounts = {}
+    for behaviour_id, value in (values or {}).items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or value < 0:
+            raise ValueError(f"Invalid {setting} for '{behaviour_id}': {value!r}, expected a non-negative number")
+        amounts[behaviour_id] = float(value)
+    return amounts
+
+
+def _parse_working_hours(config: Optional[WorkingHours]) -> tuple[Optional[frozenset[int]], list[Window]]:
+    if not config:
+        return None, []
+
+    days = frozenset(config.get("days", DEFAULT_WORKING_DAYS))
+    windows = []
+    for window in config.get("windows", []):
+        start, end = _parse_time(window["start"]), _parse_time(window["end"])
+        if end <= start:
+            raise ValueError(f"Working hours window {window['start']}-{window['end']} must end after it starts")
+        weights = _parse_amounts(window.get("weights"), f"weight in window {window['start']}-{window['end']}")
+        windows.append(Window(start, end, weights))
+    return days, windows
+
+
+class IdleScheduler:
+    """Base scheduler: recency, procrastination chance and run-time bookkeeping.
+
+    Subclasses narrow the candidates down in :meth:`_eligible_candidates`
+    and implement :meth:`_pick` over the eligible ones that survived the
+    procrastination roll.
+    """
+
+    name: str = ""
+
+    def __init__(self, config: Optional[IdleCycle] = None, stats: Optional[StatsStore] = None):
+        self.stats = stats
+        self._lock = threading.Lock()
+        self._recent = RecentHistory(0)
+        self.history: deque[BehaviourId] = deque(maxlen=DEFAULT_HISTORY_SIZE)
+        self._started_at: dict[BehaviourId, float] = {}
+        self._last_start: dict[BehaviourId, float] = {}
+        self._usage_day: Optional[date] = None
+        self._usage: Counter[BehaviourId] = Counter()
+        self.configure(config or {})
+
+    def configure(self, config: IdleCycle) -> None:
+        """Apply a (new) ``idle_cycle`` config while keeping the run history."""
+        self.config = config
+        self.procrastination_chance = float(config.get("procrastination_chance", -1.0))
+        history_size = int(config.get("history_size", DEFAULT_HISTORY_SIZE))
+        if history_size != self.history.maxlen:
+            self.history = deque(self.history, maxlen=history_size)
+
+    def pick(self, candidates: Sequence[BehaviourId], now: Optional[datetime] = None) -> Optional[BehaviourId]:
+        """Next idle behaviour out of *candidates*, or ``None`` if none should run now."""
+        if not candidates:
+            return None
+        now = now or clock.now()
+
+        with self._lock:
+            # Excluding all but one candidate keeps the original "no recent repeats" rule
+            self._recent.resize(len(candidates) - 1)
+            self._roll_usage_day(now)
+
+            eligible = self._eligible_candidates(list(candidates), now)
+            if not eligible:
+                return None
+
+            if self.procrastination_chance >= 0 and PROCRASTINATION_ID in eligible:
+                if random.random() < self.procrastination_chance:
+                    return PROCRASTINATION_ID
+                eligible = [c for c in eligible if c != PROCRASTINATION_ID] or eligible
+
+            return self._pick(eligible, now)
+
+    def _eligible_candidates(self, candidates: list[BehaviourId], now: datetime) -> list[BehaviourId]:
+        """Candidates allowed to start at *now*; all of them by default."""
+        return candidates
+
+    def _pick(self, candidates: list[BehaviourId], now: datetime) -> Optional[BehaviourId]:
+        raise NotImplementedError
+
+    def _not_recent(self, candidates: list[BehaviourId]) -> list[BehaviourId]:
+        return [c for c in candidates if c not in self._recent] or candidates
+
+    # -- bookkeeping ---------------------------------------------------------
+
+    def _roll_usage_day(self, now: datetime) -> None:
+        if self._usage_day != now.date():
+            self._usage_day = now.date()
+            self._usage.clear()
+
+    def record_start(self, behaviour_id: BehaviourId) -> None:
+        started_at = clock.monotonic()
+        with self._lock:
+            self._recent.append(behaviour_id)
+            self.history.append(behaviour_id)
+            self._started_at[behaviour_id] = started_at
+            self._last_start[behaviour_id] = started_at
+
+    def record_finish(self, behaviour_id: BehaviourId, now: Optional[datetime] = None) -> float:
+        """Account the run time of *behaviour_id* against today's budget; returns the seconds run."""
+        with self._lock:
+            started_at = self._started_at.pop(behaviour_id, None)
+            if started_at is None:
+                return 0.0
+            elapsed = clock.monotonic() - started_at
+            self._roll_usage_day(now or clock.now())
+            self._usage[behaviour_id] += elapsed
+            return elapsed
+
+    def usage_today(self, behaviour_id: BehaviourId) -> float:
+        with self._lock:
+            return self._usage.get(behaviour_id, 0.0)
+
+    def expected_duration(self, behaviour_id: BehaviourId) -> Optional[float]:
+        """Configured expected duration, else the p95 of recorded runs once there are enough of them."""
+        configured = self.config.get("expected_durations", {}).get(behaviour_id)
+        if configured is not None:
+            return float(configured)
+
+        stats = self.stats.get(behaviour_id) if self.stats is not None else None
+        if stats is not None and stats.runs >= MIN_RUNS_FOR_ESTIMATE:
+            return stats.p95
+        return None
+
+    def seconds_since_start(self, behaviour_id: BehaviourId) -> Optional[float]:
+        last_start = self._last_start.get(behaviour_id)
+        return None if last_start is None else clock.monotonic() - last_start
+
+
+class UniformScheduler(IdleScheduler):
+    name = "uniform"
+
+    def _pick(self, candidates: list[BehaviourId], now: datetime) -> Optional[BehaviourId]:
+        return random.choice(self._not_recent(candidates))
+
+
+class WeightedScheduler(IdleScheduler):
+    """Weighted pick restricted by working hours, expected durations, daily budgets and cooldowns."""
+
+    name = "weighted"
+
+    def configure(self, config: IdleCycle) -> None:
+        self.weights = _parse_amounts(config.get("weights"), "weight")
+        self.daily_budgets = _parse_amounts(config.get("daily_budgets"), "daily budget")
+        self.cooldowns = _parse_amounts(config.get("cooldowns"), "cooldown")
+        self.working_days, self.windows = _parse_working_hours(config.get("working_hours"))
+        super().configure(config)
+
+    def current_window(self, now: datetime) -> Optional[Window]:
+        """Working-hours window containing *now*; ``None`` outside working hours."""
+        if self.working_days is None:
+            return Window(dt_time.min, None)
+        if now.weekday() not in self.working_days:
+            return None
+        if not self.windows:
+            # Working days without hours: no window end to fit expected durations into
+            return Window(dt_time.min, None)
+        return next((w for w in self.windows if w.start <= now.time() < w.end), None)
+
+    def _eligible(self, behaviour_id: BehaviourId, window: Window, now: datetime) -> bool:
+        cooldown = self.cooldowns.get(behaviour_id)
+        if cooldown is not None:
+            since_start = self.seconds_since_start(behaviour_id)
+            if since_start is not None and since_start < cooldown:
+                return False
+
+        budget = self.daily_budgets.get(behaviour_id)
+        if budget is not None and self._usage.get(behaviour_id, 0.0) >= budget:
+            return False
+
+        expected = self.expected_duration(behaviour_id)
+        if expected is not None and expected > window.seconds_left(now):
+            return False
+        return True
+
+    def _weights(self, window: Window) -> dict[BehaviourId, float]:
+        return {**self.weights, **window.weights}
+
+    def _eligible_candidates(self, candidates: list[BehaviourId], now: datetime) -> list[BehaviourId]:
+        window = self.current_window(now)
+        if window is None:
+            return []
+
+        weights = self._weights(window)
+        return [c for c in candidates if weights.get(c, 1.0) > 0 and self._eligible(c, window, now)]
+
+    def _pick(self, candidates: list[BehaviourId], now: datetime) -> Optional[BehaviourId]:
+        weights = self._weights(self.current_window(now))
+        return weighted_random_choice({c: weights.get(c, 1.0) for c in self._not_recent(candidates)})
+
+
+SCHEDULERS: dict[str, Type[IdleScheduler]] = {
+    UniformScheduler.name: UniformScheduler,
+    WeightedScheduler.name: WeightedScheduler,
+}
+
+
+def register_scheduler(scheduler_class: Type[IdleScheduler]) -> Type[IdleScheduler]:
+    """Make a scheduler selectable via ``idle_cycle.scheduler``; usable as a class decorator."""
+    SCHEDULERS[scheduler_class.name] = scheduler_class
+    return scheduler_class
+
+
+def create_scheduler(config: Optional[IdleCycle] = None, stats: Optional[StatsStore] = None) -> IdleScheduler:
+    config = config or {}
+    name = config.get("scheduler", DEFAULT_SCHEDULER)
+    scheduler_class = SCHEDULERS.get(name)
+    if scheduler_class is None:
+        raise ValueError(f"Unknown idle scheduler '{name}', expected one of: {', '.join(sorted(SCHEDULERS))}")
+    return scheduler_class(config, stats)
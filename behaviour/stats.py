@@ -0,0 +1,210 @@
+"""Per-behaviour run statistics, persisted across restarts.
+
+Every finished run is folded into a :class:`BehaviourStats` (runs, successes,
+cancels, failures, mean and p95 duration).  Memory stays constant: the p95 is
+computed over the last ``DURATION_SAMPLES`` durations only.
+
+The store is an append-only JSON-lines file: one ``run`` record per finished
+behaviour, flushed immediately, so a crash loses at most the run in flight.
+After ``compact_after`` appended records the file is rewritten atomically as
+one ``snapshot`` record per behaviour, so it never grows past a few hundred
+lines.
+
+Usage::
+
+    store = StatsStore.from_config(current_config().raw.get("stats"))
+    store.record("work_emails", BehaviourOutcome.SUCCESS, 312.5)
+    store.get("work_emails").p95          # 401.2
+    store.snapshot()                      # {"work_emails": {"runs": 12, ...}}
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from behaviour.ids import BehaviourId
+from behaviour.models import BehaviourOutcome
+from src.config.models.config import StatsConfig
+from src.logger import app_logger
+
+DEFAULT_STATS_PATH: str = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "behaviour_stats.jsonl"
+)
+DURATION_SAMPLES: int = 200
+COMPACT_AFTER: int = 500
+
+
+@dataclass(slots=True)
+class BehaviourStats:
+    runs: int = 0
+    successes: int = 0
+    cancels: int = 0
+    failures: int = 0
+    total_duration: float = 0.0
+    last_run: Optional[float] = None
+    durations: deque[float] = field(default_factory=lambda: deque(maxlen=DURATION_SAMPLES))
+
+    def add(self, outcome: BehaviourOutcome, duration: float, timestamp: float) -> None:
+        self.runs += 1
+        if outcome == BehaviourOutcome.SUCCESS:
+            self.successes += 1
+        elif outcome == BehaviourOutcome.CANCELLED:
+            self.cancels += 1
+        else:
+            self.failures += 1
+        self.total_duration += duration
+        self.durations.append(duration)
+        self.last_run = timestamp
+
+    @property
+    def mean(self) -> float:
+        return self.total_duration / self.runs if self.runs else 0.0
+
+    @property
+    def p95(self) -> float:
+        """95th percentile (nearest rank) over the recent duration samples."""
+        if not self.durations:
+            return 0.0
+        ordered = sorted(self.durations)
+        return ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "successes": self.successes,
+            "cancels": self.cancels,
+            "failures": self.failures,
+            "mean_duration": round(self.mean, 3),
+            "p95_duration": round(self.p95, 3),
+            "last_run": self.last_run,
+        }
+
+    def to_record(self) -> dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "successes": self.successes,
+            "cancels": self.cancels,
+            "failures": self.failures,
+            "total_duration": self.total_duration,
+            "last_run": self.last_run,
+            "durations": [round(d, 3) for d in self.durations],
+        }
+
+    @classmethod
+    def from_record(cls, record: dict[str, Any]) -> "BehaviourStats":
+        stats = cls(
+            runs=int(record.get("runs", 0)),
+            successes=int(record.get("successes", 0)),
+            cancels=int(record.get("cancels", 0)),
+            failures=int(record.get("failures", 0)),
+            total_duration=float(record.get("total_duration", 0.0)),
+            last_run=record.get("last_run"),
+        )
+        stats.durations.extend(float(d) for d in record.get("durations", []))
+        return stats
+
+
+class StatsStore:
+    def __init__(self, path: Optional[str] = DEFAULT_STATS_PATH, compact_after: int = COMPACT_AFTER):
+        self.path = path
+        self.compact_after = compact_after
+        self._lock = threading.Lock()
+        self._stats: dict[BehaviourId, BehaviourStats] = {}
+        self._appended = 0
+        self._load()
+
+    @classmethod
+    def from_config(cls, config: Optional[StatsConfig]) -> "StatsStore":
+        config = config or {}
+        if not config.get("enabled", True):
+            return cls(path=None)
+        return cls(config.get("path") or DEFAULT_STATS_PATH, int(config.get("compact_after", COMPACT_AFTER)))
+
+    # -- persistence ---------------------------------------------------------
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        skipped = 0
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    if record["type"] == "snapshot":
+                        self._stats[record["id"]] = BehaviourStats.from_record(record["stats"])
+                    else:
+                        stats = self._stats.setdefault(record["id"], BehaviourStats())
+                        stats.add(BehaviourOutcome(record["outcome"]), float(record["duration"]), record["ts"])
+                        self._appended += 1
+                except (ValueError, KeyError, TypeError):
+                    # Typically a half-written last line after a hard kill
+                    skipped += 1
+
+        if skipped:
+            app_logger.warning(f"Skipped {skipped} unreadable record(s) in {self.path}")
+        if self._appended >= self.compact_after or skipped:
+            self._compact()
+
+    def _append(self, record: dict[str, Any]) -> None:
+        if not self.path:
+            return
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+            self._appended += 1
+        except OSError as e:
+            app_logger.warning(f"Could not persist behaviour stats to {self.path}: {e}")
+            return
+
+        if self._appended >= self.compact_after:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Rewrite the file as one snapshot per behaviour (atomic replace)."""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for behaviour_id, stats in self._stats.items():
+                    f.write(json.dumps({"type": "snapshot", "id": behaviour_id, "stats": stats.to_record()}) + "\n")
+            os.replace(tmp_path, self.path)
+            self._appended = 0
+        except OSError as e:
+            app_logger.warning(f"Could not compact behaviour stats in {self.path}: {e}")
+
+    # -- public API ----------------------------------------------------------
+
+    def record(self, behaviour_id: BehaviourId, outcome: BehaviourOutcome, duration: float) -> None:
+        timestamp = time.time()
+        with self._lock:
+            self._stats.setdefault(behaviour_id, BehaviourStats()).add(outcome, duration, timestamp)
+            self._append(
+                {
+                    "type": "run",
+                    "id": behaviour_id,
+                    "outcome": outcome.value,
+                    "duration": round(duration, 3),
+                    "ts": timestamp,
+                }
+            )
+
+    def get(self, behaviour_id: BehaviourId) -> Optional[BehaviourStats]:
+        with self._lock:
+            return self._stats.get(behaviour_id)
+
+    def snapshot(self) -> dict[BehaviourId, dict[str, Any]]:
+        with self._lock:
+            return {behaviour_id: stats.to_dict() for behaviour_id, stats in self._stats.items()}
+
+    def compact(self) -> None:
+        with self._lock:
+            self._compact()
@@ -0,0 +1,260 @@
+"""Resource leak watchdog: memory, threads, handles and browser processes.
+
+The client runs for days, and every behaviour that forgets to quit a driver,
+close a handle or join a thread leaves something behind.  The watchdog
+samples this process every ``interval`` seconds (see
+:mod:`lib.process_stats`) and additionally right before and after each
+behaviour.  The before/after difference is attributed to the behaviour that
+ran, so a slow leak shows up against the behaviour causing it
+(``rss_growth_mb``, ``thread_growth``, ``handle_growth``,
+``leaked_browser_processes``) instead of as an anonymous upward trend.
+
+When a sample crosses one of the configured ``max_*`` limits,
+:attr:`ResourceWatchdog.restart_reason` is set and a ``restart_requested``
+event is emitted.  The behaviour cycle checks it between behaviours and
+restarts the client in a fresh process, so a running behaviour is never cut
+off by the watchdog.  Limits that are not configured are not checked, and a
+limit the process already exceeds at its first sample is not enforced for that
+process: a restart would come back just as large and restart again.
+
+Usage::
+
+    watchdog = ResourceWatchdog.from_config(current_config().raw.get("watchdog"))
+    watchdog.start()
+    watchdog.behaviour_started("work_emails")
+    watchdog.behaviour_finished("work_emails")
+    watchdog.snapshot()          # {"current": {...}, "by_behaviour": {"work_emails": {...}}, ...}
+    watchdog.restart_reason      # "rss_mb 1843.2 > 1500" once a limit is crossed
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from behaviour.events import event_stream
+from behaviour.ids import BehaviourId
+from lib.process_stats import ProcessSample, sample_process
+from src.config.models.config import WatchdogConfig
+from src.logger import app_logger
+
+DEFAULT_INTERVAL: float = 30.0
+# Periodic samples kept for the trend in the status update
+HISTORY_SIZE: int = 120
+
+
+@dataclass(slots=True)
+class ResourceGrowth:
+    runs: int = 0
+    rss_growth_mb: float = 0.0
+    max_rss_growth_mb: float = 0.0
+    thread_growth: int = 0
+    handle_growth: int = 0
+    leaked_browser_processes: int = 0
+
+    def add(self, before: ProcessSample, after: ProcessSample) -> None:
+        self.runs += 1
+        if before.rss is not None and after.rss is not None:
+            growth = (after.rss - before.rss) / (1024 * 1024)
+            self.rss_growth_mb += growth
+            self.max_rss_growth_mb = max(self.max_rss_growth_mb, growth)
+        if before.threads is not None and after.threads is not None:
+            self.thread_growth += after.threads - before.threads
+        if before.handles is not None and after.handles is not None:
+            self.handle_growth += after.handles - before.handles
+        self.leaked_browser_processes += after.browser_processes - before.browser_processes
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "rss_growth_mb": round(self.rss_growth_mb, 1),
+            "mean_rss_growth_mb": round(self.rss_growth_mb / self.runs, 1) if self.runs else 0.0,
+            "max_rss_growth_mb": round(self.max_rss_growth_mb, 1),
+            "thread_growth": self.thread_growth,
+            "handle_growth": self.handle_growth,
+            "leaked_browser_processes": self.leaked_browser_processes,
+        }
+
+
+def restart_command() -> list[str]:
+    """Command line that starts this client again with the same arguments."""
+    if getattr(sys, "frozen", False):
+        # PyInstaller: the executable is the program and argv[0] is its path
+        return [sys.executable, *sys.argv[1:]]
+    return [sys.executable, *sys.argv]
+
+
+class ResourceWatchdog:
+    def __init__(
+        self,
+        enabled: bool = True,
+        interval: float = DEFAULT_INTERVAL,
+        max_rss_mb: Optional[float] = None,
+        max_threads: Optional[int] = None,
+        max_handles: Optional[int] = None,
+        max_browser_processes: Optional[int] = None,
+    ):
+        self.enabled = enabled
+        self.interval = interval
+        self.limits: dict[str, Optional[float]] = {
+            "rss_mb": max_rss_mb,
+            "threads": max_threads,
+            "handles": max_handles,
+            "browser_processes": max_browser_processes,
+        }
+        self.restart_reason: Optional[str] = None
+        # Process to sample; None for this one (in supervisor mode, the automation worker)
+        self.pid: Optional[int] = None
+
+        self._lock = threading.Lock()
+        # Per sampling thread: a restart must not clear the event an old, still sampling thread waits on
+        self._stop: Optional[threading.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        self._baseline: Optional[ProcessSample] = None
+        # Limits the baseline already exceeded; restarting cannot bring the process back below them
+        self._exempt: set[str] = set()
+        self._peak_rss: Optional[int] = None
+        self._history: deque[ProcessSample] = deque(maxlen=HISTORY_SIZE)
+        self._running: Optional[tuple[BehaviourId, ProcessSample]] = None
+        self._growth: dict[BehaviourId, ResourceGrowth] = {}
+
+    @classmethod
+    def from_config(cls, config: Optional[WatchdogConfig]) -> "ResourceWatchdog":
+        config = config or {}
+        return cls(
+            config.get("enabled", True),
+            float(config.get("interval", DEFAULT_INTERVAL)),
+            config.get("max_rss_mb"),
+            config.get("max_threads"),
+            config.get("max_handles"),
+            config.get("max_browser_processes"),
+        )
+
+    # -- sampling ------------------------------------------------------------
+
+    def start(self) -> None:
+        if not self.enabled or self._thread is not None:
+            return
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(self._stop,), name="Resource watchdog thread", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._stop is not None:
+            self._stop.set()
+        self._stop = None
+        self._thread = None
+
+    def _run(self, stop: threading.Event) -> None:
+        while True:
+            try:
+                self.sample()
+            except Exception as ex:
+                app_logger.error(f"Resource watchdog failed to sample: {ex}")
+            if stop.wait(self.interval):
+                return
+
+    def sample(self) -> ProcessSample:
+        """Take a sample, keep it in the history and check it against the limits."""
+        sample = sample_process(self.pid)
+        with self._lock:
+            if self._baseline is None:
+                self._baseline = sample
+                self._exempt = self._set_baseline(sample)
+            if sample.rss is not None:
+                self._peak_rss = max(self._peak_rss or 0, sample.rss)
+            self._history.append(sample)
+        self._check(sample)
+        return sample
+
+    def _over_limits(self, sample: ProcessSample) -> dict[str, str]:
+        values = {
+            "rss_mb": sample.rss_mb,
+            "threads": sample.threads,
+            "handles": sample.handles,
+            "browser_processes": sample.browser_processes,
+        }
+        return {
+            name: f"{name} {round(values[name], 1)} > {limit}"
+            for name, limit in self.limits.items()
+            if limit is not None and values[name] is not None and values[name] > limit
+        }
+
+    def _set_baseline(self, sample: ProcessSample) -> set[str]:
+        exceeded = self._over_limits(sample)
+        for reason in exceeded.values():
+            app_logger.warning(f"Resource limit already exceeded at start ({reason}); not restarting for it")
+        return set(exceeded)
+
+    def _exceeded(self, sample: ProcessSample) -> Optional[str]:
+        for name, reason in self._over_limits(sample).items():
+            if name not in self._exempt:
+                return reason
+        return None
+
+    def _check(self, sample: ProcessSample) -> None:
+        if self.restart_reason is not None:
+            return
+        reason = self._exceeded(sample)
+        if reason is None:
+            return
+
+        self.restart_reason = reason
+        behaviour_id = self._running[0] if self._running else None
+        app_logger.warning(f"Resource limit exceeded ({reason}); restarting after the current behaviour")
+        event_stream.emit("restart_requested", reason=reason, behaviour=behaviour_id, resources=sample.to_dict())
+
+    def watch(self, pid: Optional[int]) -> None:
+        """Sample *pid* from now on; clears the trend and any pending restart, keeps per-behaviour growth."""
+        with self._lock:
+            self.pid = pid
+            self.restart_reason = None
+            self._baseline = None
+            self._exempt = set()
+            self._peak_rss = None
+            self._history.clear()
+            self._running = None
+
+    # -- attribution ---------------------------------------------------------
+
+    def behaviour_started(self, behaviour_id: BehaviourId) -> None:
+        if not self.enabled:
+            return
+        self._running = (behaviour_id, self.sample())
+
+    def behaviour_finished(self, behaviour_id: BehaviourId) -> None:
+        """Attribute the growth since :meth:`behaviour_started` to *behaviour_id*."""
+        if not self.enabled or self._running is None or self._running[0] != behaviour_id:
+            return
+        before = self._running[1]
+        after = self.sample()
+        self._running = None
+
+        with self._lock:
+            growth = self._growth.setdefault(behaviour_id, ResourceGrowth())
+            growth.add(before, after)
+        leaked = after.browser_processes - before.browser_processes
+        if leaked > 0:
+            app_logger.warning(f"Behaviour '{behaviour_id}' left {leaked} browser/driver process(es) running")
+
+    def growth(self, behaviour_id: BehaviourId) -> Optional[ResourceGrowth]:
+        with self._lock:
+            return self._growth.get(behaviour_id)
+
+    def snapshot(self) -> dict[str, Any]:
+        if not self.enabled:
+            return {}
+        with self._lock:
+            current = self._history[-1] if self._history else None
+            return {
+                "current": current.to_dict() if current else None,
+                "baseline": self._baseline.to_dict() if self._baseline else None,
+                "peak_rss_mb": None if self._peak_rss is None else round(self._peak_rss / (1024 * 1024), 1),
+                "by_behaviour": {behaviour_id: g.to_dict() for behaviour_id, g in self._growth.items()},
+                "restart_reason": self.restart_reason,
+            }
@@ -1,17 +1,23 @@
-import queue
-import random
-from typing import Optional, Type, Union
+from collections import deque
+from typing import Any, Callable, Optional, Type, Union, cast
 
-from app_config import app_config
+from app_config import config_store, current_config
 from behaviour.behaviour import BaseBehaviour
+from behaviour.behaviour_queue import BehaviourQueue, DequeueReason, QueuedBehaviour
 from behaviour.ids import BehaviourId
-from behaviour.models import BehaviourCategory
+from behaviour.models import BehaviourCategory, BehaviourOutcome
 from behaviour.registry import BEHAVIOURS, validate_behaviour_registry
+from behaviour.scheduler import DEFAULT_SCHEDULER, IdleScheduler, create_scheduler
+from behaviour.stats import StatsStore
+from behaviour.watchdog import ResourceWatchdog
 from cleanup_manager import CleanupManager
-from src.config.config_handler import get_automation_config, is_behaviour_enabled_in_config
 from src.config.models.config import AppConfig
+from src.config.snapshot import ConfigSnapshot
 from src.logger import app_logger
 
+# Recent starts kept for introspection; long-term history lives in the stats store
+BEHAVIOUR_HISTORY_SIZE = 100
+
 
 class BehaviourManager:
     """
@@ -22,11 +28,11 @@ class BehaviourManager:
     def __init__(
         self,
         behaviour_classes: list[Type[BaseBehaviour]] = BEHAVIOURS,
-        config: AppConfig = app_config,
+        config: Optional[AppConfig] = None,
     ):
         validate_behaviour_registry(behaviour_classes)
-
-        self.config = config
+        if config is None:
+            config = cast(AppConfig, config_store.source())
 
         # Store behaviour classes by id
         self._behaviour_classes: dict[BehaviourId, Type[BaseBehaviour]] = {}
@@ -48,14 +54,21 @@ class BehaviourManager:
                 app_logger.warning(f"Failed to initialize behaviour class {behaviour_class.__name__}: {ex}")
 
         self._behaviours_by_category: dict[BehaviourCategory, list[BaseBehaviour]] = {}
-        self.refresh_availability(config)
+        self.stats = StatsStore.from_config(config.get("stats"))
+        self.watchdog = ResourceWatchdog.from_config(config.get("watchdog"))
+        self.scheduler: Optional[IdleScheduler] = None
+        self.refresh_availability()
 
         # Runtime state
-        self.behaviour_queue: queue.PriorityQueue[tuple[int, BehaviourId]] = queue.PriorityQueue()
-        self.behaviour_history: list[BehaviourId] = []
+        self.behaviour_queue = BehaviourQueue()
+        self.behaviour_history: deque[BehaviourId] = deque(maxlen=BEHAVIOUR_HISTORY_SIZE)
         self.current_behaviour: Optional[BaseBehaviour] = None
         self.behaviour_thread: Optional[BaseBehaviour] = None
         self.cleanup_manager: Optional[CleanupManager] = None
+        # Creates the thread of a run; supervisor mode replaces it to run behaviours in the worker process
+        self.behaviour_factory: Callable[[Type[BaseBehaviour], CleanupManager], BaseBehaviour] = (
+            lambda behaviour_class, cleanup_manager: behaviour_class(cleanup_manager=cleanup_manager)
+        )
 
         app_logger.info(
             f"BehaviourManager initialized with {len(self._available_behaviour_ids)} "
@@ -82,11 +95,9 @@ class BehaviourManager:
     def attack_behaviours(self) -> list[BaseBehaviour]:
         return self._behaviours_by_category.get(BehaviourCategory.ATTACK, [])
 
-    def refresh_availability(self, config: Optional[AppConfig] = None) -> None:
-        if config is not None:
-            self.config = config
-
-        get_automation_config(self.config)
+    def refresh_availability(self) -> None:
+        """Re-evaluate availability and the idle scheduler against the current config snapshot."""
+        snapshot = current_config()
         self._available_behaviour_ids = []
         self._behaviours_by_category = {}
 
@@ -97,12 +108,14 @@ class BehaviourManager:
                 continue
 
             runtime_available = bool(behaviour_class.is_available())
-            config_enabled = is_behaviour_enabled_in_config(self.config, behaviour_id)
+            config_enabled = snapshot.behaviour_toggles.get(behaviour_id, True)
             final_available = runtime_available and config_enabled
 
             app_logger.debug(
-                f"Behaviour '{behaviour_id}' availability: "
-                f"runtime_available={runtime_available}, config_enabled={config_enabled}"
+                "Behaviour '%s' availability: runtime_available=%s, config_enabled=%s",
+                behaviour_id,
+                runtime_available,
+                config_enabled,
             )
 
             if not final_available:
@@ -111,6 +124,22 @@ class BehaviourManager:
             self._available_behaviour_ids.append(behaviour_id)
             self._behaviours_by_category.setdefault(prototype.category, []).append(prototype)
 
+        self._configure_scheduler(snapshot)
+
+    def _configure_scheduler(self, snapshot: ConfigSnapshot) -> None:
+        """Create the idle scheduler, or reconfigure it in place so its run history survives config updates."""
+        idle_cycle = snapshot.idle_cycle
+        if self.scheduler is None or self.scheduler.name != idle_cycle.get("scheduler", DEFAULT_SCHEDULER):
+            self.scheduler = create_scheduler(idle_cycle, self.stats)
+            app_logger.info(f"Idle scheduler: {self.scheduler.name}")
+        else:
+            self.scheduler.configure(idle_cycle)
+
+    @staticmethod
+    def _validate_config(snapshot: ConfigSnapshot) -> None:
+        """Reject config revisions the idle scheduler could not be configured with."""
+        create_scheduler(snapshot.idle_cycle)
+
     def _check_thread_status(self):
         """Check if the current behaviour thread has finished and handle cleanup if needed."""
         if self.behaviour_thread is not None and not self.behaviour_thread.is_alive():
@@ -154,13 +183,16 @@ class BehaviourManager:
             self.cleanup_manager = CleanupManager()
 
             behaviour_class = self._behaviour_classes[behaviour_id]
-            self.behaviour_thread = behaviour_class(cleanup_manager=self.cleanup_manager)
+            self.behaviour_thread = self.behaviour_factory(behaviour_class, self.cleanup_manager)
             self.current_behaviour = self.behaviour_thread
 
+            self.watchdog.behaviour_started(behaviour_id)
             self.behaviour_thread.start()
 
             app_logger.info(f"Behaviour '{behaviour_id}' started (Thread ID: {self.behaviour_thread.ident})")
             self.behaviour_history.append(behaviour_id)
+            if behaviour_class.category == BehaviourCategory.IDLE and self.scheduler is not None:
+                self.scheduler.record_start(behaviour_id)
 
             return self.behaviour_thread
 
@@ -169,21 +201,43 @@ class BehaviourManager:
             self._cleanup_behaviour_resources()
             return None
 
-    def run_next_behaviour(self):
-        """Runs the next behaviour from the queue, or falls back to an idle behaviour."""
+    def run_next_behaviour(self, include_idle: bool = True):
+        """Runs the next queued behaviour, or falls back to an idle behaviour if *include_idle*."""
         try:
             self._check_thread_status()
 
-            if not self.behaviour_queue.empty():
-                _, behaviour_id = self.behaviour_queue.get()
-                self.run_behaviour(behaviour_id)
-            else:
+            if self._run_next_queued():
+                return
+            if include_idle:
                 next_behaviour_id = self.evaluate_next_idle_behaviour()
                 if next_behaviour_id:
                     self.run_behaviour(next_behaviour_id)
         except Exception as ex:
             app_logger.error(f"Error while running next behaviour: {ex}")
 
+    def _run_next_queued(self) -> bool:
+        """Start the first queued entry that is still valid; True if one was started."""
+        while True:
+            entry = self.behaviour_queue.pop()
+            if entry is None:
+                return False
+
+            # Revalidated now: toggles, availability and the clock may have changed while it waited
+            if entry.expired():
+                reason = DequeueReason.EXPIRED
+            elif entry.behaviour_id not in self._available_behaviour_ids:
+                reason = DequeueReason.UNAVAILABLE
+            elif self.run_behaviour(entry.behaviour_id) is None:
+                reason = DequeueReason.FAILED
+            else:
+                reason = DequeueReason.STARTED
+
+            if reason != DequeueReason.STARTED:
+                app_logger.info(f"Dropped queued behaviour '{entry.behaviour_id}': {reason.value}")
+            self.behaviour_queue.notify(entry, reason)
+            if reason == DequeueReason.STARTED:
+                return True
+
     def terminate_behaviour(self):
         """Cooperatively stop the currently running behaviour, if any.
 
@@ -212,10 +266,25 @@ class BehaviourManager:
 
     def _cleanup_behaviour_resources(self):
         """Clear runtime state after a behaviour has ended."""
+        self._record_finished_behaviour()
+
         self.behaviour_thread = None
         self.current_behaviour = None
         self.cleanup_manager = None
 
+    def _record_finished_behaviour(self) -> None:
+        behaviour = self.current_behaviour
+        if behaviour is None or behaviour.started_at is None:
+            return
+
+        if self.scheduler is not None:
+            self.scheduler.record_finish(behaviour.id)
+        # No outcome yet: terminated and still unwinding past the stop() timeout
+        outcome = behaviour.outcome or BehaviourOutcome.CANCELLED
+        self.stats.record(behaviour.id, outcome, behaviour.duration)
+        self.watchdog.behaviour_finished(behaviour.id)
+        app_logger.debug("Behaviour '%s' %s after %.1fs", behaviour.id, outcome.value, behaviour.duration)
+
     def handle_behaviour_finish(self):
         """Handle cleanup when a behaviour finishes naturally."""
         if self.behaviour_thread is None:
@@ -236,41 +305,53 @@ class BehaviourManager:
             return False
 
     def evaluate_next_idle_behaviour(self) -> Union[BehaviourId, None]:
-        """Pick the next idle behaviour, avoiding recent repeats."""
+        """Pick the next idle behaviour via the configured scheduler (``None`` if nothing should run now)."""
         try:
             idle_behaviours = self._behaviours_by_category.get(BehaviourCategory.IDLE, [])
 
-            if not idle_behaviours:
+            if not idle_behaviours or self.scheduler is None:
                 return None
 
-            idle_ids = {b.id for b in idle_behaviours}
-            idle_history = [bid for bid in self.behaviour_history if bid in idle_ids]
-
-            if not idle_history:
-                options = idle_behaviours
-            else:
-                num_to_exclude = min(len(idle_behaviours) - 1, len(idle_history))
-                recent_to_exclude = set(idle_history[-num_to_exclude:])
-                options = [b for b in idle_behaviours if b.id not in recent_to_exclude]
-
-                if not options:
-                    options = idle_behaviours
-
-            return random.choice(options).id if options else None
+            return self.scheduler.pick([b.id for b in idle_behaviours])
 
         except Exception as ex:
             app_logger.error(f"Error while evaluating behaviour: {ex}")
             idle_behaviours = self.list_behaviours_by_category(BehaviourCategory.IDLE)
             return idle_behaviours[0].id if idle_behaviours else None
 
-    def queue_behaviour(self, behaviour_id: Union[BehaviourId, str], priority: int = 0):
-        """Add a behaviour to the queue with the specified priority."""
+    def queue_behaviour(
+        self,
+        behaviour_id: Union[BehaviourId, str],
+        priority: int = 0,
+        deadline: Optional[float] = None,
+        ttl: Optional[float] = None,
+        source: str = "local",
+        on_dequeue: Optional[Callable[[QueuedBehaviour, DequeueReason], None]] = None,
+        queue_id: Optional[str] = None,
+    ) -> Optional[QueuedBehaviour]:
+        """Add a behaviour to the queue with the specified priority (lower runs first, ties in FIFO order).
+
+        Queued behaviours start once the current one has finished.  One whose
+        *deadline* (``time.time()``) or *ttl* has passed by then, or that is no
+        longer available, is dropped instead.
+        """
         if behaviour_id not in self._available_behaviour_ids:
             app_logger.error(f"Cannot queue invalid/unavailable behaviour ID: {behaviour_id}")
-            return
+            return None
+
+        entry = self.behaviour_queue.push(behaviour_id, priority, deadline, ttl, source, on_dequeue, queue_id)
+        app_logger.info(f"Queued behaviour '{behaviour_id}' with priority {priority} ({entry.queue_id})")
+        return entry
 
-        self.behaviour_queue.put((priority, behaviour_id))
-        app_logger.info(f"Queued behaviour '{behaviour_id}' with priority {priority}")
+    def cancel_queued_behaviour(self, queue_id: str) -> bool:
+        cancelled = self.behaviour_queue.cancel(queue_id) is not None
+        if cancelled:
+            app_logger.info(f"Cancelled queued behaviour {queue_id}")
+        return cancelled
+
+    def queued_behaviours(self) -> list[dict[str, Any]]:
+        """Queued behaviours in the order they will run (for the tray UI and status updates)."""
+        return self.behaviour_queue.snapshot()
 
     def get_behaviour(self, behaviour_id: Union[BehaviourId, str]) -> Union[BaseBehaviour, None]:
         return self._behaviour_prototypes.get(behaviour_id)
@@ -289,3 +370,7 @@ class BehaviourManager:
 
     def list_behaviours_by_category(self, category: BehaviourCategory) -> list[BaseBehaviour]:
         return [b for b in self._behaviours_by_category.get(category, [])]
+
+
+# Once per process: every manager would add the same check again
+config_store.add_validator(BehaviourManager._validate_config)
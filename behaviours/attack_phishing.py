@@ -3,13 +3,14 @@ import platform
 from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.common.by import By
 
-from app_config import app_config, automation_config
+from app_config import current_config
 from behaviour.behaviour import WebEmailBehaviour
 from behaviour.config import get_behaviour_cfg
 from behaviour.ids import BehaviourId
 from behaviour.models import BehaviourCategory
 from behaviour.models.config import AttackPhishingCfg
 from cleanup_manager import CleanupManager
+from lib.selenium.locators import Element
 from lib.selenium.models import EmailClient
 from src.logger import app_logger
 
@@ -28,9 +29,9 @@ class BehaviourAttackPhishing(WebEmailBehaviour):
     def __init__(self, cleanup_manager: CleanupManager):
         super().__init__(cleanup_manager)
 
-        self.general_cfg = app_config["automation"]["general"]
-        self.user = self.general_cfg["user"]
-        self.email_client_type = EmailClient(automation_config["general"]["email_client"])
+        self.general_cfg = current_config().general
+        self.user = self.general_cfg.user
+        self.email_client_type = self.general_cfg.email_client
 
     @classmethod
     def is_available(cls) -> bool:
@@ -43,7 +44,7 @@ class BehaviourAttackPhishing(WebEmailBehaviour):
 
         self.setup_web_email_behaviour(self.user, self.email_client_type)
 
-        self.pool.submit(self.browser.search_by_url, self.general_cfg["organization_mail_server_url"]).result()
+        self.pool.submit(self.browser.search_by_url, self.general_cfg.organization_mail_server_url).result()
 
         self.pool.submit(self.email_client.login).result()
 
@@ -55,12 +56,7 @@ class BehaviourAttackPhishing(WebEmailBehaviour):
         unread_emails = self.pool.submit(self.email_client.get_unread_emails).result()
 
         for email in unread_emails:
-            if self.email_client.type == EmailClient.ROUNDCUBE:
-                subject_link = email.find_element(By.CSS_SELECTOR, "td.subject a")
-            else:
-                subject_link = email.find_element(
-                    By.XPATH, "//span[contains(@class, 'lvHighlightAllClass lvHighlightSubjectClass')]"
-                )
+            subject_link = self.email_client.locate_within(email, Element.EMAIL_ROW_SUBJECT)
             if subject_link.text == self.config["malicious_email_subject"]:
                 subject_link.click()
                 break
@@ -86,8 +82,8 @@ class BehaviourAttackPhishing(WebEmailBehaviour):
             self.selenium_controller.switch_tab()
             self.pool.submit(
                 self.selenium_controller.phishing_enter_credentials,
-                self.user["internal_email"],
-                self.user["internal_password"],
+                self.user.internal_email,
+                self.user.internal_password,
             ).result()
             self.pool.sleep(1)
             self.pool.submit(self.browser.close_latest_tab).result()
@@ -1,15 +1,16 @@
-import pyautogui as pag
 from selenium.webdriver.common.by import By
 
-from app_config import automation_config
+from app_config import current_config
 from behaviour.behaviour import WebEmailBehaviour
 from behaviour.config import get_behaviour_cfg
 from behaviour.ids import BehaviourId
 from behaviour.models import BehaviourCategory
 from behaviour.models.config import AttackRansomwareCfg
 from cleanup_manager import CleanupManager
+from lib.autogui import hotkey, press, write
 from lib.autogui.actions import os_utils
 from lib.autogui.actions.win_utils import win_utils
+from lib.selenium.locators import Element
 from lib.selenium.models import EmailClient
 from src.logger import app_logger
 
@@ -28,8 +29,9 @@ class BehaviourAttackRansomware(WebEmailBehaviour):
     def __init__(self, cleanup_manager: CleanupManager):
         super().__init__(cleanup_manager)
 
-        self.user = automation_config["general"]["user"]
-        self.email_client_type = EmailClient(automation_config["general"]["email_client"])
+        self.general_cfg = current_config().general
+        self.user = self.general_cfg.user
+        self.email_client_type = self.general_cfg.email_client
         self.config = get_behaviour_cfg(self.id, AttackRansomwareCfg, True)
 
     @classmethod
@@ -41,14 +43,12 @@ class BehaviourAttackRansomware(WebEmailBehaviour):
         app_logger.info(f"Starting {self.id} behaviour")
         self.setup_web_email_behaviour(self.user, self.email_client_type)
 
-        self.pool.submit(
-            self.browser.search_by_url, automation_config["general"]["organization_mail_server_url"]
-        ).result()
+        self.pool.submit(self.browser.search_by_url, self.general_cfg.organization_mail_server_url).result()
         self.pool.sleep(4)
 
         self.pool.submit(self.selenium_controller.email_client.login).result()
 
-        if self.email_client_type == "roundcube":
+        if self.email_client_type == EmailClient.ROUNDCUBE:
             self.pool.submit(self.selenium_controller.roundcube_set_language).result()
 
         self.pool.sleep(4)
@@ -56,20 +56,14 @@ class BehaviourAttackRansomware(WebEmailBehaviour):
         unread_emails = self.pool.submit(self.selenium_controller.email_client.get_unread_emails).result()
 
         for email in unread_emails:
-            subject_link = None
-            if self.email_client_type == "owa":
-                subject_link = email.find_element(
-                    By.XPATH, "//span[contains(@class, 'lvHighlightAllClass lvHighlightSubjectClass')]"
-                )
-            else:
-                subject_link = email.find_element(By.CSS_SELECTOR, "td.subject a")
+            subject_link = self.email_client.locate_within(email, Element.EMAIL_ROW_SUBJECT)
 
             if subject_link.text == self.config["malicious_email_subject"]:
                 subject_link.click()
                 break
 
         downloaded_attachments = []
-        if self.email_client_type == "roundcube":
+        if self.email_client_type == EmailClient.ROUNDCUBE:
             iframe = self.selenium_controller.driver.find_element(By.NAME, "messagecontframe")
             self.pool.sleep(1)
             self.selenium_controller.driver.switch_to.frame(iframe)
@@ -77,14 +71,14 @@ class BehaviourAttackRansomware(WebEmailBehaviour):
                 self.selenium_controller.email_client_download_email_attachments
             ).result()
 
-        if self.email_client_type == "owa":
+        if self.email_client_type == EmailClient.OWA:
             self.pool.submit(self.selenium_controller.owa_search_link_in_email).result()
             self.pool.sleep(5)
             self.pool.submit(self.selenium_controller.email_client.email_allow_files).result()
             self.pool.sleep(3)
-            pag.press("tab")
+            press("tab")
             self.pool.sleep(0.5)
-            pag.press("enter")
+            press("enter")
             self.pool.submit(os_utils.extract_file).result()
         else:
             for attachment_name in downloaded_attachments:
@@ -95,24 +89,24 @@ class BehaviourAttackRansomware(WebEmailBehaviour):
                     self.pool.sleep(1)
                     self.pool.submit(win_utils.ctrlf).result()
                     self.pool.sleep(0.5)
-                    pag.write(attachment_name.split(".")[0], 0.1)
+                    write(attachment_name.split(".")[0], 0.1)
                     self.pool.sleep(0.5)
-                    pag.press("enter")
+                    press("enter")
                     self.pool.sleep(2)
-                    pag.press("tab")
+                    press("tab")
                     self.pool.sleep(0.5)
-                    pag.press("tab")
+                    press("tab")
                     self.pool.sleep(0.5)
-                    pag.hotkey("ctrl", "space")
+                    hotkey("ctrl", "space")
                     self.pool.sleep(0.5)
-                    pag.hotkey("alt", "enter")
+                    hotkey("alt", "enter")
                     self.pool.sleep(0.5)
-                    pag.press("k")
+                    press("k")
                     self.pool.sleep(0.5)
-                    pag.press("a")
+                    press("a")
                     self.pool.sleep(0.5)
-                    pag.press("enter")
+                    press("enter")
                     self.pool.sleep(0.5)
-                    pag.press("enter")
+                    press("enter")
 
         app_logger.info(f"Completed {self.id} behaviour")
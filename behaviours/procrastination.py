@@ -1,16 +1,14 @@
 import random
-from datetime import datetime
 
-from app_config import automation_config
+from app_config import current_config
 from behaviour.behaviour import WebEmailBehaviour
 from behaviour.config import get_behaviour_cfg
 from behaviour.ids import BehaviourId
 from behaviour.models import BehaviourCategory
 from behaviour.models.config import ProcrastinationCfg
 from cleanup_manager import CleanupManager
-from lib.cancellable_futures import CancellableThreadPoolExecutor
+from lib.clock import clock
 from lib.general.random_choice import weighted_random_choice
-from lib.selenium.models import EmailClient
 from src.logger import app_logger
 
 
@@ -25,16 +23,15 @@ class BehaviourProcrastination(WebEmailBehaviour):
     category = BehaviourCategory.IDLE
     description = "Simulates procrastination activities like browsing"
 
+    pool_workers = 10
+
     def __init__(self, cleanup_manager: CleanupManager):
         super().__init__(cleanup_manager)
 
-        # Replace the default single-worker pool with one sized for this behaviour
-        self.pool = CancellableThreadPoolExecutor(max_workers=10)
-        self.pool._global_event = self._cancel_event
-
-        self.user = automation_config["general"]["user"]
+        self.general_cfg = current_config().general
+        self.user = self.general_cfg.user
         self.config = get_behaviour_cfg(self.id, ProcrastinationCfg)
-        self.email_client_type = EmailClient(automation_config["general"]["email_client"])
+        self.email_client_type = self.general_cfg.email_client
 
     @classmethod
     def is_available(cls) -> bool:
@@ -46,7 +43,7 @@ class BehaviourProcrastination(WebEmailBehaviour):
         self.setup_web_email_behaviour(self.user, self.email_client_type, startup_sleep=3)
 
         test_time = random.uniform(self.config["min_duration"], self.config["max_duration"])
-        start_time = datetime.now()
+        start_time = clock.now()
 
         selected_preference = weighted_random_choice(self.config["preference"])
         app_logger.info(f"Selected preference: {selected_preference}")
@@ -55,7 +52,7 @@ class BehaviourProcrastination(WebEmailBehaviour):
             self.pool.submit(self.browser.search_by_url, "youtube.com").result()
             self.pool.sleep(3)
 
-            watch_duration = test_time - (datetime.now() - start_time).total_seconds()
+            watch_duration = test_time - (clock.now() - start_time).total_seconds()
             self.pool.submit(
                 self.selenium_controller.procrastinate_watch_youtube_shorts,
                 watch_duration,
@@ -69,7 +66,7 @@ class BehaviourProcrastination(WebEmailBehaviour):
                 self.pool.submit(self.selenium_controller.accept_google_cookies).result()
                 self.pool.sleep(2)
 
-            scroll_duration = test_time - (datetime.now() - start_time).total_seconds()
+            scroll_duration = test_time - (clock.now() - start_time).total_seconds()
             self.pool.submit(
                 self.selenium_controller.procrastinate_scroll_images,
                 round(scroll_duration),
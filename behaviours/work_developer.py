@@ -2,7 +2,7 @@
 import platform
 import random
 
-from app_config import automation_config
+from app_config import current_config
 from behaviour.behaviour import BaseBehaviour
 from behaviour.ids import BehaviourId
 from behaviour.models import BehaviourCategory
@@ -30,7 +30,7 @@ class BehaviourWorkDeveloper(BaseBehaviour):
         self.os_type = platform.system()
 
         if cleanup_manager is not None:
-            self.user = automation_config["general"]["user"]
+            self.user = current_config().general.user
             self.filename = random.choice(["super_complex_code", "hello_world", "iam_working"])
         else:
             self.user = None
@@ -1,7 +1,7 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 
-from app_config import automation_config
+from app_config import current_config
 from behaviour import get_image_path
 from behaviour.behaviour import WebEmailBehaviour
 from behaviour.config import get_behaviour_cfg
@@ -9,7 +9,6 @@ from behaviour.ids import BehaviourId
 from behaviour.models import BehaviourCategory
 from cleanup_manager import CleanupManager
 from lib.autogui.actions import os_utils
-from lib.selenium.models import EmailClient
 from src.logger import app_logger
 
 
@@ -24,14 +23,18 @@ class BehaviourWorkDocument(WebEmailBehaviour):
     display_name = "Work Document"
     category = BehaviourCategory.IDLE
     description = "Simulates work with text document"
+    assets = (
+        "images/apps/ms_office/word/icon.png",
+        "images/apps/libre_office/writer/icon.png",
+    )
 
     def __init__(self, cleanup_manager: CleanupManager):
         super().__init__(cleanup_manager)
 
-        self.general_cfg = automation_config["general"]
-        self.user = self.general_cfg["user"]
+        self.general_cfg = current_config().general
+        self.user = self.general_cfg.user
         self.config = get_behaviour_cfg(self.id)
-        self.email_client_type = EmailClient(self.general_cfg["email_client"])
+        self.email_client_type = self.general_cfg.email_client
 
     @classmethod
     def is_available(cls) -> bool:
@@ -40,7 +43,7 @@ class BehaviourWorkDocument(WebEmailBehaviour):
     def run_behaviour(self):
         app_logger.info(f"Starting {self.id} behaviour")
 
-        if self.general_cfg["use_web_office_apps"]:
+        if self.general_cfg.use_web_office_apps:
             self.web_behaviour()
         else:
             self.local_behaviour()
@@ -1,12 +1,13 @@
 import platform
 
-from app_config import automation_config
+from app_config import current_config
 from behaviour.behaviour import WebEmailBehaviour
 from behaviour.config import get_behaviour_cfg
 from behaviour.ids import BehaviourId
 from behaviour.models import BehaviourCategory
 from behaviour.models.config import WorkEmailsCfg
 from cleanup_manager import CleanupManager
+from lib.cancellable_futures import Step
 from lib.email_manager.email_manager import EmailManager
 from lib.selenium.models import EmailClient
 from src.logger import app_logger
@@ -26,10 +27,10 @@ class BehaviourWorkEmails(WebEmailBehaviour):
     def __init__(self, cleanup_manager: CleanupManager):
         super().__init__(cleanup_manager)
 
-        self.general_cfg = automation_config["general"]
-        self.user = self.general_cfg["user"]
+        self.general_cfg = current_config().general
+        self.user = self.general_cfg.user
         self.config = get_behaviour_cfg(self.id, WorkEmailsCfg)
-        self.email_client_type = EmailClient(self.general_cfg["email_client"])
+        self.email_client_type = self.general_cfg.email_client
 
     @classmethod
     def is_available(cls) -> bool:
@@ -38,12 +39,18 @@ class BehaviourWorkEmails(WebEmailBehaviour):
     def run_behaviour(self):
         app_logger.info("Starting work_emails behaviour")
 
-        self.email_manager = EmailManager()
-        self.setup_web_email_behaviour(self.user, self.email_client_type)
-
-        self.pool.submit(self.browser.search_by_url, self.general_cfg["organization_mail_server_url"]).result()
-
-        self.pool.submit(self.email_client.login).result()
+        # The email corpus loads while the WebDriver starts up
+        results = self.run_steps(
+            Step("email_corpus", EmailManager),
+            Step("selenium", self.setup_web_email_behaviour, (self.user, self.email_client_type)),
+            Step(
+                "open_mail_server",
+                lambda: self.browser.search_by_url(self.general_cfg.organization_mail_server_url),
+                after=("selenium",),
+            ),
+            Step("login", lambda: self.email_client.login(), after=("open_mail_server",)),
+        )
+        self.email_manager = results["email_corpus"]
 
         if self.email_client.type == EmailClient.ROUNDCUBE:
             self.pool.submit(self.selenium_controller.roundcube_set_language).result()
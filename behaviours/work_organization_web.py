@@ -1,9 +1,8 @@
-from app_config import automation_config
+from app_config import current_config
 from behaviour.behaviour import WebEmailBehaviour
 from behaviour.ids import BehaviourId
 from behaviour.models import BehaviourCategory
 from cleanup_manager import CleanupManager
-from lib.selenium.models import EmailClient
 from src.logger import app_logger
 
 
@@ -15,9 +14,9 @@ class BehaviourWorkOrganizationWeb(WebEmailBehaviour):
 
     def __init__(self, cleanup_manager: CleanupManager):
         super().__init__(cleanup_manager)
-        self.general_config = automation_config["general"]
-        self.user = self.general_config["user"]
-        self.email_client_type = EmailClient(self.general_config["email_client"])
+        self.general_config = current_config().general
+        self.user = self.general_config.user
+        self.email_client_type = self.general_config.email_client
 
     @classmethod
     def is_available(cls) -> bool:
@@ -28,7 +27,7 @@ class BehaviourWorkOrganizationWeb(WebEmailBehaviour):
 
         self.setup_web_email_behaviour(self.user, self.email_client_type)
 
-        self.pool.submit(self.browser.search_by_url, self.general_config["organization_web_url"]).result()
+        self.pool.submit(self.browser.search_by_url, self.general_config.organization_web_url).result()
         self.pool.sleep(4)
 
         self.pool.submit(self.selenium_controller.browse_organization_website, 45).result()
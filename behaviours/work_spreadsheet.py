@@ -1,13 +1,12 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 
-from app_config import automation_config
+from app_config import current_config
 from behaviour.behaviour import WebEmailBehaviour
 from behaviour.config import get_behaviour_cfg
 from behaviour.ids import BehaviourId
 from behaviour.models import BehaviourCategory
 from cleanup_manager import CleanupManager
-from lib.selenium.models import EmailClient
 from src.logger import app_logger
 
 
@@ -26,10 +25,10 @@ class BehaviourWorkSpreadsheet(WebEmailBehaviour):
     def __init__(self, cleanup_manager: CleanupManager):
         super().__init__(cleanup_manager)
 
-        self.general_cfg = automation_config["general"]
-        self.user = self.general_cfg["user"]
+        self.general_cfg = current_config().general
+        self.user = self.general_cfg.user
         self.config = get_behaviour_cfg(self.id)
-        self.email_client_type = EmailClient(self.general_cfg["email_client"])
+        self.email_client_type = self.general_cfg.email_client
 
     @classmethod
     def is_available(cls) -> bool:
@@ -38,7 +37,7 @@ class BehaviourWorkSpreadsheet(WebEmailBehaviour):
     def run_behaviour(self):
         app_logger.info(f"Starting {self.id} behaviour")
 
-        if automation_config["general"]["use_web_office_apps"]:
+        if self.general_cfg.use_web_office_apps:
             self.web_behaviour()
         else:
             self.local_behaviour()
@@ -0,0 +1,23 @@
+"""Offline benchmark harness.
+
+Measures the client's own overhead without a browser, mail server or
+desktop by running the real code paths against local stand-ins:
+
+- ``fake_webdriver``: a WebDriver that renders a synthetic page, simulates
+  command latency and records every command per behaviour
+- ``fake_screen``: a ``pyautogui``/``pyperclip`` replacement that renders
+  template images into a synthetic framebuffer and matches against it
+- ``fake_server``: a local HTTP + websocket server implementing
+  ``/client/connect`` and ``/client/client_socket``
+
+The fakes are installed into ``sys.modules`` before any application module
+is imported, so ``import pyautogui`` in the app resolves to the fake screen.
+
+Usage::
+
+    python -m benchmarks                         # every scenario
+    python -m benchmarks email_clients --clients owa roundcube
+    python -m benchmarks server --duration 30 --json results.json
+
+A ``config.yml`` in the repository root is required, same as for ``main.py``.
+"""
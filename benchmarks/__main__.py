@@ -0,0 +1,90 @@
+import argparse
+import os
+import sys
+from datetime import date, datetime
+from datetime import time as dt_time
+
+from benchmarks import fake_screen
+from benchmarks.fake_webdriver import DEFAULT_LATENCY, DEFAULT_RENDER_DELAY
+from benchmarks.metrics import format_table, write_json
+from resource_path import resource_path
+
+SCENARIOS = ("email_clients", "screen", "templates", "config", "behaviours", "replay", "soak", "server")
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Offline benchmark harness")
+    parser.add_argument("scenarios", nargs="*", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--clients", nargs="+", default=["owa", "o365", "roundcube"])
+    parser.add_argument("--behaviours", nargs="+", default=["work_emails"])
+    parser.add_argument("--behaviour-timeout", type=float, default=180.0)
+    parser.add_argument("--duration", type=float, default=30.0, help="idle duration of the server scenario")
+    parser.add_argument("--dispatch", default="work_emails", help="behaviour pushed by the fake server")
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY, help="seconds per WebDriver command")
+    parser.add_argument("--render-delay", type=float, default=DEFAULT_RENDER_DELAY, help="page settle time")
+    parser.add_argument("--config-iterations", type=int, default=50, help="parses per config variant")
+    parser.add_argument("--seed", type=int, default=1, help="random seed of the replay scenario")
+    parser.add_argument(
+        "--time-scale", type=float, default=0.01, help="delay compression of the replay scenario, 0 skips them"
+    )
+    parser.add_argument("--record-dir", default=resource_path("recordings"), help="where replay recordings go")
+    parser.add_argument("--baseline-dir", help="diff replay recordings against the latest ones in this directory")
+    parser.add_argument("--soak-hours", type=float, default=8.0, help="simulated duration of the soak scenario")
+    parser.add_argument("--soak-start", default="08:00", help="simulated start time (HH:MM) of the soak scenario")
+    parser.add_argument("--json", dest="json_path", help="also write results to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+
+    if not os.path.exists(resource_path("config.yml")):
+        print("config.yml not found, copy config_example.yml to config.yml first", file=sys.stderr)
+        return 2
+
+    # Must happen before the scenarios import any module that imports pyautogui
+    screen = fake_screen.install()
+    from benchmarks import scenarios
+    from lib.selenium.models import EmailClient
+
+    results = []
+    if "email_clients" in args.scenarios:
+        clients = [EmailClient(client) for client in args.clients]
+        results += scenarios.bench_email_clients(clients, args.latency, args.render_delay)
+    if "screen" in args.scenarios:
+        results += scenarios.bench_screen(screen)
+    if "templates" in args.scenarios:
+        results += scenarios.bench_templates(screen)
+    if "config" in args.scenarios:
+        results += scenarios.bench_config(args.config_iterations)
+    if "behaviours" in args.scenarios:
+        results += scenarios.bench_behaviours(
+            args.behaviours, args.latency, args.render_delay, args.behaviour_timeout
+        )
+    if "replay" in args.scenarios:
+        results += scenarios.bench_replay(
+            args.behaviours,
+            args.latency,
+            args.render_delay,
+            args.behaviour_timeout,
+            args.seed,
+            args.time_scale,
+            args.record_dir,
+            args.baseline_dir,
+        )
+    if "soak" in args.scenarios:
+        start = datetime.combine(date.today(), dt_time.fromisoformat(args.soak_start))
+        results += scenarios.bench_soak(args.soak_hours, start, args.latency, args.render_delay, args.behaviour_timeout)
+    if "server" in args.scenarios:
+        # Last: the client's connection thread keeps running after the scenario ends
+        results += scenarios.bench_server(args.duration, args.latency, args.render_delay, args.dispatch)
+
+    print(format_table(results))
+    if args.json_path:
+        write_json(results, args.json_path)
+
+    return 1 if any(result.error for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
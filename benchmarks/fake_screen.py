@@ -0,0 +1,187 @@
+"""``pyautogui``/``pyperclip`` stand-in backed by a synthetic framebuffer.
+
+Template images are blitted into a numpy framebuffer with :meth:`FakeScreen.place`
+and ``locateCenterOnScreen`` runs a real ``cv2.matchTemplate`` against it, so
+image lookups cost what they cost on a desktop minus the screenshot grab.
+Keyboard and mouse calls are counted, ``write(..., interval)`` honours the
+interval like the real backend.
+
+:func:`install` must run before any application module imports ``pyautogui``.
+
+Usage::
+
+    screen = install(width=1920, height=1080)
+    screen.place("images/apps/excel.png", 200, 300)
+    screen.place("images/apps/excel.png", 600, 300, scale=1.25)   # as on a 125 % display
+    import pyautogui
+    pyautogui.locateCenterOnScreen("images/apps/excel.png", confidence=0.8)
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import types
+from collections import Counter, namedtuple
+from typing import Optional
+
+import cv2
+import numpy as np
+
+Point = namedtuple("Point", "x y")
+Box = namedtuple("Box", "left top width height")
+
+EXACT_MATCH: float = 0.999
+
+
+class ImageNotFoundException(Exception):
+    pass
+
+
+def center(box: Box) -> Point:
+    return Point(box.left + box.width // 2, box.top + box.height // 2)
+
+
+class FakeScreen:
+    def __init__(self, width: int = 1920, height: int = 1080):
+        self.width = width
+        self.height = height
+        self.framebuffer = np.zeros((height, width, 3), dtype=np.uint8)
+        self.clipboard = ""
+        self.inputs: Counter[str] = Counter()
+        self._templates: dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    # -- framebuffer ---------------------------------------------------------
+
+    def _template(self, image) -> np.ndarray:
+        if isinstance(image, np.ndarray):
+            return image
+
+        path = str(image)
+        template = self._templates.get(path)
+        if template is None:
+            template = cv2.imread(path, cv2.IMREAD_COLOR)
+            if template is None:
+                raise FileNotFoundError(path)
+            self._templates[path] = template
+        return template
+
+    def place(self, image, x: int, y: int, scale: float = 1.0) -> Box:
+        """Draw *image* with its top-left corner at ``(x, y)``, *scale* emulates display scaling."""
+        template = self._template(image)
+        if scale != 1.0:
+            template = cv2.resize(template, None, fx=scale, fy=scale, interpolation=cv2.INTER_LINEAR)
+        height, width = template.shape[:2]
+        with self._lock:
+            self.framebuffer[y : y + height, x : x + width] = template
+        return Box(x, y, width, height)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.framebuffer[:] = 0
+
+    def screenshot(self, region: Optional[tuple[int, int, int, int]] = None) -> np.ndarray:
+        self.inputs["screenshot"] += 1
+        with self._lock:
+            if region is None:
+                return self.framebuffer.copy()
+            left, top, width, height = region
+            return self.framebuffer[top : top + height, left : left + width].copy()
+
+    def locate(self, needle, haystack: np.ndarray, **kwargs) -> Box:
+        template = self._template(needle)
+        confidence = kwargs.get("confidence", EXACT_MATCH)
+        region = kwargs.get("region")
+        if region is not None:
+            left, top, width, height = region
+            haystack = haystack[top : top + height, left : left + width]
+
+        if kwargs.get("grayscale"):
+            haystack = cv2.cvtColor(haystack, cv2.COLOR_BGR2GRAY)
+            template = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+
+        self.inputs["match_template"] += 1
+        result = cv2.matchTemplate(haystack, template, cv2.TM_CCOEFF_NORMED)
+        _, score, _, (x, y) = cv2.minMaxLoc(result)
+        if score < confidence:
+            raise ImageNotFoundException(f"Could not locate the image (highest confidence = {score:.3f})")
+
+        if region is not None:
+            x, y = x + region[0], y + region[1]
+        height, width = template.shape[:2]
+        return Box(x, y, width, height)
+
+    def locateOnScreen(self, image, minSearchTime: float = 0, **kwargs) -> Box:
+        return self.locate(image, self.screenshot(), **kwargs)
+
+    def locateCenterOnScreen(self, image, **kwargs) -> Point:
+        return center(self.locateOnScreen(image, **kwargs))
+
+    # -- input ---------------------------------------------------------------
+
+    def press(self, keys, presses: int = 1, interval: float = 0.0) -> None:
+        self.inputs["press"] += presses
+
+    def hotkey(self, *keys, **kwargs) -> None:
+        self.inputs["hotkey"] += 1
+
+    def write(self, message: str, interval: float = 0.0) -> None:
+        for _ in message:
+            self.inputs["press"] += 1
+            if interval:
+                time.sleep(interval)
+
+    def click(self, x=None, y=None, clicks: int = 1, **kwargs) -> None:
+        self.inputs["click"] += clicks
+
+    def moveTo(self, x=None, y=None, duration: float = 0.0, **kwargs) -> None:
+        self.inputs["move"] += 1
+
+    def scroll(self, clicks: int, **kwargs) -> None:
+        self.inputs["scroll"] += 1
+
+    def size(self) -> tuple[int, int]:
+        return self.width, self.height
+
+    def copy(self, text: str) -> None:
+        self.clipboard = text
+
+    def paste(self) -> str:
+        return self.clipboard
+
+
+def _module(name: str, attributes: dict) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    return module
+
+
+def install(width: int = 1920, height: int = 1080) -> FakeScreen:
+    """Register the fake as ``pyautogui`` and ``pyperclip`` in ``sys.modules``."""
+    screen = FakeScreen(width, height)
+    sys.modules["pyautogui"] = _module(
+        "pyautogui",
+        {
+            "Point": Point,
+            "ImageNotFoundException": ImageNotFoundException,
+            "FAILSAFE": False,
+            "PAUSE": 0.0,
+            "center": center,
+            "screenshot": screen.screenshot,
+            "locate": screen.locate,
+            "locateOnScreen": screen.locateOnScreen,
+            "locateCenterOnScreen": screen.locateCenterOnScreen,
+            "press": screen.press,
+            "hotkey": screen.hotkey,
+            "write": screen.write,
+            "typewrite": screen.write,
+            "click": screen.click,
+            "moveTo": screen.moveTo,
+            "scroll": screen.scroll,
+            "size": screen.size,
+        },
+    )
+    sys.modules["pyperclip"] = _module("pyperclip", {"copy": screen.copy, "paste": screen.paste})
+    return screen
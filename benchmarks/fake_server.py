@@ -0,0 +1,224 @@
+"""Local stand-in for the user automation server.
+
+Implements ``POST /client/connect`` (returns an access token and an empty
+client config) and ``GET /client/client_socket`` (a minimal RFC 6455
+websocket).  Messages received from clients are kept for inspection and
+actions can be pushed to every connected client with :meth:`FakeServer.push`.
+
+Usage::
+
+    with FakeServer() as server:
+        config_store.merge({"app": {"user_automation_server_http": server.http_url,
+                                    "user_automation_server_websocket": server.ws_url}})
+        ...
+        server.push({"action": "run_behaviour", "behaviour_id": "work_emails"})
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import socket
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC11B65"
+
+OP_TEXT = 0x1
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+
+class _WebSocket:
+    def __init__(self, handler: "_Handler"):
+        self._rfile = handler.rfile
+        self._connection: socket.socket = handler.connection
+        self._lock = threading.Lock()
+
+    def _read_exact(self, size: int) -> bytes:
+        data = self._rfile.read(size)
+        if len(data) < size:
+            raise ConnectionError("websocket closed")
+        return data
+
+    def recv(self) -> tuple[int, bytes]:
+        first, second = self._read_exact(2)
+        opcode = first & 0x0F
+        length = second & 0x7F
+        if length == 126:
+            (length,) = struct.unpack("!H", self._read_exact(2))
+        elif length == 127:
+            (length,) = struct.unpack("!Q", self._read_exact(8))
+
+        mask = self._read_exact(4) if second & 0x80 else b""
+        payload = self._read_exact(length)
+        if mask:
+            payload = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+        return opcode, payload
+
+    def send(self, payload: bytes, opcode: int = OP_TEXT) -> None:
+        length = len(payload)
+        if length < 126:
+            header = struct.pack("!BB", 0x80 | opcode, length)
+        elif length < 1 << 16:
+            header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+        else:
+            header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+
+        with self._lock:
+            self._connection.sendall(header + payload)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_Server"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _reply_json(self, status: int, body: dict[str, Any]) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+
+        if self.path != "/client/connect":
+            self._reply_json(404, {"detail": "not found"})
+            return
+
+        self.server.owner.connects += 1
+        self._reply_json(200, {"access_token": "benchmark-token", "client_config": {}})
+
+    def do_GET(self) -> None:
+        key = self.headers.get("Sec-WebSocket-Key")
+        if self.path != "/client/client_socket" or not key:
+            self._reply_json(404, {"detail": "not found"})
+            return
+
+        accept = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode()).digest()).decode()
+        self.send_response(101, "Switching Protocols")
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", accept)
+        self.end_headers()
+        self.wfile.flush()
+
+        self.server.owner._serve_socket(_WebSocket(self))
+        self.close_connection = True
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    owner: "FakeServer"
+
+
+class FakeServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self._server = _Server((host, port), _Handler)
+        self._server.owner = self
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._sockets: list[_WebSocket] = []
+
+        self.connects = 0
+        self.messages: list[tuple[float, dict[str, Any]]] = []
+
+    @property
+    def http_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def ws_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"ws://{host}:{port}"
+
+    def start(self) -> "FakeServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="Fake server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def push(self, message: dict[str, Any]) -> int:
+        """Send *message* to every connected client, returns the number of recipients."""
+        payload = json.dumps(message).encode()
+        with self._lock:
+            sockets = list(self._sockets)
+
+        for ws in sockets:
+            try:
+                ws.send(payload)
+            except OSError:
+                self._drop(ws)
+        return len(sockets)
+
+    def wait_for_client(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if self._sockets:
+                    return True
+            time.sleep(0.05)
+        return False
+
+    def messages_of_type(self, message_type: str) -> list[dict[str, Any]]:
+        with self._lock:
+            return [message for _, message in self.messages if message.get("type") == message_type]
+
+    def _drop(self, ws: _WebSocket) -> None:
+        with self._lock:
+            if ws in self._sockets:
+                self._sockets.remove(ws)
+
+    def _serve_socket(self, ws: _WebSocket) -> None:
+        authenticated = False
+        try:
+            while True:
+                opcode, payload = ws.recv()
+                if opcode == OP_CLOSE:
+                    ws.send(payload[:2], OP_CLOSE)
+                    break
+                if opcode == OP_PING:
+                    ws.send(payload, OP_PONG)
+                    continue
+                if opcode != OP_TEXT:
+                    continue
+
+                if not authenticated:
+                    # The first frame carries the access token
+                    authenticated = True
+                    with self._lock:
+                        self._sockets.append(ws)
+                    continue
+
+                try:
+                    message = json.loads(payload)
+                except ValueError:
+                    continue
+                with self._lock:
+                    self.messages.append((time.monotonic(), message))
+
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self._drop(ws)
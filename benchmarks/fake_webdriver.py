@@ -0,0 +1,258 @@
+"""WebDriver stand-in with a synthetic page and per-behaviour command counts.
+
+The page "renders" ``render_delay`` seconds after the last navigation
+(any click counts as one), so waits behave like they do against a real
+mail client: lookups right after a click miss until the page settles.
+Locators registered with :meth:`FakePage.hide` never resolve, which models
+optional prompts (language selection, "stay signed in", ...).  Locators
+registered with :meth:`FakePage.track_entries` match one element per value
+typed and confirmed with Enter, which models recipient fields.
+
+Every command costs ``latency`` seconds and is recorded in a
+:class:`CommandLog`, attributed to the behaviour of the current tracing span.
+
+Usage::
+
+    page = FakePage(render_delay=0.25)
+    page.hide((By.ID, "selTz"))
+    driver = FakeWebDriver(page, latency=0.002)
+    ...
+    driver.commands.totals()   # {"find_element": 41, "click": 12, ...}
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+from typing import Any, Optional
+
+from selenium.common.exceptions import JavascriptException, NoSuchElementException
+from selenium.webdriver import Keys
+from selenium.webdriver.common.by import By
+
+from lib.replay import recorder
+from lib.selenium.observer_wait import Locator, to_query
+from lib.tracing import current_span
+
+DEFAULT_LATENCY: float = 0.002
+DEFAULT_RENDER_DELAY: float = 0.25
+
+UNATTRIBUTED = "-"
+
+
+class CommandLog:
+    """Thread-safe command counters keyed by behaviour id."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: dict[str, Counter[str]] = {}
+
+    def record(self, command: str) -> None:
+        span = current_span()
+        behaviour = span.behaviour if span is not None and span.behaviour else UNATTRIBUTED
+        with self._lock:
+            self._counts.setdefault(behaviour, Counter())[command] += 1
+
+    def by_behaviour(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {behaviour: dict(counts) for behaviour, counts in self._counts.items()}
+
+    def totals(self) -> dict[str, int]:
+        total: Counter[str] = Counter()
+        with self._lock:
+            for counts in self._counts.values():
+                total.update(counts)
+        return dict(total)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+class FakePage:
+    """Synthetic DOM deciding which locators resolve and when."""
+
+    def __init__(self, render_delay: float = DEFAULT_RENDER_DELAY, rows: int = 3, row_text: str = "Benchmark"):
+        self.render_delay = render_delay
+        self.rows = rows
+        self.row_text = row_text
+        self._missing: set[Locator] = set()
+        self._missing_queries: set[tuple[str, str]] = set()
+        self._entry_locators: set[Locator] = set()
+        self.entries = 0
+        self._rendered_at = time.monotonic()
+
+    def hide(self, *locators: Locator) -> None:
+        for locator in locators:
+            self._missing.add(locator)
+            query = to_query(locator)
+            if query is not None:
+                self._missing_queries.add(query)
+
+    def track_entries(self, *locators: Locator) -> None:
+        self._entry_locators.update(locators)
+
+    def matches(self, locator: Locator) -> int:
+        """Number of elements *locator* finds once the page has rendered."""
+        return self.entries if locator in self._entry_locators else self.rows
+
+    def navigate(self) -> None:
+        self._rendered_at = time.monotonic()
+
+    def ready_in(self) -> float:
+        return max(0.0, self._rendered_at + self.render_delay - time.monotonic())
+
+    def contains(self, locator: Locator) -> bool:
+        return locator not in self._missing
+
+    def resolves(self, locator: Locator) -> bool:
+        return self.contains(locator) and self.ready_in() == 0.0
+
+    def resolves_query(self, query: tuple[str, str]) -> bool:
+        return query not in self._missing_queries
+
+
+class FakeWebElement:
+    def __init__(self, driver: "FakeWebDriver", locator: Locator, index: int = 0):
+        self._driver = driver
+        self._locator = locator
+        self._index = index
+        self.tag_name = "div"
+        self.id = f"{locator[1]}#{index}"
+
+    @property
+    def text(self) -> str:
+        self._driver._command("get_text")
+        return f"{self._driver.page.row_text} {self._index}"
+
+    def click(self) -> None:
+        self._driver._command("click")
+        self._driver.page.navigate()
+
+    def send_keys(self, *value: Any) -> None:
+        self._driver._command("send_keys")
+        if Keys.ENTER in value:
+            self._driver.page.entries += 1
+
+    def clear(self) -> None:
+        self._driver._command("clear")
+
+    def is_displayed(self) -> bool:
+        self._driver._command("is_displayed")
+        return True
+
+    def is_enabled(self) -> bool:
+        self._driver._command("is_enabled")
+        return True
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        self._driver._command("get_attribute")
+        return None
+
+    def get_dom_attribute(self, name: str) -> Optional[str]:
+        self._driver._command("get_dom_attribute")
+        return None
+
+    def find_element(self, by: str = By.ID, value: Optional[str] = None) -> "FakeWebElement":
+        self._driver._command("find_child_element")
+        if not self._driver.page.contains((by, value)):
+            raise NoSuchElementException(f"{by}={value}")
+        return FakeWebElement(self._driver, (by, value), self._index)
+
+    def find_elements(self, by: str = By.ID, value: Optional[str] = None) -> list["FakeWebElement"]:
+        self._driver._command("find_child_elements")
+        if not self._driver.page.contains((by, value)):
+            return []
+        return [FakeWebElement(self._driver, (by, value), self._index)]
+
+
+class _SwitchTo:
+    def __init__(self, driver: "FakeWebDriver"):
+        self._driver = driver
+
+    def window(self, handle: str) -> None:
+        self._driver._command("switch_to_window")
+
+    def frame(self, frame: Any) -> None:
+        self._driver._command("switch_to_frame")
+
+    def default_content(self) -> None:
+        self._driver._command("switch_to_default_content")
+
+
+class FakeWebDriver:
+    """Duck-typed ``webdriver.Firefox``/``webdriver.Edge`` for the benchmarks."""
+
+    def __init__(
+        self,
+        page: Optional[FakePage] = None,
+        latency: float = DEFAULT_LATENCY,
+        supports_observer: bool = True,
+        commands: Optional[CommandLog] = None,
+    ):
+        self.page = page or FakePage()
+        self.latency = latency
+        self.supports_observer = supports_observer
+        self.commands = commands or CommandLog()
+        self.switch_to = _SwitchTo(self)
+        self.current_window_handle = "main"
+        self.window_handles = ["main"]
+
+    def _command(self, name: str) -> None:
+        self.commands.record(name)
+        started_at, start = time.time(), time.perf_counter()
+        if self.latency:
+            time.sleep(self.latency)
+        recorder.record_command(name, elapsed=time.perf_counter() - start, start=started_at)
+
+    def find_element(self, by: str = By.ID, value: Optional[str] = None) -> FakeWebElement:
+        self._command("find_element")
+        if not self.page.resolves((by, value)):
+            raise NoSuchElementException(f"{by}={value}")
+        return FakeWebElement(self, (by, value))
+
+    def find_elements(self, by: str = By.ID, value: Optional[str] = None) -> list[FakeWebElement]:
+        self._command("find_elements")
+        if not self.page.resolves((by, value)):
+            return []
+        return [FakeWebElement(self, (by, value), index) for index in range(self.page.matches((by, value)))]
+
+    def execute_script(self, script: str, *args: Any) -> None:
+        self._command("execute_script")
+
+    def execute_async_script(self, script: str, *args: Any):
+        """Emulates the MutationObserver wait: resolves once the page has rendered."""
+        self._command("execute_async_script")
+        if not self.supports_observer:
+            raise JavascriptException("MutationObserver is not available")
+
+        query, selector, _condition, all_elements, timeout_ms = args[:5]
+        slice_time = timeout_ms / 1000
+        if not self.page.resolves_query((query, selector)):
+            time.sleep(slice_time)
+            return None
+
+        ready_in = self.page.ready_in()
+        if ready_in > slice_time:
+            time.sleep(slice_time)
+            return None
+
+        time.sleep(ready_in)
+        by = By.XPATH if query == "xpath" else By.CSS_SELECTOR
+        if all_elements:
+            return [FakeWebElement(self, (by, selector), index) for index in range(self.page.rows)]
+        return FakeWebElement(self, (by, selector))
+
+    def set_script_timeout(self, time_to_wait: float) -> None:
+        self._command("set_script_timeout")
+
+    def maximize_window(self) -> None:
+        self._command("maximize_window")
+
+    def get(self, url: str) -> None:
+        self._command("get")
+        self.page.navigate()
+
+    def quit(self) -> None:
+        self._command("quit")
@@ -0,0 +1,87 @@
+"""Wall time, CPU time and wakeup measurements for benchmark scenarios."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _context_switches() -> Optional[int]:
+    """Voluntary + involuntary context switches of the whole process, a proxy for wakeups."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_nvcsw + usage.ru_nivcsw
+
+
+@dataclass(slots=True)
+class Measurement:
+    scenario: str
+    variant: str = ""
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    wakeups: Optional[int] = None
+    commands: dict[str, dict[str, int]] = field(default_factory=dict)
+    extra: dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.scenario}[{self.variant}]" if self.variant else self.scenario
+
+    @property
+    def command_total(self) -> int:
+        return sum(sum(counts.values()) for counts in self.commands.values())
+
+
+@contextlib.contextmanager
+def measure(scenario: str, variant: str = "") -> Iterator[Measurement]:
+    """Fill wall/CPU time and wakeups of the block into the yielded measurement.
+
+    Exceptions are recorded on the measurement instead of propagating, so one
+    broken scenario does not abort the rest of the run.
+    """
+    result = Measurement(scenario, variant)
+    switches = _context_switches()
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    try:
+        yield result
+    except Exception as ex:
+        result.error = f"{type(ex).__name__}: {ex}"
+    finally:
+        result.wall_time = time.perf_counter() - wall_start
+        result.cpu_time = time.process_time() - cpu_start
+        if switches is not None:
+            result.wakeups = _context_switches() - switches
+
+
+def format_table(results: list[Measurement]) -> str:
+    width = max([len(r.name) for r in results] + [8])
+    lines = [f"{'scenario':<{width}}  {'wall s':>8}  {'cpu s':>8}  {'wakeups':>8}  {'commands':>8}"]
+    for r in results:
+        wakeups = "-" if r.wakeups is None else str(r.wakeups)
+        line = f"{r.name:<{width}}  {r.wall_time:>8.3f}  {r.cpu_time:>8.3f}  {wakeups:>8}  {r.command_total:>8}"
+        if r.error:
+            line += f"  ERROR {r.error}"
+        lines.append(line)
+
+        for behaviour, counts in sorted(r.commands.items()):
+            top = ", ".join(f"{name}={count}" for name, count in sorted(counts.items(), key=lambda c: -c[1])[:6])
+            lines.append(f"{'':<{width}}    {behaviour}: {top}")
+        for key, value in r.extra.items():
+            lines.append(f"{'':<{width}}    {key}: {value}")
+    return "\n".join(lines)
+
+
+def write_json(results: list[Measurement], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as stream:
+        json.dump([asdict(r) for r in results], stream, indent=2, default=str)
@@ -0,0 +1,489 @@
+"""Benchmark scenarios.
+
+Imported only after :func:`benchmarks.fake_screen.install`, since the
+application modules below import ``pyautogui`` at module level.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Iterator, Optional
+
+import behaviour.behaviour as behaviour_module
+import lib.selenium.cancellable_wait as cancellable_wait
+import yaml
+
+from app_config import config_file, config_store
+from behaviour.behaviour import BaseBehaviour
+from behaviour.registry import ASSET_MODULES, BEHAVIOURS
+from behaviour_manager import BehaviourManager
+from benchmarks.fake_screen import EXACT_MATCH, FakeScreen
+from benchmarks.fake_server import FakeServer
+from benchmarks.fake_webdriver import CommandLog, FakePage, FakeWebDriver
+from benchmarks.metrics import Measurement, measure, resource
+from lib.autogui import locate_image_center
+from lib.autogui.actions.roundcube_web import roundcube_web
+from lib.autogui.actions.win_utils import win_utils
+from lib.autogui.assets import asset_catalog
+from lib.autogui.frame_cache import frame_cache
+from lib.autogui.template_matcher import frame_to_array, template_matcher
+from lib.cancellable_futures import CancellableThreadPoolExecutor, get_executor
+from lib.clock import clock
+from lib.email_manager.email_manager import emails_file
+from lib.replay import diff_recordings, load_recording, recorder, time_by_kind
+from lib.selenium import locators
+from lib.selenium.cancellable_wait import DEFAULT_POLL_SCHEDULE, FIXED_POLL_SCHEDULE, PollSchedule, wait_statistics
+from lib.selenium.email_web_client import getEmailClient
+from lib.selenium.locators import Element, locator_statistics
+from lib.selenium.models import EmailClient, EmailClientUser
+from lib.selenium.selenium_controller import SeleniumController
+from lib.tracing import span
+from resource_path import resource_path
+from src.config.config_handler import CACHE_SUFFIX, YAML_LOADER, clear_config_cache, load_yaml
+from user_automation_manager import IdleCycleStatus, UserAutomationManager
+
+BENCH_USER: EmailClientUser = {
+    "name": "Bench User",
+    "email": "bench.user@example.test",
+    "password": "bench-password",
+}
+BENCH_RECEIVERS = ["john.doe@example.test"]
+BENCH_SUBJECT = "Benchmark"
+BENCH_BODY = "Hi {{ receiver_name }}"
+
+# Prompts that only show up on a first login; the benchmark page never renders them
+OPTIONAL_ELEMENTS = (Element.LANGUAGE_PROMPT, Element.LOGIN_STAY_SIGNED_IN)
+
+# variant -> (in-page observer available, poll schedule used by the polling path)
+WAIT_VARIANTS: dict[str, tuple[bool, PollSchedule]] = {
+    "fixed-poll": (False, FIXED_POLL_SCHEDULE),
+    "adaptive-poll": (False, DEFAULT_POLL_SCHEDULE),
+    "observer": (True, DEFAULT_POLL_SCHEDULE),
+}
+
+
+@contextlib.contextmanager
+def _patched(target: Any, name: str, value: Any) -> Iterator[None]:
+    original = getattr(target, name)
+    setattr(target, name, value)
+    try:
+        yield
+    finally:
+        setattr(target, name, original)
+
+
+@contextlib.contextmanager
+def _patched_config(patch: dict[str, Any]) -> Iterator[None]:
+    """Swap in a config snapshot with *patch* merged in; the application reads ``current_config()``."""
+    original = config_store.source()
+    config_store.merge(patch)
+    try:
+        yield
+    finally:
+        config_store.replace(original)
+
+
+def _build_page(client: EmailClient, render_delay: float) -> FakePage:
+    page = FakePage(render_delay=render_delay)
+    for element in OPTIONAL_ELEMENTS:
+        try:
+            page.hide(*locators.get_selector(client, element).locators)
+        except KeyError:
+            pass
+    page.track_entries(*locators.get_selector(client, Element.RECIPIENT).locators)
+    return page
+
+
+def _wait_summary() -> dict[str, Any]:
+    stats = wait_statistics.snapshot().values()
+    return {
+        "wait_time": round(sum(s.total_time for s in stats), 3),
+        "polls": sum(s.polls for s in stats),
+        "timeouts": sum(s.timeouts for s in stats),
+    }
+
+
+def _reset_statistics() -> None:
+    wait_statistics.reset()
+    locator_statistics.reset()
+
+
+def _run_flow(flow: str, fn, *args) -> None:
+    # Sized like a behaviour's pool: flows such as _scan_screen race lookups on it
+    pool = CancellableThreadPoolExecutor(max_workers=BaseBehaviour.pool_workers)
+    try:
+        with span(f"bench:{flow}", behaviour=flow):
+            pool.submit(fn, *args, name=flow).result()
+    finally:
+        pool.shutdown(wait=True)
+
+
+# -- email clients -------------------------------------------------------------
+
+
+def bench_email_clients(clients: list[EmailClient], latency: float, render_delay: float) -> list[Measurement]:
+    """Login + send_email per client, comparing fixed polling, adaptive polling and observer waits."""
+    results = []
+    for client in clients:
+        for variant, (observer, schedule) in WAIT_VARIANTS.items():
+            commands = CommandLog()
+            driver = FakeWebDriver(_build_page(client, render_delay), latency, observer, commands)
+            email_client = getEmailClient(client)(driver, BENCH_USER)
+            _reset_statistics()
+
+            with _patched(cancellable_wait, "DEFAULT_POLL_SCHEDULE", schedule):
+                with measure(f"email_clients.{client.value}", variant) as result:
+                    _run_flow("login", email_client.login)
+                    _run_flow("send_email", email_client.send_email, BENCH_RECEIVERS, BENCH_SUBJECT, BENCH_BODY)
+
+            result.commands = commands.by_behaviour()
+            result.extra.update(_wait_summary())
+            results.append(result)
+    return results
+
+
+# -- screen lookups ------------------------------------------------------------
+
+
+ROUNDCUBE_IMAGES = os.path.dirname(roundcube_web.__file__)
+EXPLORER_IMAGE = os.path.join(os.path.dirname(win_utils.__file__), "explorer.png")
+
+
+def _scan_screen() -> None:
+    roundcube_web.scan_email()
+    # Two concurrent lookups, like win_utils.open_explorer
+    get_executor().race(
+        {
+            "find_explorer": lambda: locate_image_center(EXPLORER_IMAGE, timeout=2, confidence=0.6, grayscale=True),
+            "find_logo": lambda: locate_image_center(
+                os.path.join(ROUNDCUBE_IMAGES, "roundcube_logo.png"), timeout=2, confidence=0.7
+            ),
+        }
+    )
+
+
+SCREEN_VARIANTS: tuple[tuple[str, bool, float], ...] = (
+    # (variant, frame cache enabled, display scale)
+    ("no-cache", False, 1.0),
+    ("frame-cache", True, 1.0),
+    ("hidpi-125", True, 1.25),
+    ("hidpi-150", True, 1.5),
+)
+
+
+def bench_screen(screen: FakeScreen) -> list[Measurement]:
+    """``scan_email`` and a raced lookup pair, with and without the shared frame cache and at HiDPI scales."""
+    results = []
+    for variant, cached, scale in SCREEN_VARIANTS:
+        screen.clear()
+        screen.place(os.path.join(ROUNDCUBE_IMAGES, "allow_ext_files_en.png"), 400, 200, scale)
+        screen.place(os.path.join(ROUNDCUBE_IMAGES, "email_attachment.png"), 400, 600, scale)
+        screen.place(EXPLORER_IMAGE, 20, 1000 - round(40 * scale), scale)
+
+        screen.inputs.clear()
+        frame_cache.reset_stats()
+        frame_cache.invalidate()
+        # Each variant learns its display scale from scratch
+        template_matcher.clear()
+        with _patched(frame_cache, "ttl", frame_cache.ttl if cached else 0.0):
+            with measure("screen", variant) as result:
+                _run_flow("scan_screen", _scan_screen)
+
+        result.extra["screenshots"] = screen.inputs["screenshot"]
+        result.extra["winning_scale"] = template_matcher.winning_scale((screen.width, screen.height))
+        results.append(result)
+    return results
+
+
+# -- template matching ---------------------------------------------------------
+
+
+# Every pixel phase of the matcher's coarse (half-resolution) pass
+TEMPLATE_OFFSETS: tuple[tuple[int, int], ...] = ((100, 100), (101, 100), (100, 101), (101, 101))
+
+
+def _check_templates(screen: FakeScreen) -> int:
+    """Look up every action asset drawn pixel-for-pixel into the frame; raises on the first miss."""
+    lookups = 0
+    for module in ASSET_MODULES:
+        for name in module.ASSETS:
+            image = asset_catalog.load(name)
+            for x, y in TEMPLATE_OFFSETS:
+                screen.clear()
+                expected = tuple(screen.place(image, x, y))
+                color = screen.screenshot()
+                gray = frame_to_array(color, grayscale=True)
+                for grayscale in (True, False):
+                    box = template_matcher.locate(name, gray, color, confidence=EXACT_MATCH, grayscale=grayscale)
+                    if box is None or tuple(box) != expected:
+                        raise AssertionError(f"{name} drawn at {expected} (grayscale={grayscale}), found {box}")
+                    lookups += 1
+    return lookups
+
+
+def bench_templates(screen: FakeScreen) -> list[Measurement]:
+    """Exact-match lookups of every ``ASSETS`` image; the run fails if the matcher misses one."""
+    template_matcher.clear()
+    with measure("templates") as result:
+        result.extra["lookups"] = _check_templates(screen)
+    return [result]
+
+
+# -- config loading ------------------------------------------------------------
+
+
+CONFIG_FILES = (config_file, emails_file)
+# variant -> (pure-Python loader, disk cache, keep the in-process parse between iterations)
+CONFIG_VARIANTS: dict[str, tuple[bool, bool, bool]] = {
+    "pure-python": (True, False, False),
+    "libyaml": (False, False, False),
+    "disk-cache": (False, True, False),
+    "reload": (False, True, True),
+}
+COLD_START_CODE = "import src.logger, app_config"
+
+
+def _remove_disk_caches() -> None:
+    for path in CONFIG_FILES:
+        with contextlib.suppress(OSError):
+            os.remove(path + CACHE_SUFFIX)
+
+
+def _cold_start() -> None:
+    subprocess.run([sys.executable, "-c", COLD_START_CODE], cwd=resource_path(""), check=True)
+
+
+def bench_config(iterations: int) -> list[Measurement]:
+    """Parse time of ``config.yml`` and ``emails.yml`` per loader/cache, and start-up of a fresh interpreter."""
+    results = []
+    for variant, (pure_python, disk_cache, keep_parsed) in CONFIG_VARIANTS.items():
+        loader = yaml.SafeLoader if pure_python else YAML_LOADER
+        clear_config_cache()
+        for path in CONFIG_FILES:
+            load_yaml(path, disk_cache, loader)  # populates the disk cache for the cached variants
+
+        with measure("config", variant) as result:
+            for _ in range(iterations):
+                if not keep_parsed:
+                    clear_config_cache()
+                for path in CONFIG_FILES:
+                    load_yaml(path, disk_cache, loader)
+        result.extra["per_load_ms"] = round(1000 * result.wall_time / iterations, 3)
+        results.append(result)
+
+    # The first start writes the disk caches the second one reads
+    _remove_disk_caches()
+    for variant in ("cold-start", "cold-start cached"):
+        with measure("config", variant) as result:
+            _cold_start()
+        results.append(result)
+    return results
+
+
+# -- behaviour manager ---------------------------------------------------------
+
+
+def _fake_controller_factory(commands: CommandLog, latency: float, render_delay: float, observer: bool = True):
+    def factory(email_client_type: EmailClient, user: EmailClientUser) -> SeleniumController:
+        driver = FakeWebDriver(_build_page(email_client_type, render_delay), latency, observer, commands)
+        return SeleniumController(driver, user, email_client_type)
+
+    return factory
+
+
+def bench_behaviours(
+    behaviour_ids: list[str],
+    latency: float,
+    render_delay: float,
+    timeout: float,
+) -> list[Measurement]:
+    """Run behaviours end to end through ``BehaviourManager`` against the fake driver and screen."""
+    results = []
+    commands = CommandLog()
+    factory = _fake_controller_factory(commands, latency, render_delay)
+
+    with _patched(behaviour_module, "getSeleniumController", factory):
+        manager = BehaviourManager(BEHAVIOURS, config_store.source())
+
+        for behaviour_id in behaviour_ids:
+            commands.reset()
+            _reset_statistics()
+
+            with measure("behaviour", behaviour_id) as result:
+                _run_behaviour(manager, behaviour_id, timeout)
+
+            result.commands = commands.by_behaviour()
+            result.extra.update(_wait_summary())
+            results.append(result)
+    return results
+
+
+def _run_behaviour(manager: BehaviourManager, behaviour_id: str, timeout: float) -> BaseBehaviour:
+    thread = manager.run_behaviour(behaviour_id, force=True)
+    if thread is None:
+        raise RuntimeError(f"Behaviour '{behaviour_id}' did not start (unavailable or disabled?)")
+
+    thread.join(timeout)
+    if thread.is_alive():
+        manager.terminate_behaviour()
+        raise TimeoutError(f"Behaviour '{behaviour_id}' did not finish within {timeout}s")
+    manager.handle_behaviour_finish()
+    return thread
+
+
+# -- replay --------------------------------------------------------------------
+
+
+def _latest_recording(directory: str, behaviour_id: str) -> Optional[str]:
+    if not os.path.isdir(directory):
+        return None
+    names = sorted(name for name in os.listdir(directory) if name.startswith(f"{behaviour_id}-"))
+    return os.path.join(directory, names[-1]) if names else None
+
+
+def bench_replay(
+    behaviour_ids: list[str],
+    latency: float,
+    render_delay: float,
+    timeout: float,
+    seed: int,
+    time_scale: float,
+    record_dir: str,
+    baseline_dir: Optional[str] = None,
+) -> list[Measurement]:
+    """Seeded, time-compressed behaviour runs against the fakes, recorded call by call.
+
+    With *baseline_dir*, each recording is diffed against the latest recording
+    of the same behaviour there.  A run whose calls differ is reported as an
+    error, and the diff is written next to its recording.
+    """
+    results = []
+    commands = CommandLog()
+    factory = _fake_controller_factory(commands, latency, render_delay)
+
+    with _patched(behaviour_module, "getSeleniumController", factory):
+        manager = BehaviourManager(BEHAVIOURS, config_store.source())
+
+        for behaviour_id in behaviour_ids:
+            commands.reset()
+            _reset_statistics()
+
+            with measure("replay", behaviour_id) as result:
+                with recorder.replaying(seed, time_scale, record_dir):
+                    thread = _run_behaviour(manager, behaviour_id, timeout)
+                path = recorder.recordings.get(thread.trace_id or "")
+                if path is None:
+                    raise RuntimeError("No recording was written (is tracing enabled?)")
+
+                _, events = load_recording(path)
+                result.extra.update({"recording": path, "events": len(events), **time_by_kind(events)})
+
+                baseline = _latest_recording(baseline_dir, behaviour_id) if baseline_dir else None
+                if baseline is not None:
+                    diff = diff_recordings(baseline, path)
+                    if diff:
+                        diff_path = f"{os.path.splitext(path)[0]}.diff"
+                        with open(diff_path, "w", encoding="utf-8") as f:
+                            f.write("\n".join(diff) + "\n")
+                        raise AssertionError(f"Calls differ from {baseline}, see {diff_path}")
+
+            result.commands = commands.by_behaviour()
+            results.append(result)
+    return results
+
+
+# -- soak --------------------------------------------------------------------
+
+
+def bench_soak(hours: float, start: datetime, latency: float, render_delay: float, timeout: float) -> list[Measurement]:
+    """A simulated workday of idle-cycle picks on the virtual clock, against the fake driver and screen.
+
+    Realism delays are skipped, so the run covers the scheduler's working
+    hours, budgets and cooldowns, every cleanup and the process growth of a
+    whole day in a fraction of it.
+    """
+    commands = CommandLog()
+    factory = _fake_controller_factory(commands, latency, render_delay)
+    runs: Counter[str] = Counter()
+
+    with _patched(behaviour_module, "getSeleniumController", factory), clock.using("virtual", start=start):
+        manager = BehaviourManager(BEHAVIOURS, config_store.source())
+        end = clock.time() + hours * 3600
+        threads_before = threading.active_count()
+
+        with measure("soak", f"{hours:g}h from {start:%H:%M}") as result:
+            while clock.time() < end:
+                manager.run_next_behaviour()
+                behaviour = manager.current_behaviour
+                if behaviour is not None:
+                    runs[behaviour.id] += 1
+                    behaviour.join(timeout)
+                    if behaviour.is_alive():
+                        manager.terminate_behaviour()
+                        raise TimeoutError(f"Behaviour '{behaviour.id}' did not finish within {timeout}s")
+                    manager.handle_behaviour_finish()
+                # The idle cycle's one-second tick
+                clock.sleep(1)
+
+        result.commands = commands.by_behaviour()
+        result.extra.update(
+            {
+                "runs": dict(runs),
+                "simulated_end": f"{clock.now():%H:%M}",
+                "leaked_threads": threading.active_count() - threads_before,
+            }
+        )
+        if resource is not None:
+            result.extra["max_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return [result]
+
+
+# -- server connection ---------------------------------------------------------
+
+
+def bench_server(duration: float, latency: float, render_delay: float, dispatch_behaviour: str) -> list[Measurement]:
+    """Idle overhead of the connected client, then latency of a pushed ``run_behaviour``."""
+    results = []
+    commands = CommandLog()
+    factory = _fake_controller_factory(commands, latency, render_delay)
+
+    with FakeServer() as server, _patched(behaviour_module, "getSeleniumController", factory):
+        server_urls = {
+            "user_automation_server_http": server.http_url,
+            "user_automation_server_websocket": server.ws_url,
+        }
+        with _patched_config({"app": server_urls}):
+            manager = UserAutomationManager(config_store.source())
+            manager.set_idle_cycle_status(IdleCycleStatus.PAUSED)
+            manager.start()
+
+            with measure("server", "connect") as result:
+                if not server.wait_for_client(30):
+                    raise TimeoutError("Client did not connect to the fake server")
+            results.append(result)
+
+            with measure("server", f"idle {duration:g}s") as result:
+                time.sleep(duration)
+            result.extra["status_updates"] = len(server.messages_of_type("status_update"))
+            results.append(result)
+
+            with measure("server", f"dispatch {dispatch_behaviour}") as result:
+                pushed_at = time.monotonic()
+                server.push({"action": "run_behaviour", "behaviour_id": dispatch_behaviour})
+                while manager.behaviour_manager.current_behaviour is None:
+                    if time.monotonic() - pushed_at > 60:
+                        raise TimeoutError(f"'{dispatch_behaviour}' was not started within 60s")
+                    time.sleep(0.01)
+                result.extra["dispatch_latency"] = round(time.monotonic() - pushed_at, 3)
+            manager.behaviour_manager.terminate_behaviour()
+            results.append(result)
+
+            manager.stop()
+    return results
@@ -7,6 +7,7 @@ from lib.selenium.selenium_controller import (
     EdgeSeleniumController,
     FirefoxSeleniumController,
 )
+from lib.tracing import span
 from src.logger import app_logger
 
 
@@ -72,10 +73,11 @@ class CleanupManager:
             except ValueError:
                 pass
 
+        task_name = task.label or getattr(task.function, "__name__", repr(task.function))
         try:
-            task.run()
+            with span(f"cleanup:{task_name}"):
+                task.run()
         except Exception as ex:
-            task_name = task.label or getattr(task.function, "__name__", repr(task.function))
             app_logger.error(f"Error during cleanup task '{task_name}': {ex}", exc_info=True)
 
     def discard_task(self, task: CleanupTask, remove: bool = True) -> None:
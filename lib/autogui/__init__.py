@@ -1,8 +1,11 @@
+import os
 import time
 
 import pyautogui
 
+from lib.autogui.frame_cache import frame_cache, locate_center
 from lib.cancellable_futures import check, sleep
+from lib.tracing import span
 
 
 def write(message: str, interval: float = 0):
@@ -14,20 +17,47 @@ def write(message: str, interval: float = 0):
     for char in message:
         check()
         pyautogui.press(char)
+        frame_cache.invalidate()
         if interval:
             sleep(interval)
 
 
+def press(*args, **kwargs):
+    """``pyautogui.press()`` that invalidates the cached screen frame."""
+    pyautogui.press(*args, **kwargs)
+    frame_cache.invalidate()
+
+
+def hotkey(*args, **kwargs):
+    """``pyautogui.hotkey()`` that invalidates the cached screen frame."""
+    pyautogui.hotkey(*args, **kwargs)
+    frame_cache.invalidate()
+
+
+def click(*args, **kwargs):
+    """``pyautogui.click()`` that invalidates the cached screen frame."""
+    pyautogui.click(*args, **kwargs)
+    frame_cache.invalidate()
+
+
 def locate_image_center(image, timeout=10, **kwargs):
-    start = time.monotonic()
-    while True:
-        check()
-        try:
-            loc = pyautogui.locateCenterOnScreen(image, **kwargs)
-            if loc:
-                return loc
-        except pyautogui.ImageNotFoundException:
-            pass
-        if time.monotonic() - start >= timeout:
-            raise TimeoutError(f"'{image}' not found")
-        sleep(0.1)
+    with span("locate_image", image=os.path.basename(str(image))) as current:
+        start = time.monotonic()
+        attempts = 0
+        while True:
+            check()
+            attempts += 1
+            try:
+                loc = locate_center(image, **kwargs)
+                if loc:
+                    if current is not None:
+                        current.set(attempts=attempts)
+                    return loc
+            except pyautogui.ImageNotFoundException:
+                pass
+            if time.monotonic() - start >= timeout:
+                if current is not None:
+                    current.set(attempts=attempts)
+                raise TimeoutError(f"'{image}' not found")
+            # No point matching again before the shared frame is refreshed
+            sleep(max(0.1, frame_cache.time_to_refresh()), traced=False)
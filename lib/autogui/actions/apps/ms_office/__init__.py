@@ -6,16 +6,29 @@ Prerequisites:
     - MS Office installed
 """
 
-import os
 import sys
 
-import pyautogui as pag
-
-from lib.autogui import locate_image_center
+from lib.autogui import click, hotkey, locate_image_center, press, write
 from lib.cancellable_futures import sleep
 from src.logger import app_logger
 
-PARENT_DIR = os.path.abspath(os.path.dirname(os.path.abspath(__file__)))
+ASSET_DIR = "images/apps/ms_office"
+# Start menu result to click per app
+APP_IMAGES: dict[str, str] = {
+    "word": f"{ASSET_DIR}/word/icon.png",
+    "excel": f"{ASSET_DIR}/excel/explorer_excel.png",
+    "powerpoint": f"{ASSET_DIR}/powerpoint/explorer_powerpoint.png",
+}
+OFFICE_APP_IDENTIFIER = f"{ASSET_DIR}/office_app_identifier.png"
+ACCEPT_LICENSE_AGREEMENT = f"{ASSET_DIR}/accept_license_agreement.png"
+ACTIVATION_WIZARD_IDENTIFIER = f"{ASSET_DIR}/activation_wizard_identifier.png"
+# Catalog names of every image looked up here, validated with the behaviour registry
+ASSETS: tuple[str, ...] = (
+    *APP_IMAGES.values(),
+    OFFICE_APP_IDENTIFIER,
+    ACCEPT_LICENSE_AGREEMENT,
+    ACTIVATION_WIZARD_IDENTIFIER,
+)
 
 
 def start_app(app: str):
@@ -23,29 +36,21 @@ def start_app(app: str):
     Open app\n
     """
     try:
-        pag.press("win")
+        press("win")
         sleep(0.5)
-        pag.write(app, 0.1)
-
-        image = None
-        app_image_mapping = {
-            "word": "explorer_word.png",
-            "excel": "explorer_excel.png",
-            "powerpoint": "explorer_powerpoint.png",
-        }
-        image = os.path.join(PARENT_DIR, app_image_mapping.get(app, ""))
+        write(app, 0.1)
 
+        image = APP_IMAGES.get(app)
         if image:
             app_image = locate_image_center(image, minSearchTime=5, confidence=0.8, grayscale=True)
-            pag.click(app_image)
-            pag.press("enter")
+            click(app_image)
+            press("enter")
         else:
             raise ValueError("Invalid app name.")
 
         # Wait for office app identifier to be displayed - app is opened
-        office_app_identifier_image = os.path.join(PARENT_DIR, "office_app_identifier.png")
         office_app_identifier_pos = locate_image_center(
-            office_app_identifier_image, minSearchTime=10, confidence=0.9, grayscale=True
+            OFFICE_APP_IDENTIFIER, minSearchTime=10, confidence=0.9, grayscale=True
         )
 
         sleep(4)
@@ -66,9 +71,8 @@ def check_license_agreement():
     Check if there is a license agreement dialog and accept it
     """
     try:
-        check_license_image = os.path.join(PARENT_DIR, "accept_license_agreement.png")
-        check_license_pos = locate_image_center(check_license_image, minSearchTime=3)
-        pag.click(check_license_pos)
+        check_license_pos = locate_image_center(ACCEPT_LICENSE_AGREEMENT, minSearchTime=3)
+        click(check_license_pos)
     except Exception as ex:
         app_logger.error(f"Error writing into a word file, Ex: {ex}")
         sys.exit(1)
@@ -81,11 +85,12 @@ def check_activation_wizard():
         - Opened Word
     """
     try:
-        ms_activation_image = os.path.join(PARENT_DIR, "activation_wizard_identifier.png")
-        ms_activation_pos = locate_image_center(ms_activation_image, minSearchTime=3, confidence=0.8, grayscale=True)
-        pag.click(ms_activation_pos)
+        ms_activation_pos = locate_image_center(
+            ACTIVATION_WIZARD_IDENTIFIER, minSearchTime=3, confidence=0.8, grayscale=True
+        )
+        click(ms_activation_pos)
         if ms_activation_pos:
-            pag.press("c")
+            press("c")
 
     except Exception as ex:
         app_logger.error(f"Error writing into a word file, Ex: {ex}")
@@ -99,16 +104,16 @@ def write_word_file(text):
         - Opened Word
     """
     try:
-        pag.hotkey("ctrl", "n")
+        hotkey("ctrl", "n")
         sleep(0.5)
-        pag.press("tab")
+        press("tab")
         sleep(0.5)
-        pag.press("enter")
+        press("enter")
         sleep(2)
-        pag.write(text, 0.1)
-        pag.hotkey("alt", "f4")
+        write(text, 0.1)
+        hotkey("alt", "f4")
         sleep(0.5)
-        pag.press("n")
+        press("n")
         sleep(0.5)
 
     except Exception as ex:
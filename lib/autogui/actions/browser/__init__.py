@@ -1,22 +1,21 @@
 from abc import ABC, abstractmethod
 
-import pyautogui
-
+from lib.autogui import hotkey, press, write
 from lib.cancellable_futures import sleep
 
 
 class Browser(ABC):
     def search_by_url(self, url: str):
-        pyautogui.hotkey("alt", "d")
+        hotkey("alt", "d")
         sleep(1)
-        pyautogui.write(url, 0.1)
-        pyautogui.press("enter")
+        write(url, 0.1)
+        press("enter")
 
     def open_new_tab(self):
-        pyautogui.hotkey("ctrl", "t")
+        hotkey("ctrl", "t")
 
     def close_latest_tab(self):
-        pyautogui.hotkey("ctrl", "w")
+        hotkey("ctrl", "w")
 
     @abstractmethod
     def close_all_tabs(self):
@@ -29,23 +28,23 @@ class Browser(ABC):
 
 class Edge(Browser):
     def close_all_tabs(self):
-        pyautogui.hotkey("ctrl", "shift", "w")
+        hotkey("ctrl", "shift", "w")
 
     def search_by_text(self, text: str):
-        pyautogui.hotkey("ctrl", "e")
+        hotkey("ctrl", "e")
         sleep(1)
-        pyautogui.write(text, 0.1)
-        pyautogui.press("enter")
+        write(text, 0.1)
+        press("enter")
 
 
 class Firefox(Browser):
     def close_all_tabs(self):
-        pyautogui.hotkey("ctrl", "shift", "w")
+        hotkey("ctrl", "shift", "w")
         sleep(0.5)
-        pyautogui.press("enter")  # firefox needs confirmation
+        press("enter")  # firefox needs confirmation
 
     def search_by_text(self, text: str):
-        pyautogui.hotkey("ctrl", "k")  # firefox uses ctrl+k
+        hotkey("ctrl", "k")  # firefox uses ctrl+k
         sleep(1)
-        pyautogui.write(text, 0.1)
-        pyautogui.press("enter")
+        write(text, 0.1)
+        press("enter")
@@ -9,9 +9,7 @@ import os
 import platform
 import sys
 
-import pyautogui as pag
-
-from lib.autogui import locate_image_center, write
+from lib.autogui import click, hotkey, locate_image_center, press, write
 from lib.cancellable_futures import sleep
 from lib.cancellable_futures.exceptions import OperationCancelled
 from src.logger import app_logger
@@ -32,17 +30,17 @@ def start_app(app_name: str, app_image: str, **kwargs):
     """
     try:
         if os_type == "Linux":
-            pag.press("win")
+            press("win")
             sleep(1)
             write(app_name, 0.1)
         else:
-            pag.hotkey("win", "s")
+            hotkey("win", "s")
             sleep(1)
             write(app_name, 0.1)
 
         app_logger.info(f"Searching for app icon: {app_image}")
         location = locate_image_center(app_image, **kwargs)
-        pag.click(location)
+        click(location)
         app_logger.info(f"Clicked app icon for '{app_name}'")
 
     except TimeoutError:
@@ -61,17 +59,17 @@ def open_terminal():
     """
     try:
         if os_type == "Linux":
-            pag.press("win")
+            press("win")
             sleep(1)
             write("terminal", 0.1)
             sleep(2)
-            pag.press("enter")
+            press("enter")
         else:
-            pag.hotkey("win", "r")
+            hotkey("win", "r")
             sleep(1)
             write("cmd", 0.1)
             sleep(1)
-            pag.press("enter")
+            press("enter")
     except Exception as ex:
         app_logger.error(f"Error opening terminal, Ex: {ex}")
         sys.exit(1)
@@ -85,12 +83,12 @@ def close_terminal():
     """
     try:
         if os_type == "Linux":
-            pag.hotkey("ctrl", "c")
+            hotkey("ctrl", "c")
             sleep(1)
-            pag.hotkey("ctrl", "d")
+            hotkey("ctrl", "d")
         else:
             write("exit", 0.1)
-            pag.press("enter")
+            press("enter")
     except OperationCancelled:
         raise
     except Exception as ex:
@@ -104,30 +102,30 @@ def write_file(filename, text):
     try:
         if os_type == "Linux":
             write(f"nano {filename}", 0.1)
-            pag.press("enter")
+            press("enter")
             sleep(1)
             write(text, 0)
             sleep(1)
-            pag.hotkey("ctrl", "x")
+            hotkey("ctrl", "x")
             sleep(1)
-            pag.press("y")
+            press("y")
             sleep(1)
-            pag.press("enter")
+            press("enter")
         else:
             write(f"notepad {filename}", 0.1)
-            pag.press("enter")
+            press("enter")
             sleep(1)
-            pag.press("y")
+            press("y")
             sleep(0.5)
-            pag.hotkey("ctrl", "a")
+            hotkey("ctrl", "a")
             sleep(0.5)
-            pag.hotkey("ctrl", "x")
+            hotkey("ctrl", "x")
             sleep(0.5)
             write(text, 0.1)
             sleep(1)
-            pag.hotkey("ctrl", "s")
+            hotkey("ctrl", "s")
             sleep(1)
-            pag.hotkey("alt", "f4")
+            hotkey("alt", "f4")
 
     except Exception as ex:
         app_logger.error(f"Error writing text into file, Ex: {ex}")
@@ -144,7 +142,7 @@ def delete_file(filename):
         else:
             write(f"del {filename}", 0.1)
         sleep(1)
-        pag.press("enter")
+        press("enter")
     except Exception as ex:
         app_logger.error(f"Error deleting file {filename}, Ex: {ex}")
 
@@ -159,7 +157,7 @@ def compile_c_program(filename, output_filename):
     try:
         write(f"gcc {filename} -o {output_filename}", 0.1)
         sleep(1)
-        pag.press("enter")
+        press("enter")
     except Exception as ex:
         app_logger.error(f"Error copiling c program, Ex: {ex}")
         sys.exit(1)
@@ -175,7 +173,7 @@ def run_c_program(filename):
     try:
         write(f"./{filename}", 0.1)
         sleep(1)
-        pag.press("enter")
+        press("enter")
     except Exception as ex:
         app_logger.error(f"Error running c program, Ex: {ex}")
         sys.exit(1)
@@ -191,7 +189,7 @@ def run_ps_program(filename):
     try:
         write(f"powershell -file {filename}", 0.1)
         sleep(1)
-        pag.press("enter")
+        press("enter")
     except Exception as ex:
         app_logger.error(f"Error running powershell program, Ex: {ex}")
 
@@ -200,34 +198,34 @@ def escape():
     """
     Escape, ESC
     """
-    pag.press("esc")
+    press("esc")
 
 
 def copy():
     """
     Copy, CTRL+C
     """
-    pag.hotkey("ctrl", "c")
+    hotkey("ctrl", "c")
 
 
 def cut():
     """
     Cut, CTRL+X
     """
-    pag.hotkey("ctrl", "x")
+    hotkey("ctrl", "x")
 
 
 def open_downloads_folder():
-    pag.hotkey("win", "r")
+    hotkey("win", "r")
     sleep(0.1)
     write("downloads", 0.1)
     sleep(0.1)
-    pag.press("enter")
+    press("enter")
 
 
 def paste():
     # TODO: add recognition of duplicate files
-    pag.hotkey("ctrl", "v")
+    hotkey("ctrl", "v")
 
 
 def rename(new_name):
@@ -237,11 +235,11 @@ def rename(new_name):
         - File selected
     """
     sleep(1)
-    pag.press("f2")
+    press("f2")
     sleep(1)
     write(new_name, 0.1)
     sleep(1)
-    pag.press("enter")
+    press("enter")
     sleep(1)
 
 
@@ -251,7 +249,7 @@ def maximize_window():
     Prerequisites:
         - Opened window
     """
-    pag.hotkey("win", "up")
+    hotkey("win", "up")
 
 
 def minimize_window():
@@ -260,21 +258,21 @@ def minimize_window():
     Prerequisites:
         - Opened window
     """
-    pag.hotkey("win", "down")
+    hotkey("win", "down")
 
 
 def altf4():
     """
     Quit, ALT + F4
     """
-    pag.hotkey("alt", "f4")
+    hotkey("alt", "f4")
 
 
 def ctrlf():
     """
     Find, CTRL + F
     """
-    pag.hotkey("ctrl", "f")
+    hotkey("ctrl", "f")
 
 
 def open_file_options():
@@ -283,7 +281,7 @@ def open_file_options():
     Prerequisites:
         - File selected
     """
-    pag.hotkey("shift", "f10")
+    hotkey("shift", "f10")
 
 
 def extract_file():
@@ -294,8 +292,8 @@ def extract_file():
     """
     open_file_options()
     sleep(1)
-    pag.press("t")
+    press("t")
     sleep(1)
-    pag.press("enter")
+    press("enter")
     sleep(1)
-    pag.press("enter")
+    press("enter")
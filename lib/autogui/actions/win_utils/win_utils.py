@@ -5,15 +5,15 @@ Prerequisites:
     - Windows operating system
 """
 
-import os
-import time
-
-import pyautogui as pag
-
-from lib.autogui import locate_image_center
+from lib.autogui import hotkey, locate_image_center, press, write
 from lib.cancellable_futures.decorators import with_pool
+from lib.clock import clock
 
-PARENT_DIR = os.path.abspath(os.path.dirname(os.path.abspath(__file__)))
+ASSET_DIR = "lib/autogui/actions/win_utils"
+EXPLORER_IMAGE = f"{ASSET_DIR}/explorer.png"
+THUNDERBIRD_IMAGE = "lib/autogui/actions/thunderbird/thunderbird.png"
+# Catalog names of every image looked up here, validated with the behaviour registry
+ASSETS: tuple[str, ...] = (EXPLORER_IMAGE, THUNDERBIRD_IMAGE)
 
 
 @with_pool
@@ -21,10 +21,10 @@ def open_explorer(pool, timeout: int = 5, **kwargs):
     name, location = pool.race(
         {
             "find_explorer": lambda: locate_image_center(
-                os.path.join(PARENT_DIR, "explorer.png"), timeout=timeout, confidence=0.6, grayscale=True, **kwargs
+                EXPLORER_IMAGE, timeout=timeout, confidence=0.6, grayscale=True, **kwargs
             ),
             "find_thunderbird": lambda: locate_image_center(
-                os.path.join(PARENT_DIR, "thunderbird.png"), timeout=timeout, confidence=0.6, grayscale=True, **kwargs
+                THUNDERBIRD_IMAGE, timeout=timeout, confidence=0.6, grayscale=True, **kwargs
             ),
         }
     )
@@ -180,34 +180,34 @@ def escape():
     """
     Escape, ESC
     """
-    pag.press("esc")
+    press("esc")
 
 
 def copy():
     """
     Copy, CTRL+C
     """
-    pag.hotkey("ctrl", "c")
+    hotkey("ctrl", "c")
 
 
 def cut():
     """
     Cut, CTRL+X
     """
-    pag.hotkey("ctrl", "x")
+    hotkey("ctrl", "x")
 
 
 def open_downloads_folder():
-    pag.hotkey("win", "r")
-    time.sleep(0.1)
-    pag.write("downloads", 0.1)
-    time.sleep(0.1)
-    pag.press("enter")
+    hotkey("win", "r")
+    clock.sleep(0.1)
+    write("downloads", 0.1)
+    clock.sleep(0.1)
+    press("enter")
 
 
 def paste():
     # TODO: add recognition of duplicate files
-    pag.hotkey("ctrl", "v")
+    hotkey("ctrl", "v")
 
 
 def rename(new_name):
@@ -216,13 +216,13 @@ def rename(new_name):
     Prerequisites:
         - File selected
     """
-    time.sleep(1)
-    pag.press("f2")
-    time.sleep(1)
-    pag.write(new_name, 0.1)
-    time.sleep(1)
-    pag.press("enter")
-    time.sleep(1)
+    clock.sleep(1)
+    press("f2")
+    clock.sleep(1)
+    write(new_name, 0.1)
+    clock.sleep(1)
+    press("enter")
+    clock.sleep(1)
 
 
 def maximize_window():
@@ -231,7 +231,7 @@ def maximize_window():
     Prerequisites:
         - Opened window
     """
-    pag.hotkey("win", "up")
+    hotkey("win", "up")
 
 
 def minimize_window():
@@ -240,18 +240,18 @@ def minimize_window():
     Prerequisites:
         - Opened window
     """
-    pag.hotkey("win", "down")
+    hotkey("win", "down")
 
 
 def altf4():
     """
     Quit, ALT + F4
     """
-    pag.hotkey("alt", "f4")
+    hotkey("alt", "f4")
 
 
 def ctrlf():
     """
     Find, CTRL + F
     """
-    pag.hotkey("ctrl", "f")
+    hotkey("ctrl", "f")
@@ -0,0 +1,282 @@
+"""Catalog of the image assets used for screen lookups.
+
+Templates live in two places: ``images/`` (resolved via ``get_image_path``)
+and next to the action modules under ``lib/autogui/actions``.  The catalog
+indexes both trees once, on first use, keyed by the path relative to the
+resource root (``images/apps/ms_office/word/icon.png``,
+``lib/autogui/actions/roundcube_web/roundcube_logo.png``), so in a PyInstaller
+build the same names resolve inside the extracted bundle.
+
+Decoded colour/grayscale arrays are kept in a byte-bounded LRU cache, so each
+PNG is read and decoded once instead of on every match.  Every asset is
+checked against the SHA-256 manifest (``assets.sha256`` next to this module).
+Behaviours list the assets they need in ``BaseBehaviour.assets``, and registry
+validation fails at start-up when one of them is missing or stale.  Before,
+that only surfaced mid-behaviour, after a lookup had waited out its timeout.
+
+Usage::
+
+    image = asset_catalog.load("images/apps/ms_office/word/icon.png", grayscale=True)
+    asset_catalog.validate(["images/apps/libre_office/writer/icon.png"])   # [] when all good
+
+Regenerate the manifest after adding or replacing images::
+
+    python -m lib.autogui.assets
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import cv2
+import numpy as np
+
+from resource_path import resource_path
+from src.logger import app_logger
+
+ASSET_DIRS: tuple[str, ...] = ("images", os.path.join("lib", "autogui", "actions"))
+ASSET_EXTENSIONS: tuple[str, ...] = (".png", ".jpg", ".jpeg", ".bmp")
+MANIFEST_PATH: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets.sha256")
+DEFAULT_CACHE_BYTES: int = 64 * 1024 * 1024
+
+
+class AssetError(FileNotFoundError):
+    pass
+
+
+@dataclass(slots=True)
+class Asset:
+    name: str
+    path: str
+    size: int
+    mtime: float
+    sha256: Optional[str] = None
+
+    def is_stale(self) -> bool:
+        """Whether the file changed on disk since it was indexed."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return True
+        return stat.st_size != self.size or stat.st_mtime != self.mtime
+
+
+def _asset_name(path: str, root: str) -> str:
+    return os.path.relpath(path, root).replace(os.sep, "/")
+
+
+def _read_manifest(path: str) -> dict[str, str]:
+    """``sha256sum``-style manifest: ``<hex digest>  <asset name>`` per line."""
+    manifest: dict[str, str] = {}
+    if not os.path.exists(path):
+        return manifest
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            digest, name = line.split(maxsplit=1)
+            manifest[name.lstrip("*")] = digest
+    return manifest
+
+
+class AssetCatalog:
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        manifest_path: str = MANIFEST_PATH,
+        cache_bytes: int = DEFAULT_CACHE_BYTES,
+    ):
+        self.root = root or resource_path("")
+        self.manifest_path = manifest_path
+        self.cache_bytes = cache_bytes
+
+        self._lock = threading.RLock()
+        self._assets: Optional[dict[str, Asset]] = None
+        self._manifest: Optional[dict[str, str]] = None
+        self._arrays: OrderedDict[tuple[str, bool], np.ndarray] = OrderedDict()
+        self._cached_bytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    # -- index ---------------------------------------------------------------
+
+    def _index(self) -> dict[str, Asset]:
+        with self._lock:
+            if self._assets is None:
+                assets: dict[str, Asset] = {}
+                for directory in ASSET_DIRS:
+                    for dirpath, _, filenames in os.walk(os.path.join(self.root, directory)):
+                        for filename in filenames:
+                            if not filename.lower().endswith(ASSET_EXTENSIONS):
+                                continue
+                            path = os.path.join(dirpath, filename)
+                            stat = os.stat(path)
+                            name = _asset_name(path, self.root)
+                            assets[name] = Asset(name, path, stat.st_size, stat.st_mtime)
+                self._assets = assets
+                app_logger.debug(f"Asset catalog indexed {len(assets)} images")
+            return self._assets
+
+    def _manifest_digests(self) -> dict[str, str]:
+        with self._lock:
+            if self._manifest is None:
+                self._manifest = _read_manifest(self.manifest_path)
+            return self._manifest
+
+    def names(self) -> list[str]:
+        return sorted(self._index())
+
+    def resolve(self, image) -> Asset:
+        """Look up an asset by catalog name or by (absolute) file path."""
+        image = str(image)
+        assets = self._index()
+        name = image.replace(os.sep, "/")
+        if os.path.isabs(image):
+            name = _asset_name(os.path.normpath(image), self.root)
+
+        asset = assets.get(name)
+        if asset is None:
+            raise AssetError(f"Image asset not found: {image}")
+        return asset
+
+    def path(self, name: str) -> str:
+        return self.resolve(name).path
+
+    # -- checksums -----------------------------------------------------------
+
+    @staticmethod
+    def _hash(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def _read(asset: Asset) -> Optional[bytes]:
+        try:
+            with open(asset.path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _refresh(self, asset: Asset) -> Optional[bytes]:
+        """Re-hash a new or changed asset and drop its decoded arrays; returns the content."""
+        data = self._read(asset)
+        if data is None:
+            return None
+        stat = os.stat(asset.path)
+
+        with self._lock:
+            asset.size, asset.mtime, asset.sha256 = stat.st_size, stat.st_mtime, self._hash(data)
+            for grayscale in (True, False):
+                cached = self._arrays.pop((asset.name, grayscale), None)
+                if cached is not None:
+                    self._cached_bytes -= cached.nbytes
+        return data
+
+    def checksum(self, image) -> str:
+        asset = self.resolve(image)
+        if asset.sha256 is None or asset.is_stale():
+            if self._refresh(asset) is None:
+                raise AssetError(f"Image asset disappeared: {asset.path}")
+        return asset.sha256
+
+    def validate(self, names: Optional[Iterable[str]] = None) -> list[str]:
+        """Problems with *names* (every manifest entry by default); an empty list means all good."""
+        manifest = self._manifest_digests()
+        names = list(manifest) if names is None else list(names)
+        problems: list[str] = []
+
+        for name in names:
+            try:
+                digest = self.checksum(name)
+            except AssetError:
+                problems.append(f"{name}: missing")
+                continue
+
+            expected = manifest.get(name)
+            if expected is None:
+                problems.append(f"{name}: not listed in {os.path.basename(self.manifest_path)}")
+            elif expected != digest:
+                problems.append(f"{name}: checksum mismatch (stale asset)")
+        return problems
+
+    def write_manifest(self, path: Optional[str] = None) -> int:
+        names = self.names()
+        with open(path or self.manifest_path, "w", encoding="utf-8", newline="\n") as f:
+            for name in names:
+                f.write(f"{self.checksum(name)}  {name}\n")
+        with self._lock:
+            self._manifest = None
+        return len(names)
+
+    # -- decoded arrays ------------------------------------------------------
+
+    def load(self, image, grayscale: bool = False) -> np.ndarray:
+        """Decoded BGR (or grayscale) array of *image*, served from the bounded cache."""
+        asset = self.resolve(image)
+        key = (asset.name, grayscale)
+
+        with self._lock:
+            array = self._arrays.get(key)
+            if array is not None and not asset.is_stale():
+                self._arrays.move_to_end(key)
+                self._hits += 1
+                return array
+            self._misses += 1
+
+        if asset.sha256 is None or asset.is_stale():
+            data = self._refresh(asset)
+        else:
+            data = self._read(asset)
+        if data is None:
+            raise AssetError(f"Image asset disappeared: {asset.path}")
+
+        expected = self._manifest_digests().get(asset.name)
+        if expected is not None and expected != asset.sha256:
+            app_logger.warning(f"Image asset {asset.name} does not match its manifest checksum")
+
+        flags = cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_COLOR
+        array = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), flags)
+        if array is None:
+            raise AssetError(f"Image asset could not be decoded: {asset.path}")
+
+        with self._lock:
+            previous = self._arrays.pop(key, None)
+            if previous is not None:
+                self._cached_bytes -= previous.nbytes
+            self._arrays[key] = array
+            self._cached_bytes += array.nbytes
+            while self._cached_bytes > self.cache_bytes and len(self._arrays) > 1:
+                _, evicted = self._arrays.popitem(last=False)
+                self._cached_bytes -= evicted.nbytes
+        return array
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "assets": len(self._assets or {}),
+                "cached": len(self._arrays),
+                "cached_bytes": self._cached_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._assets = None
+            self._manifest = None
+            self._arrays.clear()
+            self._cached_bytes = 0
+
+
+asset_catalog = AssetCatalog()
+
+
+if __name__ == "__main__":
+    count = asset_catalog.write_manifest()
+    print(f"Wrote {count} checksums to {asset_catalog.manifest_path}")
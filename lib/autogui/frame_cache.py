@@ -0,0 +1,118 @@
+"""Short-lived screenshot cache shared by image lookups.
+
+``pyautogui.locateCenterOnScreen`` grabs the whole screen on every call, so
+helpers that probe for several images in a row (or race two lookups on the
+pool) pay one full capture per probe.  :data:`frame_cache` keeps the last
+capture for ``FRAME_TTL`` seconds; consecutive lookups match against the same
+frame.  Input sent through :mod:`lib.autogui` (``press``, ``hotkey``,
+``click``, ``write``) invalidates the frame, since it is expected to change
+the screen.  Input sent around this module is only bounded by the TTL.
+
+Lookups go through :data:`~lib.autogui.template_matcher.template_matcher`, so
+the grayscale/colour arrays of a capture are converted once and shared as
+well, and icons captured at 100 % scaling are still found on HiDPI displays.
+
+Usage::
+
+    point = locate_center("images/apps/excel.png", confidence=0.8, grayscale=True)
+    frame_cache.stats()   # {"captures": 3, "hits": 11}
+"""
+
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+import pyautogui
+
+from lib.autogui.template_matcher import frame_to_array, template_matcher
+from lib.cancellable_futures import sleep as _cancellable_sleep
+
+FRAME_TTL: float = 0.25
+
+
+def _pause(seconds: float) -> None:
+    try:
+        _cancellable_sleep(seconds, traced=False)
+    except LookupError:
+        time.sleep(seconds)
+
+
+class FrameCache:
+    def __init__(self, ttl: float = FRAME_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._frame = None
+        self._arrays: dict[bool, np.ndarray] = {}
+        self._captured_at = 0.0
+        self._captures = 0
+        self._hits = 0
+
+    def grab(self):
+        """Return the cached frame while it is fresh, otherwise capture a new one."""
+        with self._lock:
+            if self._frame is not None and time.monotonic() - self._captured_at < self.ttl:
+                self._hits += 1
+                return self._frame
+
+            self._frame = pyautogui.screenshot()
+            self._arrays = {}
+            self._captured_at = time.monotonic()
+            self._captures += 1
+            return self._frame
+
+    def grab_arrays(self, color: bool = True) -> tuple[np.ndarray, Optional[np.ndarray]]:
+        """:meth:`grab` as ``(grayscale, BGR or None)`` arrays of the same capture.
+
+        Conversions are done once per capture and shared by every lookup on it.
+        """
+        frame = self.grab()
+        with self._lock:
+            arrays = self._arrays if frame is self._frame else {}
+            for grayscale in (True, False) if color else (True,):
+                if grayscale not in arrays:
+                    arrays[grayscale] = frame_to_array(frame, grayscale)
+            return arrays[True], arrays.get(False) if color else None
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._frame = None
+
+    def time_to_refresh(self) -> float:
+        """Seconds until the cached frame expires (0 when a grab would capture)."""
+        with self._lock:
+            if self._frame is None:
+                return 0.0
+            return max(0.0, self._captured_at + self.ttl - time.monotonic())
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"captures": self._captures, "hits": self._hits}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._captures = 0
+            self._hits = 0
+
+
+frame_cache = FrameCache()
+
+
+def locate_center(image, minSearchTime: float = 0, **kwargs) -> Optional[pyautogui.Point]:
+    """Drop-in for ``pyautogui.locateCenterOnScreen`` that matches against :data:`frame_cache`.
+
+    Like the original, *minSearchTime* keeps retrying on fresh frames.  A miss
+    returns ``None``; the image is matched at every display scale, not only 100 %.
+    """
+    grayscale = bool(kwargs.pop("grayscale", False))
+    deadline = time.monotonic() + minSearchTime
+    while True:
+        gray, color = frame_cache.grab_arrays(color=not grayscale)
+        box = template_matcher.locate(image, gray, color, grayscale=grayscale, **kwargs)
+
+        if box is not None:
+            return pyautogui.center(box)
+        if time.monotonic() >= deadline:
+            return None
+
+        _pause(max(frame_cache.time_to_refresh(), 0.01))
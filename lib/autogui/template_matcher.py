@@ -0,0 +1,205 @@
+"""Multi-scale template matching for screen lookups.
+
+The icon PNGs were captured at 100 % display scaling; on 125 %/150 % hosts a
+single-scale match never reaches the confidence threshold and the lookup burns
+its whole timeout.  A :class:`Template` therefore precomputes a pyramid of
+resized copies (``SCALES``) once when it is first loaded, both at full
+resolution and at ``COARSE_FACTOR`` for a cheap first pass.
+
+Matching runs on a downscaled frame first and only refines the best candidate
+at full resolution inside a small window around it.  Downscaling can push a
+template that is on screen below the coarse threshold (thin strokes, an odd
+pixel offset), so a lookup only misses after a full-resolution match at every
+scale.  The scale that won is remembered per display (frame size), so later
+lookups on the same display try it first and usually succeed on the first frame.
+
+Usage::
+
+    gray = frame_to_array(pyautogui.screenshot(), grayscale=True)
+    box = template_matcher.locate("images/apps/ms_office/word/icon.png", gray, confidence=0.8, grayscale=True)
+    template_matcher.winning_scale((1920, 1080))   # 1.25
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from lib.autogui.assets import AssetError, asset_catalog
+
+Box = namedtuple("Box", "left top width height")
+
+SCALES: tuple[float, ...] = (1.0, 1.25, 1.5, 1.75, 2.0, 0.8)
+COARSE_FACTOR: float = 0.5
+# Coarse scores are noisier; candidates within this margin of the threshold get refined
+COARSE_SLACK: float = 0.15
+# Below this size (px) a coarse template carries too little signal, match at full resolution
+MIN_COARSE_SIZE: int = 12
+REFINE_MARGIN: int = 8
+# Pyramids are several times the size of the template, keep only the recently used ones
+MAX_TEMPLATES: int = 64
+
+
+def frame_to_array(frame, grayscale: bool) -> np.ndarray:
+    """Screenshot (PIL RGB image or BGR array) to a BGR or grayscale array."""
+    if isinstance(frame, np.ndarray):
+        array = frame
+        if array.ndim == 2:
+            return array if grayscale else cv2.cvtColor(array, cv2.COLOR_GRAY2BGR)
+        return cv2.cvtColor(array, cv2.COLOR_BGR2GRAY) if grayscale else array
+
+    array = np.asarray(frame.convert("RGB"))
+    return cv2.cvtColor(array, cv2.COLOR_RGB2GRAY if grayscale else cv2.COLOR_RGB2BGR)
+
+
+def _resize(image: np.ndarray, factor: float) -> np.ndarray:
+    height, width = image.shape[:2]
+    size = (max(1, round(width * factor)), max(1, round(height * factor)))
+    interpolation = cv2.INTER_AREA if factor < 1 else cv2.INTER_LINEAR
+    return cv2.resize(image, size, interpolation=interpolation)
+
+
+def _best_match(haystack: np.ndarray, needle: np.ndarray) -> tuple[float, tuple[int, int]]:
+    if needle.shape[0] > haystack.shape[0] or needle.shape[1] > haystack.shape[1]:
+        return -1.0, (0, 0)
+    result = cv2.matchTemplate(haystack, needle, cv2.TM_CCOEFF_NORMED)
+    _, score, _, location = cv2.minMaxLoc(result)
+    return score, location
+
+
+class Template:
+    """Decoded template plus its precomputed scale pyramids."""
+
+    def __init__(self, name: str, color: np.ndarray):
+        self.name = name
+        gray = cv2.cvtColor(color, cv2.COLOR_BGR2GRAY)
+
+        self.levels: dict[tuple[float, bool], np.ndarray] = {}
+        self.coarse: dict[float, Optional[np.ndarray]] = {}
+        for scale in SCALES:
+            self.levels[(scale, True)] = gray if scale == 1.0 else _resize(gray, scale)
+            self.levels[(scale, False)] = color if scale == 1.0 else _resize(color, scale)
+
+            coarse = _resize(gray, scale * COARSE_FACTOR)
+            self.coarse[scale] = coarse if min(coarse.shape[:2]) >= MIN_COARSE_SIZE else None
+
+    @classmethod
+    def load(cls, path: str) -> "Template":
+        try:
+            color = asset_catalog.load(path)
+        except AssetError:
+            # Images outside the catalog roots (ad hoc screenshots) are read directly
+            color = cv2.imread(path, cv2.IMREAD_COLOR)
+            if color is None:
+                raise
+        return cls(path, color)
+
+
+class TemplateMatcher:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._templates: OrderedDict[str, Template] = OrderedDict()
+        self._winning_scales: dict[tuple[int, int], float] = {}
+
+    def template(self, path: str) -> Template:
+        path = str(path)
+        with self._lock:
+            template = self._templates.get(path)
+            if template is not None:
+                self._templates.move_to_end(path)
+                return template
+
+        template = Template.load(path)
+        with self._lock:
+            template = self._templates.setdefault(path, template)
+            while len(self._templates) > MAX_TEMPLATES:
+                self._templates.popitem(last=False)
+        return template
+
+    def winning_scale(self, display: tuple[int, int]) -> Optional[float]:
+        with self._lock:
+            return self._winning_scales.get(display)
+
+    def _scale_order(self, display: tuple[int, int]) -> list[float]:
+        preferred = self.winning_scale(display) or 1.0
+        return sorted(SCALES, key=lambda scale: abs(scale - preferred))
+
+    def locate(
+        self,
+        image,
+        gray_frame: np.ndarray,
+        color_frame: Optional[np.ndarray] = None,
+        confidence: float = 0.999,
+        grayscale: bool = False,
+        region: Optional[tuple[int, int, int, int]] = None,
+        **_,
+    ) -> Optional[Box]:
+        """Find *image* in the frame; returns its box in frame coordinates or ``None``.
+
+        *gray_frame* drives the coarse pass and is also the haystack when
+        *grayscale* is set; otherwise *color_frame* (BGR) is refined against.
+        Unknown pyautogui keywords (``limit``, ``step``) are ignored.
+        """
+        template = self.template(image)
+        display = (gray_frame.shape[1], gray_frame.shape[0])
+        haystack = gray_frame if grayscale or color_frame is None else color_frame
+        grayscale = haystack is gray_frame
+
+        offset_x, offset_y = 0, 0
+        if region is not None:
+            offset_x, offset_y, width, height = region
+            haystack = haystack[offset_y : offset_y + height, offset_x : offset_x + width]
+            gray_frame = gray_frame[offset_y : offset_y + height, offset_x : offset_x + width]
+
+        coarse_frame = _resize(gray_frame, COARSE_FACTOR)
+        scales = self._scale_order(display)
+
+        # Cheap pass: coarse match per scale, refined around its best candidate
+        for scale in scales:
+            coarse_needle = template.coarse[scale]
+            if coarse_needle is None:
+                continue
+            coarse_score, (cx, cy) = _best_match(coarse_frame, coarse_needle)
+            if coarse_score < confidence - COARSE_SLACK:
+                continue
+            needle = template.levels[(scale, grayscale)]
+            score, (x, y) = self._refine(haystack, needle, round(cx / COARSE_FACTOR), round(cy / COARSE_FACTOR))
+            if score >= confidence:
+                return self._found(display, scale, needle, x + offset_x, y + offset_y)
+
+        # The coarse pass is only a shortcut: confirm a miss at full resolution
+        for scale in scales:
+            needle = template.levels[(scale, grayscale)]
+            score, (x, y) = _best_match(haystack, needle)
+            if score >= confidence:
+                return self._found(display, scale, needle, x + offset_x, y + offset_y)
+
+        return None
+
+    def _found(self, display: tuple[int, int], scale: float, needle: np.ndarray, x: int, y: int) -> Box:
+        with self._lock:
+            self._winning_scales[display] = scale
+        height, width = needle.shape[:2]
+        return Box(x, y, width, height)
+
+    @staticmethod
+    def _refine(haystack: np.ndarray, needle: np.ndarray, x: int, y: int) -> tuple[float, tuple[int, int]]:
+        """Full-resolution match in a window around the coarse candidate at ``(x, y)``."""
+        height, width = needle.shape[:2]
+        margin = REFINE_MARGIN + round(1 / COARSE_FACTOR)
+        left, top = max(0, x - margin), max(0, y - margin)
+        window = haystack[top : y + height + margin, left : x + width + margin]
+        score, (wx, wy) = _best_match(window, needle)
+        return score, (left + wx, top + wy)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+            self._winning_scales.clear()
+
+
+template_matcher = TemplateMatcher()
@@ -18,6 +18,13 @@ Usage::
     # race — first to finish wins, rest are cancelled
     winner, value = pool.race({"a": fn_a, "b": fn_b}, timeout=5)
 
+    # dependency graph — independent steps run concurrently
+    results = pool.run_steps([
+        Step("driver", start_driver),
+        Step("corpus", load_corpus),
+        Step("open_mail", open_mail, after=("driver",)),
+    ])
+
     # cancel everything
     pool.cancel()
 
@@ -38,14 +45,19 @@ import contextvars
 import threading
 import time
 import typing
-from concurrent.futures import Future, ThreadPoolExecutor, as_completed
-from typing import Callable, Generic, Optional
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Generic, Iterable, Optional
 
+import lib.tracing as tracing
 from lib.cancellable_futures.exceptions import OperationCancelled
+from lib.clock import clock
 
 T = typing.TypeVar("T")
 
 DEFAULT_POLL_FREQUENCY: float = 0.05
+DEFAULT_HISTORY_SIZE: int = 32
 
 
 # -- task handle --------------------------------------------------------------
@@ -94,6 +106,44 @@ class TaskHandle(Generic[T]):
         self._future.add_done_callback(fn)
 
 
+# -- steps --------------------------------------------------------------------
+
+
+@dataclass(slots=True)
+class Step:
+    """One node of a step graph for :meth:`CancellableThreadPoolExecutor.run_steps`.
+
+    *after* names the steps that must have finished before this one starts.
+    """
+
+    name: str
+    fn: Callable[..., Any]
+    args: tuple = ()
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    after: tuple[str, ...] = ()
+
+
+def _check_step_graph(steps: dict[str, Step]) -> None:
+    for step in steps.values():
+        unknown = [dep for dep in step.after if dep not in steps]
+        if unknown:
+            raise ValueError(f"Step {step.name!r} depends on unknown step(s): {', '.join(unknown)}")
+
+    # Kahn's algorithm: whatever cannot be ordered is part of a cycle
+    pending = {name: set(step.after) for name, step in steps.items()}
+    ready = [name for name, deps in pending.items() if not deps]
+    while ready:
+        done = ready.pop()
+        del pending[done]
+        for name, deps in pending.items():
+            if done in deps:
+                deps.discard(done)
+                if not deps:
+                    ready.append(name)
+    if pending:
+        raise ValueError(f"Step graph has a cycle between: {', '.join(sorted(pending))}")
+
+
 # -- executor -----------------------------------------------------------------
 
 
@@ -106,24 +156,37 @@ class CancellableThreadPoolExecutor:
                          ``sleep()``.  Lower values = more responsive
                          cancellation, higher CPU usage.
                          Default 50ms
+        history_size:    Number of finished task handles kept for
+                         diagnostics.  Finished handles are evicted from
+                         the live registry as soon as they complete, so
+                         memory stays flat no matter how many tasks a
+                         long-running behaviour submits.  Finished tasks
+                         not yet seen by ``join()`` are kept apart from
+                         this history (one per task name) until it
+                         reports them.
+                         Default 32
     """
 
     def __init__(
         self,
         max_workers: Optional[int] = None,
         poll_frequency: float = DEFAULT_POLL_FREQUENCY,
+        history_size: int = DEFAULT_HISTORY_SIZE,
     ):
         self._poll = poll_frequency
         self._global_event = threading.Event()
         self._executor = ThreadPoolExecutor(max_workers=max_workers)
         self._tasks: dict[str, TaskHandle] = {}
+        self._recent: OrderedDict[str, TaskHandle] = OrderedDict()
+        # Finished since the last join(), whatever the history size
+        self._unjoined: dict[str, TaskHandle] = {}
+        self._history_size = max(0, history_size)
+        self._active = 0
         self._lock = threading.Lock()
         self._local = threading.local()
 
     def __repr__(self):
-        with self._lock:
-            active = sum(1 for t in self._tasks.values() if not t.done)
-        return f"<CancellableThreadPoolExecutor active={active}>"
+        return f"<CancellableThreadPoolExecutor active={self._active}>"
 
     def __enter__(self):
         return self
@@ -152,18 +215,39 @@ class CancellableThreadPoolExecutor:
                 raise RuntimeError(f"Task {task_name!r} is already running")
 
         event = threading.Event()
-        future = self._executor.submit(self._run, event, fn, *args, **kwargs)
+        parent_span = tracing.current_span()
+        future = self._executor.submit(self._run, event, parent_span, task_name, fn, *args, **kwargs)
         handle = TaskHandle(task_name, future, event)
 
         with self._lock:
             self._tasks[task_name] = handle
+            self._active += 1
+
+        # Registered after the handle is tracked; runs inline if already done.
+        future.add_done_callback(lambda _: self._evict(handle))
 
         return handle
 
-    def _run(self, event: threading.Event, fn, *args, **kwargs):
+    def _evict(self, handle: TaskHandle) -> None:
+        """Move a finished *handle* from the live registry to the bounded history."""
+        with self._lock:
+            self._active -= 1
+            if self._tasks.get(handle.name) is handle:
+                del self._tasks[handle.name]
+            self._unjoined[handle.name] = handle
+
+            if self._history_size:
+                self._recent[handle.name] = handle
+                self._recent.move_to_end(handle.name)
+                while len(self._recent) > self._history_size:
+                    self._recent.popitem(last=False)
+
+    def _run(self, event: threading.Event, parent_span, task_name: str, fn, *args, **kwargs):
         self._local.event = event
         _current_executor.set(self)
-        return fn(*args, **kwargs)
+        tracing.set_current_span(parent_span)
+        with tracing.span(f"task:{task_name}", step=task_name):
+            return fn(*args, **kwargs)
 
     # -- cancellation ---------------------------------------------------------
 
@@ -174,7 +258,7 @@ class CancellableThreadPoolExecutor:
             return
 
         with self._lock:
-            handle = self._tasks.get(name)
+            handle = self._tasks.get(name) or self._recent.get(name)
         if handle is None:
             raise KeyError(f"No task named {name!r}")
         handle.cancel()
@@ -191,24 +275,57 @@ class CancellableThreadPoolExecutor:
         if event is not None and event.is_set():
             raise OperationCancelled("Task cancelled")
 
-    def sleep(self, duration: float) -> None:
-        """Cancellation-aware ``time.sleep``."""
+    def sleep(self, duration: float, traced: bool = True) -> None:
+        """Cancellation-aware ``time.sleep``.
+
+        Recorded as a ``sleep`` span unless *traced* is False (used by
+        internal poll loops that are already covered by their own span).
+        Traced sleeps are realism delays and follow :data:`lib.clock.clock`
+        (compressed or skipped in soak tests); poll intervals stay real.
+        """
+        if traced:
+            with tracing.span("sleep", duration=duration):
+                self._sleep(clock.real_seconds(duration))
+                clock.advance(duration)
+        else:
+            self._sleep(duration)
+
+    def _sleep(self, duration: float) -> None:
+        self.check()
         deadline = time.monotonic() + duration
         while time.monotonic() < deadline:
             self.check()
             time.sleep(min(self._poll, deadline - time.monotonic()))
 
+    # -- introspection --------------------------------------------------------
+
+    @property
+    def active_count(self) -> int:
+        """Number of submitted tasks that have not finished yet."""
+        return self._active
+
+    @property
+    def recent(self) -> list[TaskHandle]:
+        """Most recently finished task handles, oldest first."""
+        with self._lock:
+            return list(self._recent.values())
+
     # -- bulk operations ------------------------------------------------------
 
     def join(self, timeout: Optional[float] = None) -> dict[str, TaskHandle]:
-        """Wait for every tracked task to finish."""
+        """Wait for every task running or finished since the last ``join()``; raises the first task error."""
         with self._lock:
-            tasks = dict(self._tasks)
+            tasks = {**self._unjoined, **self._tasks}
 
         futures = {t.future: t for t in tasks.values()}
         for _ in as_completed(futures, timeout=timeout):
             pass
 
+        with self._lock:
+            for name, t in tasks.items():
+                if self._unjoined.get(name) is t:
+                    del self._unjoined[name]
+
         for t in tasks.values():
             exc = t.exception
             if exc and not isinstance(exc, OperationCancelled):
@@ -239,17 +356,71 @@ class CancellableThreadPoolExecutor:
 
         raise TimeoutError("Race timed out")
 
+    def run_steps(self, steps: Iterable[Step], timeout: Optional[float] = None) -> dict[str, Any]:
+        """Run *steps* as a dependency graph; returns their results by name.
+
+        Each step is submitted as soon as all of its ``after`` steps have
+        finished, so independent steps overlap and the whole graph takes
+        about as long as its critical path.  The first failure cancels the
+        steps still running and is re-raised.  Must be called from outside
+        the pool (the behaviour thread), and the pool needs enough workers
+        for the widest level of the graph.
+        """
+        graph: dict[str, Step] = {}
+        for step in steps:
+            if step.name in graph:
+                raise ValueError(f"Duplicate step name {step.name!r}")
+            graph[step.name] = step
+        _check_step_graph(graph)
+
+        waiting = {name: set(step.after) for name, step in graph.items()}
+        running: dict[Future, TaskHandle] = {}
+        results: dict[str, Any] = {}
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        try:
+            while waiting or running:
+                for name in [name for name, deps in waiting.items() if not deps]:
+                    del waiting[name]
+                    step = graph[name]
+                    handle = self.submit(step.fn, *step.args, name=name, **step.kwargs)
+                    running[handle.future] = handle
+
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                done, _ = wait(running, timeout=remaining, return_when=FIRST_COMPLETED)
+                if not done:
+                    raise TimeoutError(f"Steps timed out: {', '.join(h.name for h in running.values())}")
+
+                for future in done:
+                    handle = running.pop(future)
+                    results[handle.name] = future.result()
+                    for deps in waiting.values():
+                        deps.discard(handle.name)
+        except BaseException:
+            for handle in running.values():
+                handle.cancel()
+            raise
+
+        return results
+
     # -- lifecycle ------------------------------------------------------------
 
     def reset(self, name: Optional[str] = None) -> None:
         """Remove finished tasks from tracking.  Clears global cancellation if
-        *name* is ``None``."""
+        *name* is ``None``.
+
+        Running tasks stay counted in ``active_count`` until they finish.
+        """
         with self._lock:
             if name is not None:
                 self._tasks.pop(name, None)
+                self._recent.pop(name, None)
+                self._unjoined.pop(name, None)
             else:
                 self._global_event.clear()
                 self._tasks.clear()
+                self._recent.clear()
+                self._unjoined.clear()
 
     def shutdown(self, wait: bool = True) -> None:
         """Cancel all tasks and shut down the underlying thread pool."""
@@ -272,6 +443,6 @@ def check() -> None:
     get_executor().check()
 
 
-def sleep(duration: float) -> None:
+def sleep(duration: float, traced: bool = True) -> None:
     """Module-level shortcut — calls ``sleep()`` on the current executor."""
-    get_executor().sleep(duration)
+    get_executor().sleep(duration, traced)
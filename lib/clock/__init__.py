@@ -0,0 +1,164 @@
+"""Process-wide clock for realism delays, with time compression for soak tests.
+
+Behaviours pause on purpose all the time: ``pool.sleep(3)`` between steps,
+``sleep(0.5)`` in helpers, typing intervals, randomised scroll pauses.  These
+delays and the time reads that plan around them (scheduler windows, budgets
+and cooldowns, behaviour durations, procrastination time) go through the
+global :data:`clock`.  It runs in one of three modes:
+
+- ``real`` (default): wall-clock time, unchanged behaviour.
+- ``scaled``: simulated time runs ``speed`` times faster than real time.
+  Delays last ``1/speed`` of their nominal length, and time reads advance
+  ``speed`` seconds per real second.
+- ``virtual``: delays return at once and move the clock forward by their
+  length.  Simulated time is real elapsed time plus all skipped delays.
+  Concurrent delays are added up, so the clock runs ahead of the real
+  schedule; that is fine for soak tests, which care about the order of events.
+
+``scaled`` and ``virtual`` may start at a configured simulated ``start``
+(e.g. the beginning of a workday), so a CI run can cover a full 8-hour
+working-hours window in minutes.
+
+Poll intervals are not realism delays.  Waits for the browser or the
+screen, and untraced ``pool.sleep(..., traced=False)`` calls, stay on real
+time.
+
+Usage::
+
+    clock.configure({"mode": "scaled", "speed": 60, "start": "2026-01-05 08:00"})
+    clock.sleep(30)                # 0.5 s real
+    clock.now()                    # simulated datetime
+    pag.write(text, clock.real_seconds(0.1))
+
+    with clock.using("virtual"):
+        ...                        # temporarily, e.g. in benchmarks
+"""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator, Optional, TypedDict
+
+CLOCK_MODES: tuple[str, ...] = ("real", "scaled", "virtual")
+
+
+class ClockConfig(TypedDict, total=False):
+    mode: str  # "real" | "scaled" | "virtual"
+    # Simulated seconds per real second (scaled mode)
+    speed: float
+    # Simulated start time, "YYYY-MM-DD HH:MM[:SS]"; defaults to now
+    start: str
+
+
+@dataclass(frozen=True, slots=True)
+class _Timeline:
+    mode: str
+    speed: float
+    # Simulated wall time and real monotonic time at the moment the timeline was set
+    wall_origin: float
+    real_origin: float
+
+
+class Clock:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._skipped = 0.0
+        self._timeline = _Timeline("real", 1.0, 0.0, 0.0)
+
+    def configure(self, config: Optional[ClockConfig]) -> None:
+        config = config or {}
+        start = config.get("start")
+        self.set(
+            config.get("mode", "real"),
+            float(config.get("speed", 1.0)),
+            datetime.fromisoformat(str(start)) if start else None,
+        )
+
+    def set(self, mode: str = "real", speed: float = 1.0, start: Optional[datetime] = None) -> None:
+        if mode not in CLOCK_MODES:
+            raise ValueError(f"Unknown clock mode '{mode}', expected one of: {', '.join(CLOCK_MODES)}")
+        if speed <= 0:
+            raise ValueError(f"Clock speed must be positive, got {speed}")
+
+        wall_origin = start.timestamp() if start is not None else self.time()
+        with self._lock:
+            self._skipped = 0.0
+            self._timeline = _Timeline(mode, speed if mode == "scaled" else 1.0, wall_origin, time.monotonic())
+
+    @contextlib.contextmanager
+    def using(self, mode: str, speed: float = 1.0, start: Optional[datetime] = None) -> Iterator[Clock]:
+        """Switch modes for the duration of the block, then continue from the current simulated time."""
+        previous = self._timeline
+        self.set(mode, speed, start)
+        try:
+            yield self
+        finally:
+            self.set(previous.mode, previous.speed)
+
+    @property
+    def mode(self) -> str:
+        return self._timeline.mode
+
+    @property
+    def realtime(self) -> bool:
+        return self._timeline.mode == "real"
+
+    @property
+    def virtual(self) -> bool:
+        return self._timeline.mode == "virtual"
+
+    # -- reading -------------------------------------------------------------
+
+    def _elapsed(self, timeline: _Timeline) -> float:
+        return (time.monotonic() - timeline.real_origin) * timeline.speed + self._skipped
+
+    def time(self) -> float:
+        """Simulated ``time.time()``."""
+        timeline = self._timeline
+        if timeline.mode == "real":
+            return time.time()
+        return timeline.wall_origin + self._elapsed(timeline)
+
+    def monotonic(self) -> float:
+        """Simulated ``time.monotonic()``; only differences are meaningful."""
+        timeline = self._timeline
+        if timeline.mode == "real":
+            return time.monotonic()
+        return timeline.real_origin + self._elapsed(timeline)
+
+    def now(self) -> datetime:
+        """Simulated ``datetime.now()``."""
+        if self.realtime:
+            return datetime.now()
+        return datetime.fromtimestamp(self.time())
+
+    # -- waiting -------------------------------------------------------------
+
+    def real_seconds(self, seconds: float) -> float:
+        """Real duration of a simulated delay, for interval arguments of third-party calls."""
+        timeline = self._timeline
+        if timeline.mode == "virtual":
+            return 0.0
+        return seconds / timeline.speed
+
+    def advance(self, seconds: float) -> None:
+        """Move the virtual clock forward by *seconds*; a no-op in the other modes."""
+        if seconds > 0 and self.virtual:
+            with self._lock:
+                self._skipped += seconds
+
+    def sleep(self, seconds: float) -> None:
+        """Realism delay of *seconds* simulated seconds (not cancellable, see ``pool.sleep`` for that)."""
+        if self.virtual:
+            self.advance(seconds)
+            # Still let other threads run, as a real sleep would
+            time.sleep(0)
+        else:
+            time.sleep(self.real_seconds(seconds))
+
+
+clock = Clock()
@@ -0,0 +1,86 @@
+"""Address book: normalized email addresses and the display names used in templates.
+
+Email templates greet the receiver with ``{{ receiver_name }}``.  Names come
+from ``automation.general.address_book`` (address -> name), from a
+``"Jane Doe <jane.doe@domain.internal>"`` receiver entry, or, failing both,
+from the local part of the address (``jane.doe@...`` -> ``Jane``).  Addresses
+are compared trimmed and lower-cased, and every lookup is resolved once and
+cached, so a conversation starter mailing many receivers does not re-derive
+names on every send.
+
+The book is configured once per process (see ``worker.configure_runtime``);
+edits to ``address_book`` apply after a restart.
+
+Usage::
+
+    address_book.configure(current_config().raw["automation"]["general"].get("address_book"))
+    address_book.normalize("Jane Doe <Jane.Doe@Domain.internal>")  # "jane.doe@domain.internal"
+    address_book.display_name("jane.doe@domain.internal")            # "Jane Doe"
+    address_book.display_name("john.smith@domain.internal")          # "John"
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from typing import Mapping, Optional
+
+_NAMED_ADDRESS = re.compile(r"^\s*\"?(?P<name>[^\"<]*?)\"?\s*<(?P<address>[^>]+)>\s*$")
+
+
+def parse_address(entry: str) -> tuple[str, Optional[str]]:
+    """Split a receiver entry into its normalized address and the display name given with it, if any."""
+    match = _NAMED_ADDRESS.match(entry)
+    if match is None:
+        return entry.strip().lower(), None
+    return match["address"].strip().lower(), match["name"].strip() or None
+
+
+def derive_name(address: str) -> str:
+    """Display name guessed from the local part, e.g. ``jane.doe@domain.internal`` -> ``Jane``."""
+    return address.split("@")[0].split(".")[0].capitalize()
+
+
+class AddressBook:
+    def __init__(self, names: Optional[Mapping[str, str]] = None):
+        self._lock = threading.Lock()
+        self._configured: dict[str, str] = {}
+        self._names: dict[str, str] = {}
+        self._addresses: dict[str, str] = {}
+        self.configure(names)
+
+    def configure(self, names: Optional[Mapping[str, str]]) -> None:
+        """Replace the configured names; cached lookups are dropped."""
+        configured: dict[str, str] = {}
+        for entry, name in (names or {}).items():
+            address, _ = parse_address(entry)
+            configured[address] = str(name).strip()
+        with self._lock:
+            self._configured = configured
+            self._names = dict(configured)
+            self._addresses = {}
+
+    def _resolve(self, entry: str) -> str:
+        with self._lock:
+            address = self._addresses.get(entry)
+            if address is not None:
+                return address
+            address, name = parse_address(entry)
+            self._addresses[entry] = address
+            # A configured name wins; then an explicit name in the entry; otherwise the local part, once
+            if name is not None and address not in self._configured:
+                self._names[address] = name
+            elif address not in self._names:
+                self._names[address] = derive_name(address)
+            return address
+
+    def normalize(self, entry: str) -> str:
+        return self._resolve(entry)
+
+    def display_name(self, entry: str) -> str:
+        address = self._resolve(entry)
+        with self._lock:
+            return self._names[address]
+
+
+address_book = AddressBook()
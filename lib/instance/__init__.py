@@ -0,0 +1,252 @@
+"""Single running client per user session, and a local control endpoint for it.
+
+Two copies of the client in one desktop session would fight over the same
+keyboard and mouse.  :meth:`Instance.acquire` takes an exclusive lock on a
+per-session lock file (``flock`` on Linux, ``msvcrt.locking`` on Windows).
+The operating system drops the lock when the process dies, so a crash never
+leaves a stale lock behind.  The session is the user plus ``XDG_SESSION_ID``
+(Linux) or ``SESSIONNAME`` (Windows), so two users on one machine each get
+their own client.
+
+The lock holder can also :meth:`~Instance.serve` a control endpoint: a Unix
+socket or a Windows named pipe, through ``multiprocessing.connection`` with a
+random per-run auth key.  The address and key are written to a user-only
+instance file next to the lock.  Requests and responses are length-prefixed
+JSON messages (``send_bytes``/``recv_bytes``, never pickle)::
+
+    {"command": "run", "params": {"behaviour_id": "work_emails"}}
+    {"ok": true, "result": {"started": true}}
+
+:func:`request` is the client side.  It only needs the standard library, so
+``python -m lib.instance status`` answers in milliseconds, without importing
+Qt, Selenium or pyautogui.
+
+Usage::
+
+    if not instance.acquire():
+        sys.exit(f"Already running as pid {instance.owner_pid()}")
+    instance.serve(lambda command, params: {...})
+
+    request("status")                                  # from another process
+    request("queue", behaviour_id="work_emails", priority=1)
+"""
+
+from __future__ import annotations
+
+import getpass
+import json
+import os
+import re
+import secrets
+import sys
+import tempfile
+import threading
+import time
+from enum import Enum
+from multiprocessing.connection import Client, Connection, Listener
+from typing import IO, Any, Callable, Optional, TypedDict
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+APP_NAME: str = "user_automation_client"
+# Largest request accepted by the control endpoint
+MAX_REQUEST_BYTES: int = 1024 * 1024
+DEFAULT_TIMEOUT: float = 10.0
+
+ControlHandler = Callable[[str, dict[str, Any]], Any]
+
+
+class ControlConfig(TypedDict, total=False):
+    # Exit at start-up when the client already runs in this user session
+    single_instance: bool
+    # Serve the local control endpoint
+    enabled: bool
+
+
+def session_key() -> str:
+    """File-name-safe identifier of the current user session."""
+    variable = "SESSIONNAME" if sys.platform == "win32" else "XDG_SESSION_ID"
+    session = os.environ.get(variable) or os.environ.get("DISPLAY") or "default"
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", f"{getpass.getuser()}-{session}")
+
+
+def state_dir() -> str:
+    """User-only directory holding lock, instance file and socket."""
+    if sys.platform == "win32":
+        path = os.path.join(os.environ.get("LOCALAPPDATA") or tempfile.gettempdir(), APP_NAME)
+    elif os.environ.get("XDG_RUNTIME_DIR"):
+        path = os.path.join(os.environ["XDG_RUNTIME_DIR"], APP_NAME)
+    else:
+        path = os.path.join(tempfile.gettempdir(), f"{APP_NAME}-{os.getuid()}")
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    return path
+
+
+def _address(key: str) -> str:
+    if sys.platform == "win32":
+        return rf"\\.\pipe\{APP_NAME}-{key}"
+    return os.path.join(state_dir(), f"{key}.sock")
+
+
+def _instance_path(key: str) -> str:
+    return os.path.join(state_dir(), f"{key}.json")
+
+
+def _try_lock(file: IO[str]) -> bool:
+    try:
+        if sys.platform == "win32":
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def read_instance(key: Optional[str] = None) -> Optional[dict[str, Any]]:
+    """Pid, address and auth key of the client running in this session, if any."""
+    try:
+        with open(_instance_path(key or session_key()), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class Instance:
+    def __init__(self):
+        self.key = session_key()
+        self._lock_file: Optional[IO[str]] = None
+        self._listener: Optional[Listener] = None
+        self._handler: Optional[ControlHandler] = None
+
+    @property
+    def held(self) -> bool:
+        return self._lock_file is not None
+
+    def acquire(self, timeout: float = 0.0) -> bool:
+        """Take the session lock, retrying for up to *timeout* seconds; False if another client holds it."""
+        if self.held:
+            return True
+        file = open(os.path.join(state_dir(), f"{self.key}.lock"), "a+")
+        deadline = time.monotonic() + timeout
+        while not _try_lock(file):
+            if time.monotonic() >= deadline:
+                file.close()
+                return False
+            time.sleep(0.1)
+        self._lock_file = file
+        self._write_instance(None, None)
+        return True
+
+    def owner_pid(self) -> Optional[int]:
+        info = read_instance(self.key)
+        return info.get("pid") if info else None
+
+    def _write_instance(self, address: Optional[str], authkey: Optional[bytes]) -> None:
+        info = {"pid": os.getpid(), "address": address, "authkey": authkey.hex() if authkey else None}
+        path = _instance_path(self.key)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(info, f)
+
+    def release(self) -> None:
+        """Stop serving and drop the lock, e.g. right before restarting into a new process."""
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.close()
+        if self._lock_file is None:
+            return
+        paths = [_instance_path(self.key)]
+        if sys.platform != "win32":
+            # Named pipes go away with the listener; sockets are files
+            paths.append(_address(self.key))
+        for path in paths:
+            if os.path.exists(path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        self._lock_file.close()
+        self._lock_file = None
+
+    # -- control endpoint ----------------------------------------------------
+
+    def serve(self, handler: ControlHandler) -> bool:
+        """Answer control requests with ``handler(command, params)`` on a background thread."""
+        if not self.held or self._listener is not None:
+            return False
+
+        address = _address(self.key)
+        if sys.platform != "win32" and os.path.exists(address):
+            # Left behind by a crashed client; we hold the lock, so nobody else serves it
+            os.remove(address)
+        authkey = secrets.token_bytes(32)
+        self._listener = Listener(address, authkey=authkey)
+        if sys.platform != "win32":
+            os.chmod(address, 0o600)
+        self._handler = handler
+        self._write_instance(address, authkey)
+        threading.Thread(
+            target=self._accept, args=(self._listener,), name="Control endpoint thread", daemon=True
+        ).start()
+        return True
+
+    def _accept(self, listener: Listener) -> None:
+        while self._listener is listener:
+            try:
+                conn = listener.accept()
+            except Exception:
+                # Failed authentication or a client that went away mid-handshake; closed listeners end the loop
+                continue
+            threading.Thread(target=self._handle, args=(conn,), name="Control request thread", daemon=True).start()
+
+    def _handle(self, conn: Connection) -> None:
+        with conn:
+            while True:
+                try:
+                    raw = conn.recv_bytes(MAX_REQUEST_BYTES)
+                except (EOFError, OSError):
+                    return
+                try:
+                    message = json.loads(raw)
+                    result = self._handler(str(message["command"]), dict(message.get("params") or {}))
+                    response = {"ok": True, "result": result}
+                except Exception as e:
+                    response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                try:
+                    conn.send_bytes(json.dumps(response, default=_json_default).encode("utf-8"))
+                except OSError:
+                    return
+
+
+def request(command: str, timeout: float = DEFAULT_TIMEOUT, **params: Any) -> Any:
+    """Send *command* to the client running in this session and return its result.
+
+    Raises ``ConnectionError`` if no client serves the endpoint, ``TimeoutError`` if it does not answer, and
+    ``RuntimeError`` with the client's message if the command failed.
+    """
+    info = read_instance()
+    if not info or not info.get("address"):
+        raise ConnectionError("No user automation client is running in this session")
+
+    with Client(info["address"], authkey=bytes.fromhex(info["authkey"])) as conn:
+        conn.send_bytes(json.dumps({"command": command, "params": params}).encode("utf-8"))
+        if not conn.poll(timeout):
+            raise TimeoutError(f"No answer to '{command}' within {timeout}s")
+        response = json.loads(conn.recv_bytes())
+
+    if not response.get("ok"):
+        raise RuntimeError(response.get("error"))
+    return response.get("result")
+
+
+instance = Instance()
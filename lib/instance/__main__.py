@@ -0,0 +1,47 @@
+import argparse
+import json
+import sys
+
+from lib.instance import DEFAULT_TIMEOUT, request
+
+COMMANDS = ("status", "metrics", "run", "stop", "queue", "cancel")
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m lib.instance", description="Control the client running in this user session"
+    )
+    parser.add_argument("command", choices=COMMANDS)
+    parser.add_argument("target", nargs="?", help="behaviour id (run, queue) or queue id (cancel)")
+    parser.add_argument("--force", action="store_true", help="run: stop the running behaviour first")
+    parser.add_argument("--priority", type=int, default=0, help="queue: lower runs first")
+    parser.add_argument("--ttl", type=float, help="queue: seconds before the entry expires")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    params: dict = {}
+    if args.command in ("run", "queue") and args.target:
+        params["behaviour_id"] = args.target
+    if args.command == "run":
+        params["force"] = args.force
+    elif args.command == "queue":
+        params["priority"] = args.priority
+        if args.ttl is not None:
+            params["ttl"] = args.ttl
+    elif args.command == "cancel":
+        params["queue_id"] = args.target
+
+    try:
+        result = request(args.command, args.timeout, **params)
+    except (OSError, TimeoutError, RuntimeError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
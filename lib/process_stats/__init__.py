@@ -0,0 +1,243 @@
+"""Resident memory, threads, open handles and child processes of a process.
+
+Sampled without third-party packages: ``/proc`` on Linux, the Win32 API
+(via ``ctypes``) on Windows.  Values that cannot be read on the current
+platform are ``None``.
+
+Child processes are all descendants, not only direct children, because
+WebDriver starts the driver and the driver starts the browser.  Browser and
+driver processes are also counted by name, since those are the ones that
+leak when a session is not shut down.
+
+Usage::
+
+    sample = sample_process()            # this process
+    sample.rss_mb, sample.threads, sample.handles, sample.browser_processes
+    sample_process(worker_pid).to_dict()
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+# Lower-case process name fragments of browsers and WebDriver binaries
+BROWSER_PROCESS_NAMES: tuple[str, ...] = (
+    "firefox",
+    "geckodriver",
+    "msedge",
+    "msedgedriver",
+    "chrome",
+    "chromedriver",
+)
+
+
+@dataclass(slots=True)
+class ProcessSample:
+    pid: int
+    ts: float
+    rss: Optional[int] = None
+    threads: Optional[int] = None
+    # Open file descriptors on Linux, kernel handles on Windows
+    handles: Optional[int] = None
+    children: Optional[int] = None
+    # Descendant browser/driver processes by name
+    browsers: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def rss_mb(self) -> Optional[float]:
+        return None if self.rss is None else self.rss / (1024 * 1024)
+
+    @property
+    def browser_processes(self) -> int:
+        return sum(self.browsers.values())
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "pid": self.pid,
+            "ts": self.ts,
+            "rss_mb": None if self.rss_mb is None else round(self.rss_mb, 1),
+            "threads": self.threads,
+            "handles": self.handles,
+            "children": self.children,
+            "browser_processes": self.browser_processes,
+        }
+
+
+def _count_browsers(names: list[str]) -> dict[str, int]:
+    counts: dict[str, int] = {}
+    for name in names:
+        name = name.lower().removesuffix(".exe")
+        if any(fragment in name for fragment in BROWSER_PROCESS_NAMES):
+            counts[name] = counts.get(name, 0) + 1
+    return counts
+
+
+def _descendants(pid: int, processes: dict[int, tuple[int, str]]) -> list[str]:
+    """Names of all descendants of *pid* in ``{pid: (parent pid, name)}``."""
+    children: dict[int, list[int]] = {}
+    for child, (parent, _) in processes.items():
+        children.setdefault(parent, []).append(child)
+
+    names, pending, seen = [], list(children.get(pid, [])), {pid}
+    while pending:
+        child = pending.pop()
+        if child in seen:
+            continue
+        seen.add(child)
+        names.append(processes[child][1])
+        pending.extend(children.get(child, []))
+    return names
+
+
+# -- Linux ---------------------------------------------------------------------
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _linux_processes() -> dict[int, tuple[int, str]]:
+    processes = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        stat = _read(f"/proc/{entry}/stat")
+        if not stat:
+            continue
+        # "pid (comm) state ppid ..."; comm may itself contain spaces and parentheses
+        name = stat[stat.find("(") + 1 : stat.rfind(")")]
+        fields = stat[stat.rfind(")") + 2 :].split()
+        processes[int(entry)] = (int(fields[1]), name)
+    return processes
+
+
+def _sample_linux(sample: ProcessSample) -> None:
+    statm = _read(f"/proc/{sample.pid}/statm")
+    if statm:
+        sample.rss = int(statm.split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+    status = _read(f"/proc/{sample.pid}/status") or ""
+    for line in status.splitlines():
+        if line.startswith("Threads:"):
+            sample.threads = int(line.split()[1])
+            break
+
+    try:
+        sample.handles = len(os.listdir(f"/proc/{sample.pid}/fd"))
+    except OSError:
+        pass
+
+    names = _descendants(sample.pid, _linux_processes())
+    sample.children = len(names)
+    sample.browsers = _count_browsers(names)
+
+
+# -- Windows -------------------------------------------------------------------
+
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    _PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    _TH32CS_SNAPPROCESS = 0x00000002
+    _INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+
+    class _ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    class _ProcessEntry32(ctypes.Structure):
+        _fields_ = [
+            ("dwSize", wintypes.DWORD),
+            ("cntUsage", wintypes.DWORD),
+            ("th32ProcessID", wintypes.DWORD),
+            ("th32DefaultHeapID", ctypes.c_size_t),
+            ("th32ModuleID", wintypes.DWORD),
+            ("cntThreads", wintypes.DWORD),
+            ("th32ParentProcessID", wintypes.DWORD),
+            ("pcPriClassBase", ctypes.c_long),
+            ("dwFlags", wintypes.DWORD),
+            ("szExeFile", ctypes.c_wchar * 260),
+        ]
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _psapi = ctypes.WinDLL("psapi", use_last_error=True)
+
+
+def _windows_processes() -> dict[int, tuple[int, int, str]]:
+    """``{pid: (parent pid, threads, exe name)}`` from a Toolhelp snapshot."""
+    processes = {}
+    snapshot = _kernel32.CreateToolhelp32Snapshot(_TH32CS_SNAPPROCESS, 0)
+    if snapshot == _INVALID_HANDLE_VALUE:
+        return processes
+    try:
+        entry = _ProcessEntry32()
+        entry.dwSize = ctypes.sizeof(_ProcessEntry32)
+        ok = _kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+        while ok:
+            processes[entry.th32ProcessID] = (entry.th32ParentProcessID, entry.cntThreads, entry.szExeFile)
+            ok = _kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+    finally:
+        _kernel32.CloseHandle(snapshot)
+    return processes
+
+
+def _sample_windows(sample: ProcessSample) -> None:
+    handle = _kernel32.OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION, False, sample.pid)
+    if handle:
+        try:
+            counters = _ProcessMemoryCounters()
+            counters.cb = ctypes.sizeof(_ProcessMemoryCounters)
+            if _psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                sample.rss = counters.WorkingSetSize
+            count = wintypes.DWORD()
+            if _kernel32.GetProcessHandleCount(handle, ctypes.byref(count)):
+                sample.handles = count.value
+        finally:
+            _kernel32.CloseHandle(handle)
+
+    processes = _windows_processes()
+    if sample.pid in processes:
+        sample.threads = processes[sample.pid][1]
+    names = _descendants(sample.pid, {pid: (parent, name) for pid, (parent, _, name) in processes.items()})
+    sample.children = len(names)
+    sample.browsers = _count_browsers(names)
+
+
+# -- sampling ------------------------------------------------------------------
+
+
+def sample_process(pid: Optional[int] = None) -> ProcessSample:
+    """Current resource usage of *pid* (default: this process)."""
+    sample = ProcessSample(pid or os.getpid(), time.time())
+    try:
+        if sys.platform.startswith("linux"):
+            _sample_linux(sample)
+        elif sys.platform == "win32":
+            _sample_windows(sample)
+    except (OSError, ValueError, IndexError):
+        # A process exiting mid-scan; keep what was read
+        pass
+
+    if sample.threads is None and sample.pid == os.getpid():
+        sample.threads = threading.active_count()
+    return sample
@@ -0,0 +1,437 @@
+"""Behaviour run recorder and deterministic replay.
+
+Two runs of the same behaviour are rarely comparable: durations, file names
+and the emails to answer are all drawn from ``random``.  While the recorder is
+active it captures, per behaviour run:
+
+- every ``pyautogui`` call (clicks, keys, image lookups, screenshots)
+- every WebDriver command (via :func:`lib.selenium.command_profiler.instrument`
+  and the benchmark fake driver)
+- realism delays: traced ``pool.sleep`` and ``clock.sleep`` (poll loops are
+  left alone)
+- every draw from the global ``random`` generator, with its result
+
+Each event carries its offset from the start of the run, its duration and
+the step it ran in.  When the ``behaviour:<id>`` root span finishes, the run
+is written to ``<directory>/<behaviour>-<time>-<trace>.jsonl``: a header line,
+then one event per line.  Events are attributed through the current tracing
+span, so tracing must be enabled.
+
+Replay mode (:meth:`Recorder.replaying`, used by ``python -m benchmarks
+replay``) seeds ``random`` and runs :data:`lib.clock.clock` scaled by
+``1/time_scale`` (virtual for ``time_scale`` 0).  A behaviour run against
+the fake backends then makes the same decisions every time, and
+:func:`diff_recordings` compares two recordings command by command.
+
+Typed text (``write``, ``sendKeysToElement``) is replaced by its length unless
+``redact`` is disabled.
+
+Usage::
+
+    recorder.configure(current_config().raw.get("replay"))      # record live runs
+
+    with recorder.replaying(seed=1, time_scale=0.01):
+        ...                                           # run a behaviour against the fakes
+    recorder.recordings[trace_id]                     # path of the written recording
+    diff_recordings("baseline.jsonl", "current.jsonl")
+"""
+
+from __future__ import annotations
+
+import contextlib
+import difflib
+import functools
+import json
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterator, Optional, TypedDict
+
+from lib.clock import clock
+from lib.tracing import Span, current_span, tracer
+
+DEFAULT_DIRECTORY: str = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "recordings"
+)
+RECORDING_FORMAT: int = 1
+# Events kept per run; later ones are only counted
+MAX_EVENTS: int = 100000
+MAX_TRACKED_RUNS: int = 8
+
+PYAUTOGUI_CALLS: tuple[str, ...] = (
+    "click",
+    "doubleClick",
+    "rightClick",
+    "moveTo",
+    "dragTo",
+    "scroll",
+    "press",
+    "hotkey",
+    "keyDown",
+    "keyUp",
+    "write",
+    "typewrite",
+    "screenshot",
+    "locateOnScreen",
+    "locateCenterOnScreen",
+    "locateAllOnScreen",
+)
+RANDOM_CALLS: tuple[str, ...] = (
+    "random",
+    "uniform",
+    "randint",
+    "randrange",
+    "choice",
+    "choices",
+    "sample",
+    "shuffle",
+    "gauss",
+)
+REDACTED_ARGUMENTS: dict[str, tuple[str, ...]] = {
+    "write": ("message",),
+    "typewrite": ("message",),
+    "sendKeysToElement": ("text", "value"),
+}
+
+
+class ReplayConfig(TypedDict, total=False):
+    # Record every behaviour run of the live client
+    enabled: bool
+    directory: str
+    # Seed for the global random generator; unset keeps it unseeded
+    seed: int
+    redact: bool
+
+
+def _jsonable(value: Any) -> Any:
+    """Compact, JSON-safe stand-in for a call argument or result."""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        return value if len(value) <= 200 else f"<{len(value)} chars>"
+    if isinstance(value, dict):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value] if len(value) <= 16 else f"<{len(value)} items>"
+    text = repr(value)
+    return text if len(text) <= 80 else f"<{type(value).__name__}>"
+
+
+def _redact(value: Any) -> Any:
+    if isinstance(value, str):
+        return f"<{len(value)} chars>"
+    if isinstance(value, (list, tuple)):
+        return f"<{sum(len(str(item)) for item in value)} chars>"
+    return "<redacted>"
+
+
+class Recorder:
+    """Collects events per behaviour run and writes each run when its root span finishes."""
+
+    def __init__(self):
+        self.active = False
+        self.directory = DEFAULT_DIRECTORY
+        self.seed: Optional[int] = None
+        self.redact = True
+        self.time_scale = 1.0
+        # trace id -> path of the written recording
+        self.recordings: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._runs: OrderedDict[str, list[dict[str, Any]]] = OrderedDict()
+        self._dropped: dict[str, int] = {}
+        self._originals: list[tuple[Any, str, Any]] = []
+        self._exporting = False
+
+    def configure(self, config: Optional[ReplayConfig]) -> None:
+        config = config or {}
+        self.directory = config.get("directory") or DEFAULT_DIRECTORY
+        self.redact = config.get("redact", True)
+        self.seed = config.get("seed")
+        if self.seed is not None:
+            random.seed(self.seed)
+        if config.get("enabled", False):
+            self.start()
+
+    def start(self) -> None:
+        if self.active:
+            return
+        self._install()
+        if not self._exporting:
+            tracer.add_exporter(self)
+            self._exporting = True
+        self.active = True
+
+    def stop(self) -> None:
+        if not self.active:
+            return
+        self.active = False
+        self._uninstall()
+
+    @contextlib.contextmanager
+    def replaying(self, seed: int = 0, time_scale: float = 0.01, directory: Optional[str] = None) -> Iterator[Recorder]:
+        """Record with ``random`` seeded and realism delays compressed to *time_scale* of their length."""
+        was_active, previous = self.active, (self.seed, self.time_scale, self.directory)
+        state = random.getstate()
+        self.seed, self.time_scale = seed, time_scale
+        self.directory = directory or self.directory
+        random.seed(seed)
+        self.start()
+        try:
+            if time_scale > 0:
+                with clock.using("scaled", 1 / time_scale):
+                    yield self
+            else:
+                with clock.using("virtual"):
+                    yield self
+        finally:
+            if not was_active:
+                self.stop()
+            self.seed, self.time_scale, self.directory = previous
+            random.setstate(state)
+
+    # -- recording -------------------------------------------------------------
+
+    def record(
+        self,
+        kind: str,
+        name: str,
+        args: Any = None,
+        result: Any = None,
+        elapsed: Optional[float] = None,
+        start: Optional[float] = None,
+    ) -> None:
+        """Add one event to the run of the current span; a no-op outside behaviour runs."""
+        if not self.active:
+            return
+        span = current_span()
+        if span is None or not span.behaviour:
+            return
+
+        event: dict[str, Any] = {"ts": start or time.time(), "kind": kind, "name": name}
+        if args:
+            event["args"] = _jsonable(args)
+        if result is not None:
+            event["result"] = _jsonable(result)
+        if elapsed is not None:
+            event["elapsed"] = round(elapsed, 6)
+        if span.step:
+            event["step"] = span.step
+        event["thread"] = threading.current_thread().name
+
+        with self._lock:
+            events = self._runs.get(span.trace_id)
+            if events is None:
+                events = self._runs[span.trace_id] = []
+                while len(self._runs) > MAX_TRACKED_RUNS:
+                    self._runs.popitem(last=False)
+            if len(events) < MAX_EVENTS:
+                events.append(event)
+            else:
+                self._dropped[span.trace_id] = self._dropped.get(span.trace_id, 0) + 1
+
+    def record_command(
+        self,
+        command: str,
+        params: Optional[dict[str, Any]] = None,
+        elapsed: Optional[float] = None,
+        start: Optional[float] = None,
+    ) -> None:
+        """Record a WebDriver command; called by the instrumented driver's ``execute``."""
+        if self.active:
+            self.record("webdriver", command, self._arguments(command, (), params or {}), None, elapsed, start)
+
+    def _arguments(self, name: str, args: tuple, kwargs: dict[str, Any]) -> dict[str, Any]:
+        arguments: dict[str, Any] = dict(kwargs)
+        if args:
+            arguments["args"] = list(args)
+        if self.redact and name in REDACTED_ARGUMENTS:
+            if "args" in arguments:
+                arguments["args"] = [_redact(arg) for arg in arguments["args"]]
+            for key in REDACTED_ARGUMENTS[name]:
+                if key in arguments:
+                    arguments[key] = _redact(arguments[key])
+        return arguments
+
+    # -- hooks -----------------------------------------------------------------
+
+    @contextlib.contextmanager
+    def _outermost(self) -> Iterator[bool]:
+        """True for the outermost hooked call of this thread; calls nested in it are not recorded."""
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        try:
+            yield depth == 0
+        finally:
+            self._local.depth = depth
+
+    def _hook(self, kind: str, name: str, fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def hooked(*args, **kwargs):
+            with self._outermost() as outermost:
+                if not outermost or not self.active:
+                    return fn(*args, **kwargs)
+                arguments = self._arguments(name, args, kwargs)
+                start, started = time.time(), time.perf_counter()
+                result = fn(*args, **kwargs)
+                elapsed = time.perf_counter() - started
+                recorded = result if kind == "random" or name.startswith("locate") else None
+                self.record(kind, name, arguments, recorded, elapsed, start)
+                return result
+
+        return hooked
+
+    def _patch(self, target: Any, name: str, value: Any) -> None:
+        self._originals.append((target, name, getattr(target, name)))
+        setattr(target, name, value)
+
+    def _install(self) -> None:
+        from lib.cancellable_futures import CancellableThreadPoolExecutor
+
+        try:
+            import pyautogui
+        except ImportError:
+            pyautogui = None
+        if pyautogui is not None:
+            for name in PYAUTOGUI_CALLS:
+                fn = getattr(pyautogui, name, None)
+                if fn is not None:
+                    self._patch(pyautogui, name, self._hook("pyautogui", name, fn))
+
+        for name in RANDOM_CALLS:
+            self._patch(random, name, self._hook("random", name, getattr(random, name)))
+
+        self._patch(clock, "sleep", self._sleep_hook(clock.sleep))
+        self._patch(CancellableThreadPoolExecutor, "sleep", self._pool_sleep_hook(CancellableThreadPoolExecutor.sleep))
+
+    def _uninstall(self) -> None:
+        while self._originals:
+            target, name, value = self._originals.pop()
+            setattr(target, name, value)
+
+    def _sleep_hook(self, sleep: Callable[[float], None]) -> Callable[[float], None]:
+        @functools.wraps(sleep)
+        def hooked_sleep(seconds: float) -> None:
+            if getattr(self._local, "depth", 0):
+                return sleep(seconds)
+            with self._outermost():
+                self.record("sleep", "clock.sleep", {"seconds": seconds})
+                sleep(seconds)
+
+        return hooked_sleep
+
+    def _pool_sleep_hook(self, pool_sleep: Callable) -> Callable:
+        @functools.wraps(pool_sleep)
+        def hooked_pool_sleep(pool, duration: float, traced: bool = True) -> None:
+            # Untraced pool sleeps are poll intervals (frame cache, waits); only realism delays are recorded
+            if not traced or getattr(self._local, "depth", 0):
+                return pool_sleep(pool, duration, traced)
+            with self._outermost():
+                self.record("sleep", "pool.sleep", {"seconds": duration})
+                pool_sleep(pool, duration, traced)
+
+        return hooked_pool_sleep
+
+    # -- export (tracer exporter protocol) -------------------------------------
+
+    def export(self, span: Span) -> None:
+        if span.parent_id is not None or not span.name.startswith("behaviour:"):
+            return
+        with self._lock:
+            events = self._runs.pop(span.trace_id, None)
+            dropped = self._dropped.pop(span.trace_id, 0)
+        if events is None and not self.active:
+            return
+
+        header = {
+            "type": "recording",
+            "format": RECORDING_FORMAT,
+            "behaviour": span.behaviour,
+            "trace_id": span.trace_id,
+            "started_at": span.start_time,
+            "duration": round(span.duration, 6),
+            "status": span.status,
+            "seed": self.seed,
+            "time_scale": self.time_scale,
+            "dropped": dropped,
+        }
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(span.start_time))
+        path = os.path.join(self.directory, f"{span.behaviour}-{stamp}-{span.trace_id[:8]}.jsonl")
+        os.makedirs(self.directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(header) + "\n")
+            for event in events or []:
+                event = {"t": round(event.pop("ts") - span.start_time, 6), **event}
+                f.write(json.dumps(event, default=str) + "\n")
+
+        with self._lock:
+            self.recordings[span.trace_id] = path
+            while len(self.recordings) > MAX_TRACKED_RUNS:
+                self.recordings.popitem(last=False)
+
+    def close(self) -> None:
+        pass
+
+
+recorder = Recorder()
+
+
+# -- reading -------------------------------------------------------------------
+
+
+def load_recording(path: str) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Header and events of a recording file."""
+    with open(path, encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    if not lines or lines[0].get("type") != "recording":
+        raise ValueError(f"{path} is not a behaviour recording")
+    return lines[0], lines[1:]
+
+
+def event_signature(event: dict[str, Any]) -> str:
+    """What must match between two deterministic runs; timings and threads are left out."""
+    kind, name = event["kind"], event["name"]
+    if kind == "webdriver":
+        return f"webdriver {name}"
+    if kind == "random":
+        return f"random {name} -> {json.dumps(event.get('result'), sort_keys=True)}"
+    return f"{kind} {name} {json.dumps(event.get('args'), sort_keys=True)}"
+
+
+def time_by_kind(events: list[dict[str, Any]]) -> dict[str, float]:
+    totals: dict[str, float] = {}
+    for event in events:
+        totals[event["kind"]] = totals.get(event["kind"], 0.0) + event.get("elapsed", 0.0)
+    return {kind: round(total, 3) for kind, total in sorted(totals.items())}
+
+
+def _signatures(events: list[dict[str, Any]]) -> list[str]:
+    """Event signatures grouped by step, with consecutive repeats (poll loops) collapsed.
+
+    Steps run concurrently on the pool, so their events interleave differently
+    from run to run; within one step the order is deterministic.  The number of
+    polls depends on timing and is compared through the command totals instead.
+    """
+    by_step: dict[str, list[str]] = {}
+    for event in events:
+        by_step.setdefault(event.get("step") or "-", []).append(event_signature(event))
+
+    signatures = []
+    for step in sorted(by_step):
+        previous = None
+        for signature in by_step[step]:
+            if signature != previous:
+                signatures.append(f"[{step}] {signature}")
+            previous = signature
+    return signatures
+
+
+def diff_recordings(baseline_path: str, current_path: str) -> list[str]:
+    """Unified diff of the event sequences of two recordings; empty if they match."""
+    _, baseline = load_recording(baseline_path)
+    _, current = load_recording(current_path)
+    return list(
+        difflib.unified_diff(_signatures(baseline), _signatures(current), baseline_path, current_path, lineterm="")
+    )
@@ -21,9 +21,27 @@ Usage::
     # Then everywhere:
     self.wait().until(EC.element_to_be_clickable((By.XPATH, "//button")))
     # ^ will raise OperationCancelled promptly if the task is cancelled
+
+Polling is adaptive: the predicate is first re-checked after a few
+milliseconds and the interval backs off exponentially up to
+``POLL_FREQUENCY``.  Fast UI transitions are picked up almost immediately
+while slow ones do not flood the WebDriver with round trips.  Pass a
+custom :class:`PollSchedule` per call site to tune it::
+
+    self.wait(10, poll_schedule=PollSchedule(initial=0.05, factor=1.5)).until(...)
+
+An explicit upstream-style ``poll_frequency`` still means a fixed interval.
+
+Time-to-match for every wait is recorded per locator in
+:data:`wait_statistics`.  Locators with parameters (e.g. a subject) produce
+a label per value, so only the first ``MAX_WAIT_LABELS`` labels are kept
+separately and the rest are folded into ``OTHER_LABEL``.
 """
 
+import threading
 import time
+from dataclasses import dataclass, replace
+from typing import Iterator, Optional
 
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.support.wait import WebDriverWait
@@ -31,9 +49,93 @@ from selenium.webdriver.support.wait import WebDriverWait
 from lib.cancellable_futures import check as _check
 from lib.cancellable_futures import get_executor
 from lib.cancellable_futures import sleep as _sleep
+from lib.tracing import span
 
 POLL_FREQUENCY: float = 0.5
 IGNORED_EXCEPTIONS: tuple[type[Exception]] = (NoSuchElementException,)
+# Distinct labels kept by WaitStatistics before new ones are folded into OTHER_LABEL
+MAX_WAIT_LABELS: int = 256
+OTHER_LABEL: str = "<other>"
+
+
+@dataclass(frozen=True, slots=True)
+class PollSchedule:
+    """Exponential back-off between predicate polls.
+
+    Args:
+        initial: First poll interval in seconds.
+        factor:  Multiplier applied to the interval after every poll.
+        maximum: Upper bound for the interval.
+    """
+
+    initial: float = 0.005
+    factor: float = 2.0
+    maximum: float = POLL_FREQUENCY
+
+    def __post_init__(self):
+        # Zero or shrinking intervals would busy-poll the driver
+        if self.initial <= 0:
+            raise ValueError(f"Poll schedule initial interval must be positive, got {self.initial}")
+        if self.factor < 1:
+            raise ValueError(f"Poll schedule factor must be at least 1, got {self.factor}")
+        if self.maximum < self.initial:
+            raise ValueError(f"Poll schedule maximum {self.maximum} is below its initial interval {self.initial}")
+
+    def intervals(self) -> Iterator[float]:
+        interval = self.initial
+        while True:
+            yield interval
+            interval = min(interval * self.factor, self.maximum)
+
+
+DEFAULT_POLL_SCHEDULE = PollSchedule()
+FIXED_POLL_SCHEDULE = PollSchedule(initial=POLL_FREQUENCY, factor=1.0)
+
+
+@dataclass(slots=True)
+class WaitStat:
+    matches: int = 0
+    timeouts: int = 0
+    polls: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.matches if self.matches else 0.0
+
+
+class WaitStatistics:
+    """Thread-safe per-locator time-to-match statistics."""
+
+    def __init__(self, max_labels: int = MAX_WAIT_LABELS):
+        self.max_labels = max_labels
+        self._lock = threading.Lock()
+        self._stats: dict[str, WaitStat] = {}
+
+    def record(self, label: str, elapsed: float, polls: int, matched: bool) -> None:
+        with self._lock:
+            if label not in self._stats and len(self._stats) >= self.max_labels:
+                label = OTHER_LABEL
+            stat = self._stats.setdefault(label, WaitStat())
+            stat.polls += polls
+            if matched:
+                stat.matches += 1
+                stat.total_time += elapsed
+                stat.max_time = max(stat.max_time, elapsed)
+            else:
+                stat.timeouts += 1
+
+    def snapshot(self) -> dict[str, WaitStat]:
+        with self._lock:
+            return {label: replace(stat) for label, stat in self._stats.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+wait_statistics = WaitStatistics()
 
 
 def _in_executor() -> bool:
@@ -45,21 +147,77 @@ def _in_executor() -> bool:
         return False
 
 
+def describe_condition(method) -> str:
+    """Best-effort label for an expected condition, e.g. ``presence_of_element_located[xpath=//input]``.
+
+    Selenium's expected conditions are closures over their locator, so the
+    locator is recovered from the closure cells when present.
+    """
+    qualname = getattr(method, "__qualname__", None) or type(method).__name__
+    name = qualname.split(".<locals>")[0]
+
+    for cell in getattr(method, "__closure__", None) or ():
+        try:
+            value = cell.cell_contents
+        except ValueError:
+            continue
+        if isinstance(value, tuple) and len(value) == 2 and all(isinstance(v, str) for v in value):
+            return f"{name}[{value[0]}={value[1]}]"
+
+    return name
+
+
 class CancellableWebDriverWait(WebDriverWait):
-    def until(self, method, message=""):
+    def __init__(
+        self,
+        driver,
+        timeout: float,
+        poll_frequency: Optional[float] = None,
+        ignored_exceptions=None,
+        poll_schedule: Optional[PollSchedule] = None,
+    ):
+        if poll_frequency is not None and poll_schedule is not None:
+            raise ValueError("Pass either poll_frequency or poll_schedule, not both")
+        super().__init__(driver, timeout, poll_frequency or POLL_FREQUENCY, ignored_exceptions)
+        if poll_frequency is not None:
+            poll_schedule = PollSchedule(initial=poll_frequency, factor=1.0, maximum=poll_frequency)
+        self._poll_schedule = poll_schedule or DEFAULT_POLL_SCHEDULE
+
+    def _pause(self, cancellable: bool, interval: float, end_time: float) -> None:
+        interval = max(0.0, min(interval, end_time - time.monotonic()))
+        if cancellable:
+            # Poll pauses are covered by the enclosing ``wait.until`` span.
+            _sleep(interval, traced=False)
+        else:
+            time.sleep(interval)
+
+    def until(self, method, message="", label: Optional[str] = None):
+        label = label or describe_condition(method)
+        with span("wait.until", label=label) as current:
+            value, polls = self._until(method, message, label)
+            if current is not None:
+                current.set(polls=polls)
+            return value
+
+    def _until(self, method, message: str, label: str):
         screen = None
         stacktrace = None
         cancellable = _in_executor()
+        intervals = self._poll_schedule.intervals()
+        polls = 0
 
-        end_time = time.monotonic() + self._timeout
+        start_time = time.monotonic()
+        end_time = start_time + self._timeout
         while True:
             if cancellable:
                 _check()
 
+            polls += 1
             try:
                 value = method(self._driver)
                 if value:
-                    return value
+                    wait_statistics.record(label, time.monotonic() - start_time, polls, True)
+                    return value, polls
             except self._ignored_exceptions as exc:
                 screen = getattr(exc, "screen", None)
                 stacktrace = getattr(exc, "stacktrace", None)
@@ -67,15 +225,14 @@ class CancellableWebDriverWait(WebDriverWait):
             if time.monotonic() > end_time:
                 break
 
-            if cancellable:
-                _sleep(self._poll)
-            else:
-                time.sleep(self._poll)
+            self._pause(cancellable, next(intervals), end_time)
 
+        wait_statistics.record(label, time.monotonic() - start_time, polls, False)
         raise TimeoutException(message, screen, stacktrace)
 
     def until_not(self, method, message=""):
         cancellable = _in_executor()
+        intervals = self._poll_schedule.intervals()
 
         end_time = time.monotonic() + self._timeout
         while True:
@@ -92,9 +249,6 @@ class CancellableWebDriverWait(WebDriverWait):
             if time.monotonic() > end_time:
                 break
 
-            if cancellable:
-                _sleep(self._poll)
-            else:
-                time.sleep(self._poll)
+            self._pause(cancellable, next(intervals), end_time)
 
         raise TimeoutException(message)
@@ -0,0 +1,217 @@
+"""WebDriver command profiler.
+
+Every WebDriver round trip (``findElement``, ``sendKeysToElement``,
+``clickElement``, ``executeScript``, ...) passes through the driver's
+``execute()``.  :func:`instrument` wraps that method on a driver instance, so
+commands issued by the driver and by its ``WebElement``s are counted and timed
+by type and attributed to the behaviour and step of the current tracing span
+(see :mod:`lib.tracing`).  With tracing disabled there are no spans;
+:meth:`CommandProfiler.start_run` then attributes every command to the
+running behaviour until the matching :meth:`~CommandProfiler.finish_run`.
+
+Budgets are optional and keyed by ``"<behaviour>"`` or
+``"<behaviour>:<step>"``; a run that exceeds one is logged once as a warning
+with its busiest commands, which makes N+1 patterns (one ``findElement`` per
+mail row, ...) visible right away.
+
+Usage::
+
+    driver = instrument(webdriver.Firefox())
+    command_profiler.configure({"budgets": {"work_emails": 400, "work_emails:reply_to_emails": 60}})
+    ...
+    command_profiler.finish_run(trace_id)   # logs and returns the run profile
+    run_id = command_profiler.start_run("work_emails")  # without tracing
+    command_profiler.finish_run(run_id)
+    command_profiler.behaviour_totals()     # {"work_emails": {"runs": 3, "commands": 911, "time": 4.2}}
+"""
+
+from __future__ import annotations
+
+import functools
+import itertools
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+from lib.replay import recorder
+from lib.tracing import current_span
+from src.config.models.config import ProfilerConfig
+from src.logger import app_logger
+
+UNATTRIBUTED = "-"
+MAX_TRACKED_RUNS = 16
+
+
+@dataclass(slots=True)
+class CommandStat:
+    count: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+    def add(self, elapsed: float) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+
+
+@dataclass(slots=True)
+class RunProfile:
+    """Commands of a single behaviour run (one trace)."""
+
+    behaviour: str
+    commands: dict[str, CommandStat] = field(default_factory=dict)
+    steps: Counter[str] = field(default_factory=Counter)
+    exceeded: set[str] = field(default_factory=set)
+
+    @property
+    def count(self) -> int:
+        return sum(stat.count for stat in self.commands.values())
+
+    @property
+    def total_time(self) -> float:
+        return sum(stat.total_time for stat in self.commands.values())
+
+    def top(self, limit: int = 5) -> list[tuple[str, int]]:
+        return sorted(((name, stat.count) for name, stat in self.commands.items()), key=lambda c: -c[1])[:limit]
+
+
+@dataclass(slots=True)
+class BehaviourTotal:
+    runs: int = 0
+    commands: int = 0
+    total_time: float = 0.0
+
+
+class CommandProfiler:
+    def __init__(self):
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._budgets: dict[str, int] = {}
+        self._runs: OrderedDict[str, RunProfile] = OrderedDict()
+        self._totals: dict[str, BehaviourTotal] = {}
+        # (run id, behaviour) that commands issued outside any span belong to
+        self._untraced: Optional[tuple[str, str]] = None
+        self._run_ids = itertools.count(1)
+
+    def configure(self, config: Optional[ProfilerConfig]) -> None:
+        config = config or {}
+        self.enabled = config.get("enabled", True)
+        with self._lock:
+            self._budgets = dict(config.get("budgets") or {})
+
+    def set_budget(self, behaviour: str, commands: int, step: Optional[str] = None) -> None:
+        with self._lock:
+            self._budgets[f"{behaviour}:{step}" if step else behaviour] = commands
+
+    # -- recording -------------------------------------------------------------
+
+    def record(self, command: str, elapsed: float) -> None:
+        if not self.enabled:
+            return
+
+        span = current_span()
+        if span is not None:
+            trace_id = span.trace_id
+            behaviour = span.behaviour or UNATTRIBUTED
+            step = span.step or UNATTRIBUTED
+        else:
+            trace_id, behaviour = self._untraced or (UNATTRIBUTED, UNATTRIBUTED)
+            step = UNATTRIBUTED
+
+        with self._lock:
+            run = self._runs.get(trace_id)
+            if run is None:
+                run = self._runs[trace_id] = RunProfile(behaviour)
+                while len(self._runs) > MAX_TRACKED_RUNS:
+                    self._runs.popitem(last=False)
+
+            run.commands.setdefault(command, CommandStat()).add(elapsed)
+            run.steps[step] += 1
+            exceeded = self._check_budgets(run, behaviour, step)
+            busiest = ", ".join(f"{name}={count}" for name, count in run.top()) if exceeded else ""
+
+        for key, budget in exceeded:
+            app_logger.warning(
+                f"WebDriver command budget exceeded for '{key}': more than {budget} commands (busiest: {busiest})"
+            )
+
+    def _check_budgets(self, run: RunProfile, behaviour: str, step: str) -> list[tuple[str, int]]:
+        exceeded = []
+        for key, count in ((behaviour, run.count), (f"{behaviour}:{step}", run.steps[step])):
+            budget = self._budgets.get(key)
+            if budget is not None and count > budget and key not in run.exceeded:
+                run.exceeded.add(key)
+                exceeded.append((key, budget))
+        return exceeded
+
+    def start_run(self, behaviour: str) -> str:
+        """Attribute commands issued outside any span to *behaviour*; returns the run id for :meth:`finish_run`."""
+        run_id = f"untraced-{next(self._run_ids)}"
+        with self._lock:
+            self._untraced = (run_id, behaviour)
+        return run_id
+
+    def finish_run(self, trace_id: str) -> Optional[RunProfile]:
+        """Close the profile of *trace_id* (or a :meth:`start_run` id), fold it into the totals and log it."""
+        with self._lock:
+            if self._untraced is not None and self._untraced[0] == trace_id:
+                self._untraced = None
+            run = self._runs.pop(trace_id, None)
+            if run is None:
+                return None
+            total = self._totals.setdefault(run.behaviour, BehaviourTotal())
+            total.runs += 1
+            total.commands += run.count
+            total.total_time += run.total_time
+
+        commands = ", ".join(f"{name}={count}" for name, count in run.top())
+        steps = ", ".join(f"{name}={count}" for name, count in run.steps.most_common(5))
+        app_logger.info(
+            f"{run.behaviour}: {run.count} WebDriver commands in {run.total_time:.2f}s ({commands}); steps: {steps}"
+        )
+        return run
+
+    # -- introspection ---------------------------------------------------------
+
+    def current_run(self, trace_id: str) -> Optional[RunProfile]:
+        with self._lock:
+            return self._runs.get(trace_id)
+
+    def behaviour_totals(self) -> dict[str, dict[str, float]]:
+        """Per-behaviour totals of finished runs, JSON-friendly for the status update."""
+        with self._lock:
+            return {
+                behaviour: {"runs": t.runs, "commands": t.commands, "time": round(t.total_time, 3)}
+                for behaviour, t in self._totals.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._runs.clear()
+            self._totals.clear()
+
+
+command_profiler = CommandProfiler()
+
+
+def instrument(driver):
+    """Wrap ``driver.execute`` so every command is recorded; idempotent."""
+    execute = getattr(driver, "execute", None)
+    if execute is None or getattr(execute, "_profiled", False):
+        return driver
+
+    @functools.wraps(execute)
+    def profiled_execute(driver_command, params=None):
+        started_at, start = time.time(), time.perf_counter()
+        try:
+            return execute(driver_command, params)
+        finally:
+            elapsed = time.perf_counter() - start
+            command_profiler.record(driver_command, elapsed)
+            recorder.record_command(driver_command, params, elapsed, started_at)
+
+    profiled_execute._profiled = True
+    driver.execute = profiled_execute
+    return driver
@@ -1,34 +1,80 @@
-﻿from typing import List
+﻿import functools
+import re
+from typing import List
 
 import jinja2
-import pyautogui as pag
 import pyperclip
 from selenium.common.exceptions import (
     NoSuchElementException,
     TimeoutException,
 )
 from selenium.webdriver import Keys
-from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.select import Select
 
 from behaviour.models.exceptions import BehaviourException
+from consts.timeout import DEFAULT_TIMEOUT
+from lib.autogui import hotkey, write
 from lib.cancellable_futures import sleep
+from lib.email_manager.address_book import address_book
 from lib.email_manager.email_manager import EmailManager
+from lib.selenium import locators
+from lib.selenium.command_profiler import instrument
+from lib.selenium.locators import Element
 from lib.selenium.models import EmailClient, EmailClientUser
+from lib.selenium.observer_wait import ElementCondition
 from lib.selenium.selenium_driver import SeleniumDriver
 from lib.selenium.types import DriverType
 from src.logger import app_logger
 
+PRESENT = ElementCondition.PRESENT
+CLICKABLE = ElementCondition.CLICKABLE
+# How long the receiver field may take to turn one typed address into a recipient
+RECEIVER_CONFIRM_TIMEOUT: float = 2.0
+_ADDRESS = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+
+
+@functools.lru_cache(maxsize=128)
+def _template(source: str) -> jinja2.Template:
+    # Email bodies come from a fixed set in emails.yml, so each is compiled once
+    return jinja2.Template(source)
+
 
 class BaseEmailWebClient(SeleniumDriver):
+    # Whether a mail is opened by clicking its subject (True) or the whole list row (False)
+    open_email_via_subject: bool = False
+
     def __init__(self, driver: DriverType, user: EmailClientUser):
-        self.driver = driver
+        self.driver = instrument(driver)
         self.user = user
         self.email_manager = EmailManager()
         self.type = "base"
 
+    def locate(
+        self,
+        element: Element,
+        condition: ElementCondition = PRESENT,
+        timeout: float = DEFAULT_TIMEOUT,
+        **params: str,
+    ) -> WebElement:
+        """Wait for a registered element of this client, see :mod:`lib.selenium.locators`."""
+        return locators.find(self, self.type, element, condition, timeout, **params)
+
+    def locate_all(
+        self,
+        element: Element,
+        condition: ElementCondition = PRESENT,
+        timeout: float = DEFAULT_TIMEOUT,
+        **params: str,
+    ) -> list[WebElement]:
+        return locators.find_all(self, self.type, element, condition, timeout, **params)
+
+    def locate_within(self, parent: WebElement, element: Element, **params: str) -> WebElement:
+        return locators.find_within(parent, self.type, element, **params)
+
+    def locate_present(self, element: Element, **params: str) -> list[WebElement]:
+        return locators.find_present(self, self.type, element, **params)
+
     def login(self):
         raise NotImplementedError()
 
@@ -41,6 +87,15 @@ class BaseEmailWebClient(SeleniumDriver):
     def send_email(self, receivers: list[str], subject: str, email_body: str):
         raise NotImplementedError()
 
+    def _locate_unread_emails(self) -> list[WebElement]:
+        """Rows of the unread mail list; an empty list when none shows up, which is not an error."""
+        try:
+            return self.locate_all(Element.UNREAD_EMAILS)
+        except TimeoutException:
+            return []
+        except Exception as ex:
+            raise BehaviourException("Error trying to get emails", ex)
+
     def reply_to_email(self, subject: str, email_body: str):
         raise NotImplementedError()
 
@@ -50,20 +105,11 @@ class BaseEmailWebClient(SeleniumDriver):
 
         responded_count = 0
         for email in email_list:
-            subject_element = None
-            if self.type == EmailClient.OWA:
-                subject_element = email.find_element(
-                    By.XPATH,
-                    ".//span[contains(@class, 'lvHighlightAllClass lvHighlightSubjectClass')]",
-                )
-            elif self.type == EmailClient.O365:
-                subject_element = email.find_element(By.XPATH, ".//div[2]//span[@title='']")
-            else:
-                subject_element = email.find_element(By.CSS_SELECTOR, "td.subject a")
+            subject_element = self.locate_within(email, Element.EMAIL_ROW_SUBJECT)
 
             email_id = self.email_manager.get_email_id_by_subject(subject_element.text)
             if email_id:
-                if self.type == EmailClient.OWA:
+                if self.open_email_via_subject:
                     subject_element.click()
                 else:
                     email.click()
@@ -81,92 +127,105 @@ class BaseEmailWebClient(SeleniumDriver):
 
     def _open_email_by_subject(self, subject_text: str):
         """Find and open an email by its subject text."""
-        safe_subject = subject_text.replace("'", "\\'")
-
-        if self.type == EmailClient.OWA:
-            element = self.wait().until(
-                EC.element_to_be_clickable(
-                    (
-                        By.XPATH,
-                        f"//span[contains(@class, 'lvHighlightAllClass') and contains(text(), '{safe_subject}')]",
-                    )
-                )
-            )
-        elif self.type == EmailClient.O365:
-            element = self.wait().until(
-                EC.element_to_be_clickable((By.XPATH, f"//span[contains(@title, '{safe_subject}')]"))
-            )
-        elif self.type == EmailClient.ROUNDCUBE:
-            element = self.wait().until(
-                EC.element_to_be_clickable(
-                    (
-                        By.XPATH,
-                        f"//td[contains(@class, 'subject')]//a[contains(text(), '{safe_subject}')]",
-                    )
-                )
-            )
-        else:
+        if self.type == "base":
             raise ValueError(f"Unknown email client type: {self.type}")
 
-        element.click()
+        safe_subject = subject_text.replace("'", "\\'")
+        self.locate(Element.EMAIL_BY_SUBJECT, CLICKABLE, subject=safe_subject).click()
+
+    def render_body(self, email_body: str, receivers: list[str] | None = None) -> str:
+        """Render an email template for the first of *receivers*, see :mod:`lib.email_manager.address_book`."""
+        receiver_name = address_book.display_name(receivers[0]) if receivers else ""
+        return _template(email_body).render(sender_name=self.user["name"], receiver_name=receiver_name)
 
     def _type_receivers(self, element: WebElement, receivers: list[str]):
+        """Enter the receivers that are not recipients yet (reply drafts have some), confirming each one.
+
+        An address counts as accepted once the field has turned the typed text
+        into a recipient, i.e. the text left the input.
+        """
         self.click_element(element)
         sleep(0.5)
 
-        for receiver in receivers:
-            self.type_text(element, receiver)
+        present = self._recipient_addresses()
+        for address in dict.fromkeys(address_book.normalize(receiver) for receiver in receivers):
+            if address in present:
+                continue
             self.check_cancellation()
-            element.send_keys(Keys.ENTER)
-            sleep(0.2)
+            element.send_keys(address, Keys.ENTER)
+            try:
+                self.wait(RECEIVER_CONFIRM_TIMEOUT).until(
+                    lambda _: address not in _typed_text(element), label="receiver accepted"
+                )
+            except TimeoutException:
+                app_logger.warning(f"Receiver field did not accept {address} in time")
+
+    def _recipient_addresses(self) -> set[str]:
+        """Addresses shown (as text or title) by the recipients already in the receiver field."""
+        addresses = set()
+        for recipient in self.locate_present(Element.RECIPIENT):
+            shown = f"{recipient.text} {recipient.get_attribute('title') or ''}"
+            addresses.update(address_book.normalize(address) for address in _ADDRESS.findall(shown))
+        return addresses
+
+    def open_specific_email(self, subject: str):
+        try:
+            self.locate(Element.SPECIFIC_EMAIL, CLICKABLE, subject=subject).click()
+        except NoSuchElementException:
+            app_logger.error(f"No email found with subject: {subject}")
+
+        except Exception as ex:
+            raise BehaviourException(f"Error opening specific email with subject: '{subject}'", ex)
 
     def email_allow_files(self):
         raise NotImplementedError()
 
 
+def _typed_text(element: WebElement) -> str:
+    """Text still in a receiver input; contenteditable fields have no ``value``."""
+    value = element.get_attribute("value")
+    return (element.text if value is None else value).lower()
+
+
 class OutlookWebAccessClient(BaseEmailWebClient):
+    open_email_via_subject = True
+
     def __init__(self, driver: DriverType, user: EmailClientUser):
         super().__init__(driver, user)
         self.type = EmailClient.OWA
 
     def login(self):
         try:
-            self.wait().until(EC.presence_of_element_located((By.XPATH, "//input[@name='username']"))).click()
+            self.locate(Element.LOGIN_USERNAME).click()
 
             sleep(0.5)
-            pag.write(self.user["email"], 0.1)
+            write(self.user["email"], 0.1)
             sleep(0.5)
 
-            self.wait().until(EC.presence_of_element_located((By.XPATH, "//input[@name='password']"))).click()
+            self.locate(Element.LOGIN_PASSWORD).click()
 
             sleep(0.5)
-            pag.write(self.user["password"], 0.1)
+            write(self.user["password"], 0.1)
             sleep(0.5)
 
-            self.wait().until(EC.presence_of_element_located((By.XPATH, "//div[@class='signinbutton']"))).click()
+            self.locate(Element.LOGIN_SUBMIT).click()
 
             try:
-                self.wait().until(
-                    EC.presence_of_element_located((By.XPATH, "//div[contains(@class, 'chooseLanguageLabel')]"))
-                )
+                self.locate(Element.LANGUAGE_PROMPT)
             except Exception:
                 pass
             else:
-                timezone_dropdown = self.wait().until(
-                    EC.presence_of_element_located((By.XPATH, "//select[@id='selTz']"))
-                )
+                timezone_dropdown = self.locate(Element.TIMEZONE_SELECT)
                 Select(timezone_dropdown).select_by_value("Central Europe Standard Time")
                 sleep(0.5)
-                self.wait().until(
-                    EC.presence_of_element_located((By.XPATH, "//div/span[contains(text(), 'Save')]/.."))
-                ).click()
+                self.locate(Element.LANGUAGE_SAVE).click()
 
         except Exception as ex:
             raise BehaviourException("Error logging into email web client", ex)
 
     def logout(self):
         try:
-            self.wait().until(EC.element_to_be_clickable((By.XPATH, "//span[contains(text(), 'Logout')]"))).click()
+            self.locate(Element.LOGOUT, CLICKABLE).click()
             sleep(1)
 
         except Exception as ex:
@@ -175,56 +234,36 @@ class OutlookWebAccessClient(BaseEmailWebClient):
     def get_unread_emails(self):
         try:
             try:
-                self.driver.find_element(By.XPATH, "//button[.//span[contains(text(), 'Unread')]]").click()
-            except NoSuchElementException:
-                self.driver.find_element(By.XPATH, "//button[.//span[contains(text(), 'Filter')]]").click()
-                self.driver.find_element(By.XPATH, "//button[.//span[contains(text(), 'Unread')]]").click()
-            unread_emails = self.wait().until(
-                EC.presence_of_all_elements_located(
-                    (
-                        By.XPATH,
-                        "//div[contains(@class, '_lvv_w') and contains(@class, '_lvv_z') and (@role='option') and (contains(@class, 'listItemDefaultBackground') or contains(@class, 'ms-bgc-nl'))]",
-                    )
-                )
-            )
-            return unread_emails
-
-        except TimeoutException:
-            return []
-
+                self.locate(Element.UNREAD_FILTER, timeout=0).click()
+            except TimeoutException:
+                self.locate(Element.FILTER_MENU, timeout=0).click()
+                self.locate(Element.UNREAD_FILTER, timeout=0).click()
         except Exception as ex:
-            raise BehaviourException("Error trying to get emails", ex)
+            raise BehaviourException("Error filtering unread emails", ex)
+
+        return self._locate_unread_emails()
 
     def send_email(self, receivers: list[str], subject: str, email_body: str):
         try:
-            receiver_name = ""
-            if len(receivers) > 0:
-                receiver_name = receivers[0].split(".")[0].capitalize()
-            email_body = jinja2.Template(email_body).render(sender_name=self.user["name"], receiver_name=receiver_name)
+            email_body = self.render_body(email_body, receivers)
 
-            self.click_element(
-                self.wait().until(EC.element_to_be_clickable((By.XPATH, "//button[contains(@title, 'Write a new message')]")))
-            )
+            self.click_element(self.locate(Element.NEW_MESSAGE, CLICKABLE))
 
             sleep(2)
 
-            to_input = self.wait().until(EC.element_to_be_clickable((By.XPATH, "//input[contains(@aria-label, 'To')]")))
+            to_input = self.locate(Element.TO_INPUT, CLICKABLE)
             self._type_receivers(to_input, receivers)
             sleep(1)
 
-            subject_input = self.wait().until(
-                EC.element_to_be_clickable((By.XPATH, "//input[@placeholder='Add a subject']"))
-            )
+            subject_input = self.locate(Element.SUBJECT_INPUT, CLICKABLE)
             self.type_text(subject_input, subject, clear_first=True)
             sleep(1)
 
-            body_input = self.wait().until(
-                EC.element_to_be_clickable((By.XPATH, "//div[contains(@aria-label, 'Message body')]"))
-            )
+            body_input = self.locate(Element.BODY_INPUT, CLICKABLE)
             self.type_text(body_input, email_body, clear_first=True)
             sleep(1)
 
-            self.click_element(self.wait().until(EC.element_to_be_clickable((By.XPATH, "//button[contains(@title, 'Send')]"))))
+            self.click_element(self.locate(Element.SEND, CLICKABLE))
             sleep(1)
 
         except Exception as ex:
@@ -232,56 +271,35 @@ class OutlookWebAccessClient(BaseEmailWebClient):
 
     def reply_to_email(self, subject: str, email_body: str):
         try:
-            self.wait().until(EC.element_to_be_clickable((By.XPATH, "//button[contains(@title, 'Reply all')]"))).click()
-            self.wait().until(EC.element_to_be_clickable((By.XPATH, "//button[contains(@title, 'Expand')]"))).click()
+            self.locate(Element.REPLY, CLICKABLE).click()
+            self.locate(Element.EXPAND_HEADER, CLICKABLE).click()
 
-            self.wait().until(
-                EC.element_to_be_clickable((By.XPATH, "//input[contains(@placeholder, 'Add a subject')]"))
-            ).click()
+            self.locate(Element.REPLY_SUBJECT, CLICKABLE).click()
 
-            pag.hotkey("ctrl", "a")
+            hotkey("ctrl", "a")
             sleep(0.5)
             pyperclip.copy(subject)
-            pag.hotkey("ctrl", "v")
+            hotkey("ctrl", "v")
             sleep(1)
 
-            self.wait().until(
-                EC.element_to_be_clickable((By.XPATH, "//div[contains(@aria-label, 'Message body')]"))
-            ).click()
+            self.locate(Element.REPLY_BODY, CLICKABLE).click()
 
-            pag.hotkey("ctrl", "a")
+            hotkey("ctrl", "a")
             sleep(0.5)
-            receiver_name = ""
-            email_body = jinja2.Template(email_body).render(sender_name=self.user["name"], receiver_name=receiver_name)
+            email_body = self.render_body(email_body)
             pyperclip.copy(email_body)
-            pag.hotkey("ctrl", "v")
+            hotkey("ctrl", "v")
             sleep(1)
 
-            self.click_element(self.wait().until(EC.element_to_be_clickable((By.XPATH, "//button[contains(@title, 'Send')]"))))
+            self.click_element(self.locate(Element.REPLY_SEND, CLICKABLE))
             sleep(1)
 
         except Exception as ex:
             raise BehaviourException(f"Error replying to email: {subject}", ex)
 
-    def open_specific_email(self, subject: str):
-        try:
-            self.wait().until(EC.element_to_be_clickable((By.XPATH, f"//span[contains(text(), '{subject}')]"))).click()
-        except NoSuchElementException:
-            app_logger.error(f"No email found with subject: {subject}")
-
-        except Exception as ex:
-            raise BehaviourException(f"Error opening specific email with subject: '{subject}'", ex)
-
     def email_allow_files(self):
         try:
-            self.wait(5).until(
-                EC.element_to_be_clickable(
-                    (
-                        By.XPATH,
-                        "//div[@class='InfobarImmediateTextContainer'][contains(text(), 'To always show content from this sender,')]/following-sibling::a[@role='link']",
-                    )
-                )
-            ).click()
+            self.locate(Element.ALLOW_FILES, CLICKABLE).click()
 
         except Exception:
             pass
@@ -294,60 +312,39 @@ class O365Client(BaseEmailWebClient):
 
     def login(self):
         try:
-            self.wait().until(EC.presence_of_element_located((By.XPATH, "//input[@type='email']"))).click()
+            self.locate(Element.LOGIN_USERNAME).click()
 
             sleep(0.5)
-            pag.write(self.user["email"], 0.1)
+            write(self.user["email"], 0.1)
             sleep(0.5)
 
-            self.wait().until(EC.presence_of_element_located((By.XPATH, "//input[@type='submit']"))).click()
+            self.locate(Element.LOGIN_NEXT).click()
             sleep(1)
-            self.wait().until(EC.presence_of_element_located((By.XPATH, "//input[@type='password']"))).click()
+            self.locate(Element.LOGIN_PASSWORD).click()
 
             sleep(0.5)
-            pag.write(self.user["password"], 0.1)
+            write(self.user["password"], 0.1)
             sleep(0.5)
 
-            self.wait().until(EC.presence_of_element_located((By.XPATH, "//input[@type='submit']"))).click()
+            self.locate(Element.LOGIN_SUBMIT).click()
 
             sleep(1)
 
             try:
-                self.wait().until(
-                    EC.presence_of_element_located(
-                        (
-                            By.XPATH,
-                            "//input[@type='checkbox' and @name='DontShowAgain']",
-                        )
-                    )
-                ).click()
-                self.wait().until(EC.presence_of_element_located((By.XPATH, "//input[@type='submit']"))).click()
+                self.locate(Element.LOGIN_STAY_SIGNED_IN).click()
+                self.locate(Element.LOGIN_SUBMIT).click()
             except Exception:
                 pass
 
-            self.wait(10).until(EC.presence_of_element_located((By.XPATH, "//span[contains(text(), 'Outlook')]")))
+            self.locate(Element.LOGIN_COMPLETE, timeout=10)
 
         except Exception as ex:
             raise BehaviourException("Error logging into email web client", ex)
 
     def logout(self):
         try:
-            self.wait().until(
-                EC.element_to_be_clickable(
-                    (
-                        By.XPATH,
-                        "//div[@id='O365_UniversalMeContainer']//button[@id='mectrl_main_trigger']",
-                    )
-                )
-            ).click()
-            self.wait().until(
-                EC.element_to_be_clickable(
-                    (
-                        By.XPATH,
-                        "//div[@id='mectrl_main_body']//a[@id='mectrl_body_signOut']",
-                    )
-                )
-            ).click()
+            self.locate(Element.ACCOUNT_MENU, CLICKABLE).click()
+            self.locate(Element.LOGOUT, CLICKABLE).click()
             sleep(1)
 
         except Exception as ex:
@@ -357,56 +354,40 @@ class O365Client(BaseEmailWebClient):
         try:
             is_filtered_unread = False
             try:
-                self.driver.find_element(By.XPATH, "//button[@aria-label='Unread']").click()
+                self.locate(Element.UNREAD_FILTER, timeout=0).click()
                 is_filtered_unread = True
-            except NoSuchElementException:
+            except TimeoutException:
                 pass
 
             if not is_filtered_unread:
-                self.wait(10).until(EC.element_to_be_clickable((By.XPATH, "//button[@aria-label='Filter']"))).click()
-                self.wait(10).until(
-                    EC.element_to_be_clickable((By.XPATH, "//div[@role='menuitemradio' and @title='Unread']"))
-                ).click()
-
-            unread_emails = self.wait().until(
-                EC.presence_of_all_elements_located(
-                    (By.XPATH, "//div[@id='MailList']//div[@data-focusable-row='true']")
-                )
-            )
-            return unread_emails
-
-        except TimeoutException:
-            return []
-
+                self.locate(Element.FILTER_MENU, CLICKABLE, timeout=10).click()
+                self.locate(Element.FILTER_UNREAD_OPTION, CLICKABLE, timeout=10).click()
         except Exception as ex:
-            raise BehaviourException("Error trying to get emails", ex)
+            raise BehaviourException("Error filtering unread emails", ex)
+
+        return self._locate_unread_emails()
 
     def send_email(self, receivers, subject: str, email_body: str):
         try:
-            receiver_name = ""
-            if len(receivers) > 0:
-                receiver_name = receivers[0].split(".")[0].capitalize()
-            email_body = jinja2.Template(email_body).render(sender_name=self.user["name"], receiver_name=receiver_name)
+            email_body = self.render_body(email_body, receivers)
 
-            self.click_element(
-                self.wait().until(EC.element_to_be_clickable((By.XPATH, "//button[contains(@aria-label, 'New mail')]")))
-            )
+            self.click_element(self.locate(Element.NEW_MESSAGE, CLICKABLE))
 
             sleep(2)
 
-            to_input = self.wait().until(EC.element_to_be_clickable((By.XPATH, "//div[contains(text(), 'To')]")))
+            to_input = self.locate(Element.TO_INPUT, CLICKABLE)
             self._type_receivers(to_input, receivers)
             sleep(1)
 
-            subject_input = self.wait().until(EC.element_to_be_clickable((By.XPATH, "//input[@aria-label='Subject']")))
+            subject_input = self.locate(Element.SUBJECT_INPUT, CLICKABLE)
             self.type_text(subject_input, subject, clear_first=True)
             sleep(1)
 
-            body_input = self.wait().until(EC.element_to_be_clickable((By.XPATH, "//div[@aria-label='Message body']")))
+            body_input = self.locate(Element.BODY_INPUT, CLICKABLE)
             self.type_text(body_input, email_body, clear_first=True)
             sleep(1)
 
-            self.click_element(self.wait().until(EC.element_to_be_clickable((By.XPATH, "//button[@aria-label='Send']"))))
+            self.click_element(self.locate(Element.SEND, CLICKABLE))
             sleep(1)
 
         except Exception as ex:
@@ -414,60 +395,35 @@ class O365Client(BaseEmailWebClient):
 
     def reply_to_email(self, subject: str, email_body: str):
         try:
-            self.wait().until(
-                EC.element_to_be_clickable((By.XPATH, "//div[contains(@aria-label, 'Reply all')]"))
-            ).click()
-            self.wait().until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(@aria-label, 'Expand header')]"))
-            ).click()
-
-            self.wait().until(
-                EC.element_to_be_clickable((By.XPATH, "//input[contains(@placeholder, 'Add a subject')]"))
-            ).click()
-
-            pag.hotkey("ctrl", "a")
+            self.locate(Element.REPLY, CLICKABLE).click()
+            self.locate(Element.EXPAND_HEADER, CLICKABLE).click()
+
+            self.locate(Element.REPLY_SUBJECT, CLICKABLE).click()
+
+            hotkey("ctrl", "a")
             sleep(0.5)
             pyperclip.copy(subject)
-            pag.hotkey("ctrl", "v")
+            hotkey("ctrl", "v")
             sleep(1)
 
-            self.wait().until(
-                EC.element_to_be_clickable((By.XPATH, "//div[contains(@aria-label, 'Message body')]"))
-            ).click()
+            self.locate(Element.REPLY_BODY, CLICKABLE).click()
 
-            pag.hotkey("ctrl", "a")
+            hotkey("ctrl", "a")
             sleep(0.5)
-            receiver_name = ""
-            email_body = jinja2.Template(email_body).render(sender_name=self.user["name"], receiver_name=receiver_name)
+            email_body = self.render_body(email_body)
             pyperclip.copy(email_body)
-            pag.hotkey("ctrl", "v")
+            hotkey("ctrl", "v")
             sleep(1)
 
-            self.click_element(self.wait().until(EC.element_to_be_clickable((By.XPATH, "//button[contains(@title, 'Send')]"))))
+            self.click_element(self.locate(Element.REPLY_SEND, CLICKABLE))
             sleep(1)
 
         except Exception as ex:
             raise BehaviourException(f"Error replying to email: {subject}", ex)
 
-    def open_specific_email(self, subject: str):
-        try:
-            self.wait().until(EC.element_to_be_clickable((By.XPATH, f"//span[contains(text(), '{subject}')]"))).click()
-        except NoSuchElementException:
-            app_logger.error(f"No email found with subject: {subject}")
-
-        except Exception as ex:
-            raise BehaviourException(f"Error opening specific email with subject: '{subject}'", ex)
-
     def email_allow_files(self):
         try:
-            self.wait(5).until(
-                EC.element_to_be_clickable(
-                    (
-                        By.XPATH,
-                        "//div[@class='InfobarImmediateTextContainer'][contains(text(), 'To always show content from this sender,')]/following-sibling::a[@role='link']",
-                    )
-                )
-            ).click()
+            self.locate(Element.ALLOW_FILES, CLICKABLE).click()
 
         except Exception:
             pass
@@ -479,66 +435,52 @@ class RoundcubeClient(BaseEmailWebClient):
         self.type = EmailClient.ROUNDCUBE
 
     def login(self):
-        self.wait().until(EC.presence_of_element_located((By.XPATH, "//input[@name='_user']"))).click()
+        self.locate(Element.LOGIN_USERNAME).click()
 
         sleep(0.5)
-        pag.write(self.user["email"], 0.1)
+        write(self.user["email"], 0.1)
         sleep(0.5)
 
-        self.wait().until(EC.presence_of_element_located((By.XPATH, "//input[@name='_pass']"))).click()
+        self.locate(Element.LOGIN_PASSWORD).click()
 
         sleep(0.5)
-        pag.write(self.user["password"], 0.1)
+        write(self.user["password"], 0.1)
         sleep(0.5)
 
-        self.wait().until(EC.presence_of_element_located((By.XPATH, "//button[@id='rcmloginsubmit']"))).click()
+        self.locate(Element.LOGIN_SUBMIT).click()
 
     def logout(self):
         try:
-            self.wait().until(EC.element_to_be_clickable((By.XPATH, "//span[contains(text(), 'Logout')]"))).click()
+            self.locate(Element.LOGOUT, CLICKABLE).click()
             sleep(1)
 
         except Exception as ex:
             raise BehaviourException("Error logging out of roundcube web client", ex)
 
     def get_unread_emails(self):
-        try:
-            unread_emails = self.wait().until(
-                EC.presence_of_all_elements_located((By.XPATH, "//tr[contains(@class, 'unread')]"))
-            )
-            return unread_emails
-        except TimeoutException:
-            return []
-
-        except Exception as ex:
-            raise BehaviourException("Error trying to get emails", ex)
+        return self._locate_unread_emails()
 
     def send_email(self, receivers, subject: str, email_body: str):
         try:
-            receiver_name = ""
-            if len(receivers) > 0:
-                receiver_name = receivers[0].split(".")[0].capitalize()
-            email_body = jinja2.Template(email_body).render(sender_name=self.user["name"], receiver_name=receiver_name)
+            email_body = self.render_body(email_body, receivers)
 
-            self.click_element(self.wait().until(EC.element_to_be_clickable((By.XPATH, "//a[@title='Create a new message']"))))
+            self.click_element(self.locate(Element.NEW_MESSAGE, CLICKABLE))
 
             sleep(2)
 
-            to_input = self.wait().until(EC.element_to_be_clickable((By.XPATH, "//input[contains(@aria-label, 'To')]")))
+            to_input = self.locate(Element.TO_INPUT, CLICKABLE)
             self._type_receivers(to_input, receivers)
             sleep(1)
 
-            subject_input = self.wait().until(EC.element_to_be_clickable((By.XPATH, "//input[@name='_subject']")))
+            subject_input = self.locate(Element.SUBJECT_INPUT, CLICKABLE)
             self.type_text(subject_input, subject, clear_first=True)
             sleep(1)
 
-            body_input = self.wait().until(
-                EC.element_to_be_clickable((By.XPATH, "//div[contains(@aria-label, 'Message body')]"))
-            )
+            body_input = self.locate(Element.BODY_INPUT, CLICKABLE)
             self.type_text(body_input, email_body, clear_first=True)
             sleep(1)
 
-            self.click_element(self.wait().until(EC.element_to_be_clickable((By.XPATH, "//button[contains(@title, 'Send')]"))))
+            self.click_element(self.locate(Element.SEND, CLICKABLE))
             sleep(1)
 
         except Exception as ex:
@@ -546,41 +488,31 @@ class RoundcubeClient(BaseEmailWebClient):
 
     def reply_to_email(self, subject: str, email_body: str):
         try:
-            self.wait().until(EC.element_to_be_clickable((By.XPATH, "//a[@title='Reply to sender']"))).click()
+            self.locate(Element.REPLY, CLICKABLE).click()
 
-            self.wait().until(EC.element_to_be_clickable((By.XPATH, "//input[@name='_subject']"))).click()
+            self.locate(Element.REPLY_SUBJECT, CLICKABLE).click()
 
-            pag.hotkey("ctrl", "a")
+            hotkey("ctrl", "a")
             sleep(0.5)
             pyperclip.copy(subject)
-            pag.hotkey("ctrl", "v")
+            hotkey("ctrl", "v")
             sleep(1)
 
-            self.wait().until(EC.element_to_be_clickable((By.XPATH, "//textarea[@name='_message']"))).click()
+            self.locate(Element.REPLY_BODY, CLICKABLE).click()
 
-            pag.hotkey("ctrl", "a")
+            hotkey("ctrl", "a")
             sleep(0.5)
-            receiver_name = ""
-            email_body = jinja2.Template(email_body).render(sender_name=self.user["name"], receiver_name=receiver_name)
+            email_body = self.render_body(email_body)
             pyperclip.copy(email_body)
-            pag.hotkey("ctrl", "v")
+            hotkey("ctrl", "v")
             sleep(1)
 
-            self.wait().until(EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Send')]"))).click()
+            self.locate(Element.REPLY_SEND, CLICKABLE).click()
             sleep(1)
 
         except Exception as ex:
             raise BehaviourException(f"Error replying to email: {subject}", ex)
 
-    def open_specific_email(self, subject: str):
-        try:
-            self.wait().until(EC.element_to_be_clickable((By.XPATH, f"//span[contains(text(), '{subject}')]"))).click()
-        except NoSuchElementException:
-            app_logger.error(f"No email found with subject: {subject}")
-
-        except Exception as ex:
-            raise BehaviourException(f"Error opening specific email with subject: '{subject}'", ex)
-
     def email_allow_files(self):
         pass
 
@@ -601,4 +533,3 @@ def getEmailClient(
         raise NoSuchElementException(f"Email client could not be found for: {email_client}")
 
     return email_client_mapping[email_client]
-
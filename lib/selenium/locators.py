@@ -0,0 +1,402 @@
+"""Locator registry for the web email clients.
+
+Every selector used to drive an email client lives here, keyed by
+``(EmailClient, Element)``.  Selectors are precomputed at import time and
+prefer CSS/id lookups; XPath is only used where the match depends on text
+content or axes CSS cannot express.
+
+A :class:`Selector` may carry fallbacks.  The primary locator gets the full
+wait timeout, fallbacks are then tried with a short grace period.  Hit
+latency and fallback usage are recorded per key in
+:data:`locator_statistics`, so slow or stale selectors can be found from data
+and replaced.
+
+Usage::
+
+    element = locators.find(driver, EmailClient.OWA, Element.SEND, ElementCondition.CLICKABLE)
+    subject = locators.find_within(row, EmailClient.ROUNDCUBE, Element.EMAIL_ROW_SUBJECT)
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from enum import Enum
+from typing import TYPE_CHECKING, Optional
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+
+from consts.timeout import DEFAULT_TIMEOUT
+from lib.selenium.models import EmailClient
+from lib.selenium.observer_wait import ElementCondition, Locator
+
+if TYPE_CHECKING:
+    from lib.selenium.selenium_driver import SeleniumDriver
+
+FALLBACK_TIMEOUT: float = 1.0
+
+
+class Element(Enum):
+    LOGIN_USERNAME = "login_username"
+    LOGIN_PASSWORD = "login_password"
+    LOGIN_NEXT = "login_next"
+    LOGIN_SUBMIT = "login_submit"
+    LOGIN_STAY_SIGNED_IN = "login_stay_signed_in"
+    LOGIN_COMPLETE = "login_complete"
+    LANGUAGE_PROMPT = "language_prompt"
+    TIMEZONE_SELECT = "timezone_select"
+    LANGUAGE_SAVE = "language_save"
+    ACCOUNT_MENU = "account_menu"
+    LOGOUT = "logout"
+    UNREAD_FILTER = "unread_filter"
+    FILTER_MENU = "filter_menu"
+    FILTER_UNREAD_OPTION = "filter_unread_option"
+    UNREAD_EMAILS = "unread_emails"
+    EMAIL_ROW_SUBJECT = "email_row_subject"
+    EMAIL_BY_SUBJECT = "email_by_subject"
+    SPECIFIC_EMAIL = "specific_email"
+    NEW_MESSAGE = "new_message"
+    TO_INPUT = "to_input"
+    RECIPIENT = "recipient"
+    SUBJECT_INPUT = "subject_input"
+    BODY_INPUT = "body_input"
+    SEND = "send"
+    REPLY = "reply"
+    EXPAND_HEADER = "expand_header"
+    REPLY_SUBJECT = "reply_subject"
+    REPLY_BODY = "reply_body"
+    REPLY_SEND = "reply_send"
+    ALLOW_FILES = "allow_files"
+    ATTACHMENTS = "attachments"
+    ATTACHMENT_NAME = "attachment_name"
+    PHISHING_EMAIL = "phishing_email"
+    PHISHING_PASSWORD = "phishing_password"
+    PHISHING_SUBMIT = "phishing_submit"
+
+
+@dataclass(frozen=True, slots=True)
+class Selector:
+    """Primary locator plus ordered fallbacks.  Values may contain ``{param}`` placeholders."""
+
+    primary: Locator
+    fallbacks: tuple[Locator, ...] = ()
+
+    @property
+    def locators(self) -> tuple[Locator, ...]:
+        return (self.primary, *self.fallbacks)
+
+    def render(self, **params: str) -> tuple[Locator, ...]:
+        if not params:
+            return self.locators
+        return tuple((by, value.format(**params)) for by, value in self.locators)
+
+
+def css(value: str, *fallbacks: Locator) -> Selector:
+    return Selector((By.CSS_SELECTOR, value), fallbacks)
+
+
+def xpath(value: str, *fallbacks: Locator) -> Selector:
+    return Selector((By.XPATH, value), fallbacks)
+
+
+_ALLOW_FILES_XPATH = (
+    "//div[@class='InfobarImmediateTextContainer'][contains(text(), 'To always show content from this sender,')]"
+    "/following-sibling::a[@role='link']"
+)
+
+# The phishing page mimics a different login form per client, so the submit button differs too
+_SIGNIN_BUTTON: Locator = (By.CSS_SELECTOR, "div[class='signinbutton']")
+_RCM_LOGIN_SUBMIT: Locator = (By.CSS_SELECTOR, "button[id*='rcmloginsubmit']")
+
+_OWA_PHISHING: dict[Element, Selector] = {
+    Element.PHISHING_EMAIL: css("input[name*='email']"),
+    Element.PHISHING_PASSWORD: css("input[name*='password']"),
+    Element.PHISHING_SUBMIT: Selector(_RCM_LOGIN_SUBMIT, (_SIGNIN_BUTTON,)),
+}
+
+_PHISHING: dict[Element, Selector] = {
+    Element.PHISHING_EMAIL: css("input[name='email']"),
+    Element.PHISHING_PASSWORD: css("input[name='password']"),
+    Element.PHISHING_SUBMIT: Selector(_SIGNIN_BUTTON, (_RCM_LOGIN_SUBMIT,)),
+}
+
+_OWA_ATTACHMENTS: dict[Element, Selector] = {
+    Element.ATTACHMENTS: css("div[class*='attachmentWell'] a[class*='o365button']"),
+    # Looked up within an attachment, see find_within
+    Element.ATTACHMENT_NAME: css("span[class*='_ay_x ms-font-m']"),
+}
+
+
+def _for_client(client: EmailClient, selectors: dict[Element, Selector]) -> dict[tuple[EmailClient, Element], Selector]:
+    return {(client, element): selector for element, selector in selectors.items()}
+
+
+LOCATORS: dict[tuple[EmailClient, Element], Selector] = {
+    # -- Outlook Web Access ---------------------------------------------------
+    **_for_client(
+        EmailClient.OWA,
+        {
+            Element.LOGIN_USERNAME: css("input[name='username']"),
+            Element.LOGIN_PASSWORD: css("input[name='password']"),
+            Element.LOGIN_SUBMIT: css("div[class='signinbutton']"),
+            Element.LANGUAGE_PROMPT: css("div[class*='chooseLanguageLabel']"),
+            Element.TIMEZONE_SELECT: css("select#selTz"),
+            Element.LANGUAGE_SAVE: xpath("//div/span[contains(text(), 'Save')]/.."),
+            Element.LOGOUT: xpath("//span[contains(text(), 'Logout')]"),
+            Element.UNREAD_FILTER: xpath("//button[.//span[contains(text(), 'Unread')]]"),
+            Element.FILTER_MENU: xpath("//button[.//span[contains(text(), 'Filter')]]"),
+            Element.UNREAD_EMAILS: css(
+                "div[class*='_lvv_w'][class*='_lvv_z'][role='option'][class*='listItemDefaultBackground'], "
+                "div[class*='_lvv_w'][class*='_lvv_z'][role='option'][class*='ms-bgc-nl']"
+            ),
+            Element.EMAIL_ROW_SUBJECT: css("span[class*='lvHighlightAllClass lvHighlightSubjectClass']"),
+            Element.EMAIL_BY_SUBJECT: xpath(
+                "//span[contains(@class, 'lvHighlightAllClass') and contains(text(), '{subject}')]"
+            ),
+            Element.SPECIFIC_EMAIL: xpath("//span[contains(text(), '{subject}')]"),
+            Element.NEW_MESSAGE: css("button[title*='Write a new message']"),
+            Element.TO_INPUT: css("input[aria-label*='To']"),
+            # A typed address once it became a recipient, see find_present
+            Element.RECIPIENT: css("span[class*='_pe_'][role='button']"),
+            Element.SUBJECT_INPUT: css("input[placeholder='Add a subject']"),
+            Element.BODY_INPUT: css("div[aria-label*='Message body']"),
+            Element.SEND: css("button[title*='Send']"),
+            Element.REPLY: css("button[title*='Reply all']"),
+            Element.EXPAND_HEADER: css("button[title*='Expand']"),
+            Element.REPLY_SUBJECT: css("input[placeholder*='Add a subject']"),
+            Element.REPLY_BODY: css("div[aria-label*='Message body']"),
+            Element.REPLY_SEND: css("button[title*='Send']"),
+            Element.ALLOW_FILES: xpath(_ALLOW_FILES_XPATH),
+            **_OWA_ATTACHMENTS,
+            **_OWA_PHISHING,
+        },
+    ),
+    # -- Office 365 -------------------------------------------------------------
+    **_for_client(
+        EmailClient.O365,
+        {
+            Element.LOGIN_USERNAME: css("input[type='email']"),
+            Element.LOGIN_NEXT: css("input[type='submit']"),
+            Element.LOGIN_PASSWORD: css("input[type='password']"),
+            Element.LOGIN_SUBMIT: css("input[type='submit']"),
+            Element.LOGIN_STAY_SIGNED_IN: css("input[type='checkbox'][name='DontShowAgain']"),
+            Element.LOGIN_COMPLETE: xpath("//span[contains(text(), 'Outlook')]"),
+            Element.ACCOUNT_MENU: css("#O365_UniversalMeContainer button#mectrl_main_trigger"),
+            Element.LOGOUT: css("#mectrl_main_body a#mectrl_body_signOut"),
+            Element.UNREAD_FILTER: css("button[aria-label='Unread']"),
+            Element.FILTER_MENU: css("button[aria-label='Filter']"),
+            Element.FILTER_UNREAD_OPTION: css("div[role='menuitemradio'][title='Unread']"),
+            Element.UNREAD_EMAILS: css("#MailList div[data-focusable-row='true']"),
+            Element.EMAIL_ROW_SUBJECT: xpath(".//div[2]//span[@title='']"),
+            Element.EMAIL_BY_SUBJECT: xpath("//span[contains(@title, '{subject}')]"),
+            Element.SPECIFIC_EMAIL: xpath("//span[contains(text(), '{subject}')]"),
+            Element.NEW_MESSAGE: css("button[aria-label*='New mail']"),
+            Element.TO_INPUT: xpath("//div[contains(text(), 'To')]"),
+            Element.RECIPIENT: css("div[role='listitem'] span[data-lpc-hover-target-id]"),
+            Element.SUBJECT_INPUT: css("input[aria-label='Subject']"),
+            Element.BODY_INPUT: css("div[aria-label='Message body']"),
+            Element.SEND: css("button[aria-label='Send']"),
+            Element.REPLY: css("div[aria-label*='Reply all']"),
+            Element.EXPAND_HEADER: css("button[aria-label*='Expand header']"),
+            Element.REPLY_SUBJECT: css("input[placeholder*='Add a subject']"),
+            Element.REPLY_BODY: css("div[aria-label*='Message body']"),
+            Element.REPLY_SEND: css("button[title*='Send']"),
+            Element.ALLOW_FILES: xpath(_ALLOW_FILES_XPATH),
+            **_OWA_ATTACHMENTS,
+            **_PHISHING,
+        },
+    ),
+    # -- Roundcube --------------------------------------------------------------
+    **_for_client(
+        EmailClient.ROUNDCUBE,
+        {
+            Element.LOGIN_USERNAME: css("input[name='_user']"),
+            Element.LOGIN_PASSWORD: css("input[name='_pass']"),
+            Element.LOGIN_SUBMIT: css("button#rcmloginsubmit"),
+            Element.LOGOUT: xpath("//span[contains(text(), 'Logout')]"),
+            Element.UNREAD_EMAILS: css("tr[class*='unread']"),
+            Element.EMAIL_ROW_SUBJECT: css("td.subject a"),
+            Element.EMAIL_BY_SUBJECT: xpath("//td[contains(@class, 'subject')]//a[contains(text(), '{subject}')]"),
+            Element.SPECIFIC_EMAIL: xpath("//span[contains(text(), '{subject}')]"),
+            Element.NEW_MESSAGE: css("a[title='Create a new message']"),
+            Element.TO_INPUT: css("input[aria-label*='To']"),
+            Element.RECIPIENT: css("ul.recipient-input li.recipient"),
+            Element.SUBJECT_INPUT: css("input[name='_subject']"),
+            Element.BODY_INPUT: css("div[aria-label*='Message body']"),
+            Element.SEND: css("button[title*='Send']"),
+            Element.REPLY: css("a[title='Reply to sender']"),
+            Element.REPLY_SUBJECT: css("input[name='_subject']"),
+            Element.REPLY_BODY: css("textarea[name='_message']"),
+            Element.REPLY_SEND: xpath("//button[contains(text(), 'Send')]"),
+            Element.ATTACHMENTS: css("ul[class*='attachmentslist'] > li > a[class*='filename']"),
+            Element.ATTACHMENT_NAME: css("span[class='attachment-name']"),
+            **_PHISHING,
+        },
+    ),
+}
+
+
+def get_selector(client: EmailClient, element: Element) -> Selector:
+    try:
+        return LOCATORS[(client, element)]
+    except KeyError:
+        raise KeyError(f"No locator registered for {element.value!r} on {client.value!r}") from None
+
+
+# -- statistics ---------------------------------------------------------------
+
+# Sentinel passed to ``LocatorStatistics.record`` when the primary locator matched.
+_PRIMARY: Locator = ("", "")
+
+
+@dataclass(slots=True)
+class LocatorStat:
+    hits: int = 0
+    misses: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    fallback_hits: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.hits if self.hits else 0.0
+
+    @property
+    def fallback_count(self) -> int:
+        return sum(self.fallback_hits.values())
+
+
+class LocatorStatistics:
+    """Thread-safe hit latency and fallback usage per ``(client, element)``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: dict[str, LocatorStat] = {}
+
+    def record(self, key: str, elapsed: float, matched: Optional[Locator]) -> None:
+        with self._lock:
+            stat = self._stats.setdefault(key, LocatorStat())
+            if matched is None:
+                stat.misses += 1
+                return
+
+            stat.hits += 1
+            stat.total_time += elapsed
+            stat.max_time = max(stat.max_time, elapsed)
+            if matched is not _PRIMARY:
+                label = f"{matched[0]}={matched[1]}"
+                stat.fallback_hits[label] = stat.fallback_hits.get(label, 0) + 1
+
+    def snapshot(self) -> dict[str, LocatorStat]:
+        with self._lock:
+            return {key: replace(stat, fallback_hits=dict(stat.fallback_hits)) for key, stat in self._stats.items()}
+
+    def slowest(self, limit: int = 10) -> list[tuple[str, LocatorStat]]:
+        """Keys ordered by mean hit latency, slowest first."""
+        return sorted(self.snapshot().items(), key=lambda item: item[1].mean_time, reverse=True)[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+locator_statistics = LocatorStatistics()
+
+
+def _key(client: EmailClient, element: Element) -> str:
+    return f"{client.value}.{element.value}"
+
+
+# -- lookups ------------------------------------------------------------------
+
+
+def _find(
+    driver: SeleniumDriver,
+    client: EmailClient,
+    element: Element,
+    condition: ElementCondition,
+    timeout: float,
+    all_elements: bool,
+    params: dict[str, str],
+):
+    primary, *fallbacks = get_selector(client, element).render(**params)
+    wait_for = driver.wait_for_elements if all_elements else driver.wait_for_element
+    key = _key(client, element)
+    start_time = time.monotonic()
+
+    try:
+        value = wait_for(primary, timeout, condition)
+        locator_statistics.record(key, time.monotonic() - start_time, _PRIMARY)
+        return value
+    except TimeoutException:
+        if not fallbacks:
+            locator_statistics.record(key, time.monotonic() - start_time, None)
+            raise
+
+    for locator in fallbacks:
+        try:
+            value = wait_for(locator, FALLBACK_TIMEOUT, condition)
+            locator_statistics.record(key, time.monotonic() - start_time, locator)
+            return value
+        except TimeoutException:
+            continue
+
+    locator_statistics.record(key, time.monotonic() - start_time, None)
+    raise TimeoutException(f"No locator for {key} matched within {timeout}s")
+
+
+def find(
+    driver: SeleniumDriver,
+    client: EmailClient,
+    element: Element,
+    condition: ElementCondition = ElementCondition.PRESENT,
+    timeout: float = DEFAULT_TIMEOUT,
+    **params: str,
+) -> WebElement:
+    """Wait for the registered *element* of *client* and return it."""
+    return _find(driver, client, element, condition, timeout, False, params)
+
+
+def find_all(
+    driver: SeleniumDriver,
+    client: EmailClient,
+    element: Element,
+    condition: ElementCondition = ElementCondition.PRESENT,
+    timeout: float = DEFAULT_TIMEOUT,
+    **params: str,
+) -> list[WebElement]:
+    """Wait for at least one registered *element* of *client* and return all matches."""
+    return _find(driver, client, element, condition, timeout, True, params)
+
+
+def find_within(parent: WebElement, client: EmailClient, element: Element, **params: str) -> WebElement:
+    """Immediate lookup of *element* relative to *parent* (e.g. a row of the mail list)."""
+    primary, *fallbacks = get_selector(client, element).render(**params)
+    key = _key(client, element)
+    start_time = time.monotonic()
+
+    for locator in (primary, *fallbacks):
+        try:
+            value = parent.find_element(*locator)
+        except NoSuchElementException:
+            continue
+        locator_statistics.record(key, time.monotonic() - start_time, _PRIMARY if locator is primary else locator)
+        return value
+
+    locator_statistics.record(key, time.monotonic() - start_time, None)
+    raise NoSuchElementException(f"No locator for {key} matched within parent element")
+
+
+def find_present(driver: SeleniumDriver, client: EmailClient, element: Element, **params: str) -> list[WebElement]:
+    """Immediate matches of *element* on the page, from the first locator that matches any; ``[]`` without waiting.
+
+    For elements that may legitimately be absent, so it records no statistics.
+    """
+    for locator in get_selector(client, element).render(**params):
+        matches = driver.driver.find_elements(*locator)
+        if matches:
+            return matches
+    return []
@@ -0,0 +1,282 @@
+"""Browser-side element waits built on ``MutationObserver``.
+
+Instead of polling ``find_element`` over WebDriver HTTP, the condition is
+evaluated inside the page: a ``MutationObserver`` is installed through
+``execute_async_script`` and resolves as soon as the XPath/CSS condition
+becomes true.  A wait therefore costs a single round trip in the common case
+and detection latency drops to the page's own event latency.
+
+To stay cooperative with :class:`CancellableThreadPoolExecutor`, long waits
+are split into slices of ``OBSERVER_SLICE`` seconds with a cancellation check
+between them.
+
+If the driver cannot run the script (or the locator strategy cannot be
+expressed as XPath/CSS), the wait falls back to
+:class:`CancellableWebDriverWait` polling with the equivalent expected
+condition.  A script interrupted by a navigation (``document unloaded while
+waiting for result``) is simply re-run in the next slice; any other script
+error falls back to polling for that one wait, and only a driver that cannot
+run async scripts at all is switched to polling for good.
+
+Multi-element waits mean the same on both paths: at least one element
+matches, and the matching ones (e.g. the visible subset) are returned.
+
+Usage::
+
+    element = ObserverWait(driver, 5).until_element((By.XPATH, "//input[@name='_user']"))
+    rows = ObserverWait(driver, 5).until_elements((By.CSS_SELECTOR, "tr.unread"))
+"""
+
+import time
+import weakref
+from enum import Enum
+from typing import Optional
+
+from selenium.common.exceptions import (
+    JavascriptException,
+    StaleElementReferenceException,
+    TimeoutException,
+    UnknownMethodException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support import expected_conditions as EC
+
+from lib.cancellable_futures import check as _check
+from lib.cancellable_futures import sleep as _sleep
+from lib.selenium.cancellable_wait import (
+    POLL_FREQUENCY,
+    CancellableWebDriverWait,
+    PollSchedule,
+    _in_executor,
+    describe_condition,
+    wait_statistics,
+)
+from lib.tracing import span
+
+OBSERVER_SLICE: float = 1.0
+SCRIPT_TIMEOUT_MARGIN: float = 5.0
+
+# Script errors raised when the page navigates away while the observer runs
+PAGE_CHANGE_ERRORS: tuple[str, ...] = ("document unloaded", "navigated", "context was discarded", "page load")
+# Script errors meaning the driver cannot run the observer at all
+UNSUPPORTED_ERRORS: tuple[str, ...] = ("not supported", "unsupported", "mutationobserver is not defined")
+
+Locator = tuple[str, str]
+
+
+class ElementCondition(Enum):
+    PRESENT = "present"
+    VISIBLE = "visible"
+    CLICKABLE = "clickable"
+
+
+_OBSERVER_SCRIPT = """
+var query = arguments[0], selector = arguments[1], condition = arguments[2], all = arguments[3],
+    timeout = arguments[4], done = arguments[arguments.length - 1];
+
+function visible(el) {
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none' && el.getClientRects().length > 0;
+}
+
+function matches(el) {
+    if (condition === 'present') return true;
+    if (!visible(el)) return false;
+    return condition !== 'clickable' || !el.disabled;
+}
+
+function find() {
+    var nodes = [];
+    if (query === 'xpath') {
+        var result = document.evaluate(selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (var i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+    } else {
+        nodes = Array.prototype.slice.call(document.querySelectorAll(selector));
+    }
+    nodes = nodes.filter(matches);
+    if (all) return nodes.length ? nodes : null;
+    return nodes.length ? nodes[0] : null;
+}
+
+var hit = find();
+if (hit) { done(hit); return; }
+
+var finished = false, timer = null;
+var observer = new MutationObserver(function () {
+    if (finished) return;
+    var match = find();
+    if (match) finish(match);
+});
+
+function finish(value) {
+    finished = true;
+    observer.disconnect();
+    if (timer !== null) clearTimeout(timer);
+    done(value);
+}
+
+observer.observe(document, {childList: true, subtree: true, attributes: true});
+timer = setTimeout(function () { finish(null); }, timeout);
+"""
+
+_unsupported_drivers: "weakref.WeakSet" = weakref.WeakSet()
+_configured_drivers: "weakref.WeakSet" = weakref.WeakSet()
+
+
+def to_query(locator: Locator) -> Optional[tuple[str, str]]:
+    """Translate a Selenium locator to an in-page ``("xpath" | "css", selector)`` query."""
+    by, value = locator
+    if by == By.XPATH:
+        return "xpath", value
+    if by == By.CSS_SELECTOR:
+        return "css", value
+    if by == By.ID:
+        return "css", f'[id="{value}"]'
+    if by == By.NAME:
+        return "css", f'[name="{value}"]'
+    if by == By.CLASS_NAME:
+        return "css", f".{value}"
+    if by == By.TAG_NAME:
+        return "css", value
+    return None
+
+
+def _error_matches(ex: Exception, fragments: tuple[str, ...]) -> bool:
+    text = (getattr(ex, "msg", None) or str(ex)).lower()
+    return any(fragment in text for fragment in fragments)
+
+
+def matching_elements_located(locator: Locator, clickable: bool = False):
+    """Polling counterpart of the in-page multi-element query: the visible (and enabled) matches, if any."""
+
+    def _predicate(driver):
+        try:
+            elements = [
+                element
+                for element in driver.find_elements(*locator)
+                if element.is_displayed() and (not clickable or element.is_enabled())
+            ]
+        except StaleElementReferenceException:
+            return False
+        return elements or False
+
+    return _predicate
+
+
+def _expected_condition(locator: Locator, condition: ElementCondition, all_elements: bool):
+    if all_elements:
+        if condition == ElementCondition.PRESENT:
+            return EC.presence_of_all_elements_located(locator)
+        return matching_elements_located(locator, clickable=condition == ElementCondition.CLICKABLE)
+    if condition == ElementCondition.CLICKABLE:
+        return EC.element_to_be_clickable(locator)
+    if condition == ElementCondition.VISIBLE:
+        return EC.visibility_of_element_located(locator)
+    return EC.presence_of_element_located(locator)
+
+
+class ObserverWait:
+    """Single-round-trip element wait with a polling fallback."""
+
+    def __init__(self, driver, timeout: float, poll_schedule: Optional[PollSchedule] = None):
+        self._driver = driver
+        self._timeout = timeout
+        self._poll_schedule = poll_schedule
+
+    def until_element(
+        self,
+        locator: Locator,
+        condition: ElementCondition = ElementCondition.PRESENT,
+        message: str = "",
+    ) -> WebElement:
+        return self._until(locator, condition, False, message)
+
+    def until_elements(
+        self,
+        locator: Locator,
+        condition: ElementCondition = ElementCondition.PRESENT,
+        message: str = "",
+    ) -> list[WebElement]:
+        return self._until(locator, condition, True, message)
+
+    def _until(self, locator: Locator, condition: ElementCondition, all_elements: bool, message: str):
+        expected = _expected_condition(locator, condition, all_elements)
+        label = describe_condition(expected)
+        query = to_query(locator)
+
+        if query is None or self._driver in _unsupported_drivers:
+            return self._poll(expected, message, label, self._timeout)
+
+        end_time = time.monotonic() + self._timeout
+        try:
+            with span("wait.observe", label=label):
+                return self._observe(query, condition, all_elements, message, label)
+        except UnknownMethodException:
+            _unsupported_drivers.add(self._driver)
+        except JavascriptException as ex:
+            if _error_matches(ex, UNSUPPORTED_ERRORS):
+                _unsupported_drivers.add(self._driver)
+        # Polling gets what is left of the timeout, not a fresh one
+        return self._poll(expected, message, label, max(0.0, end_time - time.monotonic()))
+
+    def _poll(self, expected, message: str, label: str, timeout: float):
+        wait = CancellableWebDriverWait(self._driver, timeout, poll_schedule=self._poll_schedule)
+        return wait.until(expected, message, label=label)
+
+    def _configure_script_timeout(self) -> None:
+        if self._driver in _configured_drivers:
+            return
+        self._driver.set_script_timeout(OBSERVER_SLICE + SCRIPT_TIMEOUT_MARGIN)
+        _configured_drivers.add(self._driver)
+
+    def _observe(
+        self,
+        query: tuple[str, str],
+        condition: ElementCondition,
+        all_elements: bool,
+        message: str,
+        label: str,
+    ):
+        cancellable = _in_executor()
+        self._configure_script_timeout()
+
+        start_time = time.monotonic()
+        end_time = start_time + self._timeout
+        label = f"observer:{label}"
+        slices = 0
+
+        while True:
+            if cancellable:
+                _check()
+
+            remaining = end_time - time.monotonic()
+            slice_ms = int(max(0.0, min(OBSERVER_SLICE, remaining)) * 1000)
+            slices += 1
+
+            try:
+                value = self._driver.execute_async_script(
+                    _OBSERVER_SCRIPT, query[0], query[1], condition.value, all_elements, slice_ms
+                )
+            except TimeoutException:
+                value = None
+            except JavascriptException as ex:
+                if not _error_matches(ex, PAGE_CHANGE_ERRORS):
+                    raise
+                # The page navigated mid-wait; give the new document a poll interval before observing it
+                value = None
+                delay = min(POLL_FREQUENCY, max(0.0, end_time - time.monotonic()))
+                if cancellable:
+                    _sleep(delay, traced=False)
+                else:
+                    time.sleep(delay)
+
+            if value:
+                wait_statistics.record(label, time.monotonic() - start_time, slices, True)
+                return value
+
+            if time.monotonic() >= end_time:
+                break
+
+        wait_statistics.record(label, time.monotonic() - start_time, slices, False)
+        raise TimeoutException(message)
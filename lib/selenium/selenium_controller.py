@@ -2,7 +2,6 @@ import platform
 import random
 from typing import Optional
 
-import pyautogui as pag
 import selenium.webdriver as webdriver
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.common.by import By
@@ -11,13 +10,16 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.select import Select
 
 from behaviour.models.exceptions import BehaviourException
+from lib.autogui import press, write
 from lib.cancellable_futures import sleep
 from lib.selenium.email_web_client import (
     BaseEmailWebClient,
     EmailClientUser,
     getEmailClient,
 )
+from lib.selenium.locators import Element
 from lib.selenium.models import EmailClient
+from lib.selenium.observer_wait import ElementCondition
 from lib.selenium.selenium_driver import SeleniumDriver
 from lib.selenium.types import DriverType
 from src.logger import app_logger
@@ -52,31 +54,15 @@ class SeleniumController(SeleniumDriver):
             - Opened roundcube phishing login page
         """
         try:
-            # Click on subject input field and copy and paste new subject
-            if self.email_client == "owa":
-                self.wait(5).until(
-                    EC.presence_of_element_located((By.XPATH, "//input[contains(@name,'email')]"))
-                ).click()
-            else:
-                self.wait(5).until(EC.presence_of_element_located((By.XPATH, "//input[@name='email']"))).click()
+            self.email_client.locate(Element.PHISHING_EMAIL).click()
             sleep(0.5)
-            pag.write(email, 0.1)
+            write(email, 0.1)
             sleep(0.5)
-            if self.email_client == "owa":
-                self.wait(5).until(
-                    EC.presence_of_element_located((By.XPATH, "//input[contains(@name,'password')]"))
-                ).click()
-            else:
-                self.wait(5).until(EC.presence_of_element_located((By.XPATH, "//input[@name='password']"))).click()
+            self.email_client.locate(Element.PHISHING_PASSWORD).click()
             sleep(0.5)
-            pag.write(password, 0.1)
+            write(password, 0.1)
             sleep(0.5)
-            if self.email_client == "owa":
-                self.wait(5).until(
-                    EC.presence_of_element_located((By.XPATH, "//button[contains(@id,'rcmloginsubmit')]"))
-                ).click()
-            else:
-                self.wait(5).until(EC.presence_of_element_located((By.XPATH, "//div[@class='signinbutton']"))).click()
+            self.email_client.locate(Element.PHISHING_SUBMIT).click()
 
         except Exception as ex:
             raise BehaviourException("Error entering credentials into phishing web", ex)
@@ -89,8 +75,8 @@ class SeleniumController(SeleniumDriver):
         """
         # TODO: Implement OWA
         try:
-            if self.email_client == "owa":
-                self.wait(5).until(EC.element_to_be_clickable((By.XPATH, "//span[contains(text(), 'Logout')]"))).click()
+            if self.email_client.type == EmailClient.OWA:
+                self.email_client.locate(Element.LOGOUT, ElementCondition.CLICKABLE).click()
                 sleep(1.5)
 
         except Exception as ex:
@@ -220,7 +206,7 @@ class SeleniumController(SeleniumDriver):
 
             timer = 0
             while timer < duration:
-                pag.press("pgdn")
+                press("pgdn")
                 sleep_time = random.randint(3, 6)
                 sleep(sleep_time)
                 timer += sleep_time
@@ -245,7 +231,7 @@ class SeleniumController(SeleniumDriver):
             timer = 0
             while timer < duration:
                 if scroll_count >= min_scroll_count:
-                    pag.press("home")
+                    press("home")
                     nav_links = self.wait(5).until(
                         EC.presence_of_all_elements_located(
                             (By.XPATH, "//a[contains(@class, 'govuk-link idsk-header-web__nav-list-item-link')]")
@@ -254,7 +240,7 @@ class SeleniumController(SeleniumDriver):
                     self.wait(5).until(EC.element_to_be_clickable(random.choice(nav_links))).click()
                     scroll_count = 0
 
-                pag.press("pgdn")
+                press("pgdn")
                 scroll_count += 1
 
                 sleep_time = random.randint(3, 6)
@@ -273,11 +259,11 @@ class SeleniumController(SeleniumDriver):
         try:
             self.wait(5).until(EC.presence_of_element_located((By.XPATH, "//input[@name='email']"))).click()
             sleep(0.5)
-            pag.write(email, 0.1)
+            write(email, 0.1)
             sleep(0.5)
             self.wait(5).until(EC.presence_of_element_located((By.XPATH, "//input[@name='password']"))).click()
             sleep(0.5)
-            pag.write(password, 0.1)
+            write(password, 0.1)
             sleep(0.5)
             self.wait(5).until(EC.presence_of_element_located((By.XPATH, "//div[@class='signinbutton']"))).click()
 
@@ -296,14 +282,7 @@ class SeleniumController(SeleniumDriver):
 
             email_attachments = self.email_client_get_email_attachments()
             for attachment in email_attachments:
-                attachment_name_element = None
-                if self.email_client == "owa":
-                    attachment_name_element = attachment.find_element(
-                        By.XPATH, "//span[contains(@class, '_ay_x ms-font-m')]"
-                    )
-                else:
-                    attachment_name_element = attachment.find_element(By.XPATH, "//span[@class='attachment-name']")
-
+                attachment_name_element = self.email_client.locate_within(attachment, Element.ATTACHMENT_NAME)
                 downloaded_attachments.append(attachment_name_element.text)
                 attachment.click()
                 sleep(5)
@@ -321,20 +300,7 @@ class SeleniumController(SeleniumDriver):
             - Opened email
         """
         try:
-            attachments = []
-            if self.email_client == "owa":
-                attachments = self.wait(5).until(
-                    EC.presence_of_all_elements_located(
-                        (By.XPATH, "//div[contains(@class, 'attachmentWell')]//a[contains(@class, 'o365button')]")
-                    )
-                )
-            else:
-                attachments = self.wait(5).until(
-                    EC.presence_of_all_elements_located(
-                        (By.XPATH, "//ul[contains(@class, 'attachmentslist')]/li/a[contains(@class, 'filename')]")
-                    )
-                )
-            return attachments
+            return self.email_client.locate_all(Element.ATTACHMENTS)
         except TimeoutException:
             return []
         except Exception as ex:
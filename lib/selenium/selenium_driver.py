@@ -6,12 +6,14 @@ from selenium.webdriver.remote.webelement import WebElement
 from consts.timeout import DEFAULT_TIMEOUT
 from lib.cancellable_futures import check as cancellable_check
 from lib.cancellable_futures import sleep
-from lib.selenium.cancellable_wait import CancellableWebDriverWait
+from lib.selenium.cancellable_wait import CancellableWebDriverWait, PollSchedule
+from lib.selenium.command_profiler import instrument
+from lib.selenium.observer_wait import ElementCondition, Locator, ObserverWait
 
 
 class SeleniumDriver:
     def __init__(self, driver: (webdriver.Firefox | webdriver.Edge)):
-        self.driver: webdriver.Firefox | webdriver.Edge = driver
+        self.driver: webdriver.Firefox | webdriver.Edge = instrument(driver)
 
     def check_cancellation(self) -> None:
         try:
@@ -27,8 +29,26 @@ class SeleniumDriver:
     def quit_driver(self):
         self.driver.quit()
 
-    def wait(self, timeout: float = DEFAULT_TIMEOUT):
-        return CancellableWebDriverWait(self.driver, timeout)
+    def wait(self, timeout: float = DEFAULT_TIMEOUT, poll_schedule: PollSchedule | None = None):
+        return CancellableWebDriverWait(self.driver, timeout, poll_schedule=poll_schedule)
+
+    def wait_for_element(
+        self,
+        locator: Locator,
+        timeout: float = DEFAULT_TIMEOUT,
+        condition: ElementCondition = ElementCondition.PRESENT,
+    ) -> WebElement:
+        """Wait in the page (MutationObserver) for *locator* to satisfy *condition*."""
+        return ObserverWait(self.driver, timeout).until_element(locator, condition)
+
+    def wait_for_elements(
+        self,
+        locator: Locator,
+        timeout: float = DEFAULT_TIMEOUT,
+        condition: ElementCondition = ElementCondition.PRESENT,
+    ) -> list[WebElement]:
+        """Wait in the page (MutationObserver) for at least one element matching *locator*."""
+        return ObserverWait(self.driver, timeout).until_elements(locator, condition)
 
     def find_element(self, *args, **kwargs) -> WebElement:
         self.check_cancellation()
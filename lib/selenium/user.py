@@ -1,10 +1,11 @@
-from typing import Mapping
+from typing import Mapping, Union
 
 from lib.selenium.models import EmailClient, EmailClientUser
+from src.config.snapshot import UserSettings
 
 
 def build_email_client_user(
-    user: Mapping[str, str],
+    user: Union[Mapping[str, str], UserSettings],
     email_client_type: EmailClient,
     force_external_credentials: bool = False,
 ) -> EmailClientUser:
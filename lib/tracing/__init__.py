@@ -0,0 +1,287 @@
+"""Lightweight run-scoped timing spans.
+
+Spans measure how long a step takes and form a tree per behaviour run: the
+root span is opened by ``BaseBehaviour.run`` and every span started below it
+(in the behaviour thread or in pool tasks) inherits its trace id and
+behaviour id.  Pool tasks also set the *step* (the task name), inherited the
+same way by everything they call.  Finished spans go to a bounded ring buffer and, optionally,
+to exporters (JSON lines in a plain or OpenTelemetry-compatible layout).
+
+Spans are emitted automatically around ``pool.submit`` tasks, ``pool.sleep``,
+``CancellableWebDriverWait.until``, ``locate_image_center`` and cleanup
+tasks.  Custom steps can be wrapped explicitly::
+
+    from lib.tracing import span, traced
+
+    with span("login", client="owa"):
+        ...
+
+    @traced("parse_emails")
+    def parse(): ...
+
+    tracer.summarize(trace_id)   # {"task:login": (1, 3.2), ...}
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Optional, Protocol, TypedDict
+
+from lib.cancellable_futures.exceptions import OperationCancelled
+
+DEFAULT_BUFFER_SIZE: int = 2048
+
+
+class TracingConfig(TypedDict, total=False):
+    enabled: bool
+    buffer_size: int
+    export_path: str
+    export_format: str  # "json" | "otel"
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    behaviour: Optional[str]
+    thread: str
+    start_time: float
+    end_time: float = 0.0
+    step: Optional[str] = None
+    status: str = "ok"
+    error: Optional[str] = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return self.end_time - self.start_time if self.end_time else 0.0
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "behaviour": self.behaviour,
+            "step": self.step,
+            "thread": self.thread,
+            "start_time": self.start_time,
+            "duration": self.duration,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+    def to_otel(self) -> dict[str, Any]:
+        """Record in the OTLP/JSON span layout."""
+        attributes = {"thread.name": self.thread, **self.attributes}
+        if self.behaviour:
+            attributes["behaviour.id"] = self.behaviour
+        if self.step:
+            attributes["behaviour.step"] = self.step
+
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "startTimeUnixNano": int(self.start_time * 1e9),
+            "endTimeUnixNano": int(self.end_time * 1e9),
+            "attributes": [{"key": key, "value": _otel_value(value)} for key, value in attributes.items()],
+            "status": {"code": 2, "message": self.error or ""} if self.status == "error" else {"code": 1},
+        }
+
+
+def _otel_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class JsonLinesExporter:
+    """Append finished spans to *path*, one JSON object per line."""
+
+    def __init__(self, path: str, otel: bool = False):
+        folder = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+        self._otel = otel
+        self._lock = threading.Lock()
+        self._stream = open(path, "a", encoding="utf-8", buffering=1)
+
+    def export(self, span: Span) -> None:
+        record = span.to_otel() if self._otel else span.to_dict()
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self._stream.write(line + "\n")
+
+    def close(self) -> None:
+        with self._lock:
+            self._stream.close()
+
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("_current_span", default=None)
+# Private generator so span ids never consume draws from the global ``random`` state.
+_rng = random.Random()
+
+
+def _new_id(width: int) -> str:
+    return f"{_rng.getrandbits(width * 4):0{width}x}"
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def set_current_span(parent: Optional[Span]) -> None:
+    """Adopt *parent* in the calling thread, used to carry spans into pool threads."""
+    _current_span.set(parent)
+
+
+class Tracer:
+    """Ring buffer of finished spans plus optional exporters."""
+
+    def __init__(self, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._buffer: deque[Span] = deque(maxlen=buffer_size)
+        self._exporters: list[SpanExporter] = []
+        # Installed by configure() and replaced by the next call; add_exporter ones are left alone
+        self._configured_exporter: Optional[SpanExporter] = None
+
+    def configure(self, config: Optional[TracingConfig]) -> None:
+        config = config or {}
+        self.enabled = config.get("enabled", True)
+
+        with self._lock:
+            self._buffer = deque(self._buffer, maxlen=config.get("buffer_size", DEFAULT_BUFFER_SIZE))
+
+        export_path = config.get("export_path")
+        exporter = JsonLinesExporter(export_path, otel=config.get("export_format") == "otel") if export_path else None
+        with self._lock:
+            previous, self._configured_exporter = self._configured_exporter, exporter
+            self._exporters = [e for e in self._exporters if e is not previous]
+            if exporter is not None:
+                self._exporters.append(exporter)
+        if previous is not None:
+            previous.close()
+
+    def add_exporter(self, exporter: SpanExporter) -> None:
+        with self._lock:
+            self._exporters.append(exporter)
+
+    def clear_exporters(self) -> None:
+        with self._lock:
+            exporters, self._exporters = self._exporters, []
+            self._configured_exporter = None
+        for exporter in exporters:
+            exporter.close()
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        if not self.enabled:
+            yield None
+            return
+
+        parent = _current_span.get()
+        current = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else _new_id(32),
+            span_id=_new_id(16),
+            parent_id=parent.span_id if parent else None,
+            behaviour=attributes.pop("behaviour", None) or (parent.behaviour if parent else None),
+            thread=threading.current_thread().name,
+            start_time=time.time(),
+            step=attributes.pop("step", None) or (parent.step if parent else None),
+            attributes=attributes,
+        )
+        start = time.perf_counter()
+        token = _current_span.set(current)
+        try:
+            yield current
+        except OperationCancelled:
+            current.status = "cancelled"
+            raise
+        except BaseException as ex:
+            current.status = "error"
+            current.error = type(ex).__name__
+            raise
+        finally:
+            _current_span.reset(token)
+            current.end_time = current.start_time + (time.perf_counter() - start)
+            self._finish(current)
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            self._buffer.append(span)
+            exporters = list(self._exporters)
+
+        for exporter in exporters:
+            try:
+                exporter.export(span)
+            except Exception:
+                pass
+
+    def spans(self, trace_id: Optional[str] = None) -> list[Span]:
+        with self._lock:
+            spans = list(self._buffer)
+        if trace_id is None:
+            return spans
+        return [s for s in spans if s.trace_id == trace_id]
+
+    def summarize(self, trace_id: Optional[str] = None) -> dict[str, tuple[int, float]]:
+        """Aggregate ``name -> (count, total_duration)``, largest total first."""
+        totals: dict[str, tuple[int, float]] = {}
+        for s in self.spans(trace_id):
+            count, total = totals.get(s.name, (0, 0.0))
+            totals[s.name] = (count + 1, total + s.duration)
+        return dict(sorted(totals.items(), key=lambda item: item[1][1], reverse=True))
+
+
+tracer = Tracer()
+
+
+def span(name: str, **attributes: Any):
+    """Module-level shortcut for ``tracer.span()``."""
+    return tracer.span(name, **attributes)
+
+
+def traced(name: Optional[str] = None, **attributes: Any) -> Callable:
+    """Decorator wrapping every call of the function in a span."""
+
+    def decorator(fn):
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with tracer.span(span_name, **attributes):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
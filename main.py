@@ -9,11 +9,6 @@ import sys
 if __name__ == "__main__":
     multiprocessing.freeze_support()
 
-from app_config import app_config
-from behaviour.registry import validate_behaviour_registry
-from src.gui.system_tray import SystemTrayApp
-from user_automation_manager import UserAutomationManager
-
 if len(sys.argv) > 2 and sys.argv[2].lower() not in os.getlogin().lower():
     os._exit(0)
 
@@ -23,10 +18,28 @@ config_file = os.path.join(parent_dir, "config.yml")
 
 
 def main():
+    # Imported here: supervisor workers are spawned, and spawning re-imports this module (as __mp_main__)
+    # in every worker, which must not pull in Qt and the server connection
+    from app_config import config_store
+    from behaviour.registry import validate_behaviour_registry
+    from lib.instance import instance
+    from src.gui.system_tray import SystemTrayApp
+    from user_automation_manager import UserAutomationManager
+    from worker import configure_runtime
+
+    config = config_store.source()
+    control = config.get("control") or {}
+    if control.get("single_instance", True) and not instance.acquire():
+        print(f"User automation client already runs in this session (pid {instance.owner_pid()})", file=sys.stderr)
+        sys.exit(0)
+
     validate_behaviour_registry()
+    configure_runtime(config)
 
-    user_automation_manager = UserAutomationManager(app_config)
+    user_automation_manager = UserAutomationManager(config)
     tray_app = SystemTrayApp(user_automation_manager)
+    if control.get("enabled", True):
+        instance.serve(user_automation_manager.handle_control)
 
     user_automation_manager.start()
 
@@ -0,0 +1,252 @@
+"""Server-issued commands: de-duplication, scheduling, acknowledgements and an offline spool.
+
+Commands from the server may carry a ``command_id`` (or a numeric ``seq``).
+Such commands are:
+
+- de-duplicated: a command id seen before is acked as ``duplicate`` and not
+  executed again, e.g. after the server re-sends on reconnect;
+- scheduled rather than forced: ``run_behaviour`` goes through
+  ``BehaviourManager.queue_behaviour`` with the command's ``priority`` (lower
+  runs first) and ``deadline`` (unix time) or ``ttl`` (seconds), so a burst
+  of commands is worked off in order instead of each one killing the running
+  browser.  ``"preempt": true`` keeps the old stop-and-start behaviour;
+- cancellable: ``cancel_queued_behaviour`` with the ``target`` command id
+  (or a ``queue_id`` from the status update) drops it while it still waits;
+- acknowledged: ``received`` → ``queued`` → ``started`` (or ``expired`` /
+  ``cancelled`` / ``rejected``), or ``applied`` for config updates.  Acks are batched into
+  ``{"type": "command_ack", "acks": [...]}`` messages.
+
+Queued commands, unsent acks and recently seen ids are kept in a small JSON
+spool file, rewritten atomically on every change.  Work accepted before a
+disconnect or restart is still executed, and the acks reach the server once
+it is reachable again.  Commands without an id are executed as before and are
+not acked.
+
+Usage::
+
+    commands = ServerCommands(behaviour_manager)
+    if commands.accept(message):        # False for duplicates
+        commands.schedule_behaviour(message)
+    ...
+    commands.flush_acks(websocket.send)
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from behaviour.behaviour_queue import DequeueReason, QueuedBehaviour
+from behaviour_manager import BehaviourManager
+from src.logger import app_logger
+
+DEFAULT_SPOOL_PATH: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "server_commands.json")
+# Command ids remembered for de-duplication
+SEEN_HISTORY_SIZE: int = 1000
+DEFAULT_PRIORITY: int = 0
+
+
+def command_id(message: dict[str, Any]) -> Optional[str]:
+    value = message.get("command_id", message.get("seq"))
+    return None if value is None else str(value)
+
+
+def schedule_fields(message: dict[str, Any]) -> tuple[int, Optional[float]]:
+    """Priority and deadline (``ttl`` resolved against now) of *message*; ValueError names a bad field."""
+    try:
+        priority = int(message.get("priority", DEFAULT_PRIORITY))
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid priority {message.get('priority')!r}") from None
+
+    field = "deadline" if "deadline" in message else "ttl" if "ttl" in message else None
+    if field is None or message[field] is None:
+        return priority, None
+    try:
+        value = float(message[field])
+    except (TypeError, ValueError):
+        value = math.nan
+    if not math.isfinite(value) or (field == "ttl" and value < 0):
+        raise ValueError(f"invalid {field} {message[field]!r}")
+    return priority, value if field == "deadline" else time.time() + value
+
+
+def queue_id(key: str) -> str:
+    """Behaviour queue id of the server command *key*."""
+    return f"command:{key}"
+
+
+class ServerCommands:
+    def __init__(self, behaviour_manager: BehaviourManager, spool_path: Optional[str] = DEFAULT_SPOOL_PATH):
+        self.behaviour_manager = behaviour_manager
+        self.spool_path = spool_path
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._seen: OrderedDict[str, str] = OrderedDict()
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._acks: list[dict[str, Any]] = []
+        self._load()
+
+    # -- spool ---------------------------------------------------------------
+
+    def _load(self) -> None:
+        if not self.spool_path or not os.path.exists(self.spool_path):
+            return
+        try:
+            with open(self.spool_path, encoding="utf-8") as f:
+                spool = json.load(f)
+        except (OSError, ValueError) as e:
+            app_logger.warning(f"Ignoring unreadable command spool {self.spool_path}: {e}")
+            return
+
+        self._seen = OrderedDict((str(key), str(state)) for key, state in spool.get("seen", []))
+        self._acks = list(spool.get("acks", []))
+        pending = list(spool.get("pending", []))
+        if pending:
+            app_logger.info(f"Restoring {len(pending)} spooled server command(s)")
+        for message in pending:
+            self._queue(message)
+
+    def _save(self) -> None:
+        if not self.spool_path:
+            return
+        spool = {
+            "seen": list(self._seen.items()),
+            "pending": list(self._pending.values()),
+            "acks": self._acks,
+        }
+        tmp_path = f"{self.spool_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(spool, f)
+            os.replace(tmp_path, self.spool_path)
+        except OSError as e:
+            app_logger.warning(f"Could not write command spool {self.spool_path}: {e}")
+
+    # -- acks ----------------------------------------------------------------
+
+    def ack(self, message: dict[str, Any], status: str, detail: Optional[str] = None) -> None:
+        key = command_id(message)
+        if key is None:
+            return
+        with self._lock:
+            self._seen[key] = status
+            self._seen.move_to_end(key)
+            while len(self._seen) > SEEN_HISTORY_SIZE:
+                self._seen.popitem(last=False)
+
+            ack = {"command_id": key, "action": message.get("action"), "status": status, "ts": time.time()}
+            if detail:
+                ack["detail"] = detail
+            self._acks.append(ack)
+            self._save()
+
+    def flush_acks(self, send: Callable[[str], Any]) -> int:
+        """Send pending acks in one message; they stay spooled if *send* raises."""
+        with self._flush_lock:
+            with self._lock:
+                acks = list(self._acks)
+            if not acks:
+                return 0
+            # Sent outside the lock so a slow connection does not block acks from other threads
+            send(json.dumps({"type": "command_ack", "acks": acks}))
+            with self._lock:
+                del self._acks[: len(acks)]
+                self._save()
+            return len(acks)
+
+    # -- commands ------------------------------------------------------------
+
+    def accept(self, message: dict[str, Any]) -> bool:
+        """True if *message* should be executed; a repeated command id is acked as duplicate instead."""
+        key = command_id(message)
+        if key is None:
+            return True
+        with self._lock:
+            if key in self._seen or key in self._pending:
+                app_logger.info(f"Ignoring duplicate server command {key}")
+                self.ack(message, "duplicate")
+                return False
+        self.ack(message, "received")
+        return True
+
+    def schedule_behaviour(self, message: dict[str, Any]) -> bool:
+        """Queue (or, with ``preempt``, force-run) the behaviour of a ``run_behaviour`` command."""
+        behaviour_id = message.get("behaviour_id")
+        if not behaviour_id:
+            self.ack(message, "rejected", "missing behaviour_id")
+            return False
+
+        if message.get("preempt"):
+            started = self.behaviour_manager.run_behaviour(behaviour_id, force=True) is not None
+            self.ack(message, "started" if started else "rejected")
+            return started
+
+        return self._queue(message)
+
+    def _queue(self, message: dict[str, Any]) -> bool:
+        key = command_id(message)
+        try:
+            priority, deadline = schedule_fields(message)
+        except ValueError as e:
+            self.ack(message, "rejected", str(e))
+            return False
+        if deadline is not None and time.time() > deadline:
+            self.ack(message, "expired")
+            return False
+        # Spooled with the absolute deadline so a restart does not extend a ttl
+        message = {**message, "priority": priority, "deadline": deadline}
+
+        try:
+            entry = self.behaviour_manager.queue_behaviour(
+                message["behaviour_id"],
+                priority,
+                deadline,
+                source="server",
+                on_dequeue=lambda entry, reason: self._on_dequeue(message, entry, reason),
+                queue_id=None if key is None else queue_id(key),
+            )
+        except ValueError as e:
+            entry = None
+            app_logger.error(f"Could not queue server command {key}: {e}")
+        if entry is None:
+            self.ack(message, "rejected", "behaviour unavailable")
+            return False
+
+        if key is not None:
+            with self._lock:
+                self._pending[key] = message
+        self.ack(message, "queued")
+        return True
+
+    def cancel(self, message: dict[str, Any]) -> bool:
+        """Handle ``cancel_queued_behaviour``: drop the queued entry named by ``target`` or ``queue_id``."""
+        target = message.get("target")
+        target_queue_id = queue_id(str(target)) if target is not None else message.get("queue_id")
+        if not target_queue_id:
+            self.ack(message, "rejected", "missing target or queue_id")
+            return False
+
+        cancelled = self.behaviour_manager.cancel_queued_behaviour(target_queue_id)
+        if cancelled:
+            self.ack(message, "applied")
+        else:
+            self.ack(message, "rejected", f"{target_queue_id} is not queued")
+        return cancelled
+
+    def _on_dequeue(self, message: dict[str, Any], entry: QueuedBehaviour, reason: DequeueReason) -> None:
+        key = command_id(message)
+        if key is not None:
+            with self._lock:
+                self._pending.pop(key, None)
+
+        if reason == DequeueReason.UNAVAILABLE:
+            self.ack(message, "rejected", f"{entry.behaviour_id} is no longer available")
+        elif reason == DequeueReason.FAILED:
+            self.ack(message, "rejected", "behaviour could not be started")
+        else:
+            self.ack(message, reason.value)
@@ -1,22 +1,108 @@
+"""YAML config load/save.
+
+Parsing uses the libyaml bindings (``CSafeLoader``/``CSafeDumper``) when
+PyYAML was built with them, else the pure-Python loader.  Parsed files are
+memoised in process, keyed by path, mtime and size, so ``config.yml`` read by
+both the logger and ``app_config.py`` at start-up is parsed once, and a reload
+of an unchanged file is a copy.  With ``disk_cache`` the parse result is also
+kept next to the file as ``<file>.cache`` (marshal, same key) for the next
+cold start; files marshal cannot represent (e.g. YAML dates) are just not
+cached.
+"""
+
+import copy
+import marshal
 import os
 import sys
-from typing import Any, cast
+import threading
+from typing import Any, Optional, cast
 
 import yaml
 
 from behaviour.ids import BehaviourId
 from src.config.models.config import AppConfig, AutomationConfig
 
+YAML_LOADER: type = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YAML_DUMPER: type = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+CACHE_SUFFIX: str = ".cache"
+# Bumped when the cache layout changes; the interpreter version is part of the key since marshal is not portable
+CACHE_FORMAT: tuple = (1, sys.version_info[:2])
 
-def load_config(config_file: str) -> AppConfig:
-    config_file = os.path.abspath(config_file)
-    with open(config_file, "r", encoding="utf-8") as stream:
+FileKey = tuple[int, int]
+
+_parsed: dict[str, tuple[FileKey, Any]] = {}
+_parsed_lock = threading.Lock()
+
+
+def _file_key(path: str) -> FileKey:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_disk_cache(path: str, key: FileKey) -> Optional[Any]:
+    try:
+        with open(path + CACHE_SUFFIX, "rb") as stream:
+            cache_format, cache_key, data = marshal.load(stream)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if cache_format != CACHE_FORMAT or tuple(cache_key) != key:
+        return None
+    return data
+
+
+def _write_disk_cache(path: str, key: FileKey, data: Any) -> None:
+    tmp_path = f"{path}{CACHE_SUFFIX}.tmp"
+    try:
+        with open(tmp_path, "wb") as stream:
+            marshal.dump((CACHE_FORMAT, key, data), stream)
+        os.replace(tmp_path, path + CACHE_SUFFIX)
+    except (OSError, ValueError):
+        # Read-only install dir, or values marshal cannot store; the cache is optional
         try:
-            config = yaml.safe_load(stream) or {}
-            return cast(AppConfig, config)
-        except yaml.YAMLError as ex:
-            print(f"Error reading configuration from '{config_file}': {ex}")
-            sys.exit(1)
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def load_yaml(path: str, disk_cache: bool = True, loader: type = YAML_LOADER) -> Any:
+    """Parsed content of the YAML file at *path*; callers get their own copy and may mutate it."""
+    path = os.path.abspath(path)
+    key = _file_key(path)
+
+    with _parsed_lock:
+        cached = _parsed.get(path)
+    if cached is not None and cached[0] == key:
+        return copy.deepcopy(cached[1])
+
+    data = _read_disk_cache(path, key) if disk_cache else None
+    if data is None:
+        with open(path, "r", encoding="utf-8") as stream:
+            data = yaml.load(stream, Loader=loader)
+        if disk_cache:
+            _write_disk_cache(path, key, data)
+
+    with _parsed_lock:
+        _parsed[path] = (key, data)
+    return copy.deepcopy(data)
+
+
+def clear_config_cache(path: Optional[str] = None) -> None:
+    """Forget memoised parses (of *path* only, if given); ``<file>.cache`` files are left alone."""
+    with _parsed_lock:
+        if path is None:
+            _parsed.clear()
+        else:
+            _parsed.pop(os.path.abspath(path), None)
+
+
+def load_config(config_file: str, disk_cache: bool = True) -> AppConfig:
+    config_file = os.path.abspath(config_file)
+    try:
+        config = load_yaml(config_file, disk_cache) or {}
+        return cast(AppConfig, config)
+    except yaml.YAMLError as ex:
+        print(f"Error reading configuration from '{config_file}': {ex}")
+        sys.exit(1)
 
 
 def save_config(path: str, config: dict[str, Any]) -> None:
@@ -26,11 +112,18 @@ def save_config(path: str, config: dict[str, Any]) -> None:
     config_file = os.path.abspath(path)
     with open(config_file, "w", encoding="utf-8") as stream:
         try:
-            yaml.dump(config, stream, default_flow_style=False)
+            yaml.dump(config, stream, Dumper=YAML_DUMPER, default_flow_style=False)
         except yaml.YAMLError as ex:
             print(f"Error writing configuration to '{config_file}': {ex}")
             sys.exit(1)
 
+    # What was just written is what the next load would parse
+    key = _file_key(config_file)
+    data = copy.deepcopy(config)
+    with _parsed_lock:
+        _parsed[config_file] = (key, data)
+    _write_disk_cache(config_file, key, data)
+
 
 def get_automation_config(config: AppConfig) -> AutomationConfig:
     automation_config = cast(AutomationConfig, config.setdefault("automation", {}))
@@ -1,7 +1,12 @@
 from typing import NotRequired, TypedDict
 
 from behaviour.ids import BehaviourId
+from lib.clock import ClockConfig
+from lib.instance import ControlConfig
+from lib.replay import ReplayConfig
 from lib.selenium.models import EmailClient
+from lib.tracing import TracingConfig
+from src.log_queue import LogQueueConfig
 
 
 class User(TypedDict):
@@ -11,8 +16,31 @@ class User(TypedDict):
     external_password: str
 
 
+class WorkingHoursWindow(TypedDict):
+    start: str  # "HH:MM", local time
+    end: str
+    # Per-window weight overrides, e.g. more email in the morning
+    weights: NotRequired[dict[BehaviourId, float]]
+
+
+class WorkingHours(TypedDict, total=False):
+    days: list[int]  # 0 = Monday
+    windows: list[WorkingHoursWindow]
+
+
 class IdleCycle(TypedDict):
+    # Chance of picking procrastination next; negative disables the override
     procrastination_chance: float
+    scheduler: NotRequired[str]  # "uniform" | "weighted"
+    history_size: NotRequired[int]
+    weights: NotRequired[dict[BehaviourId, float]]
+    working_hours: NotRequired[WorkingHours]
+    # Expected run time in seconds, a behaviour is not started if it would overrun the window
+    expected_durations: NotRequired[dict[BehaviourId, float]]
+    # Seconds of run time per behaviour per day
+    daily_budgets: NotRequired[dict[BehaviourId, float]]
+    # Minimum seconds between two starts of the same behaviour
+    cooldowns: NotRequired[dict[BehaviourId, float]]
 
 
 class General(TypedDict):
@@ -24,6 +52,8 @@ class General(TypedDict):
     organization_mail_server_url: str
     organization_web_url: str
     archive_path: str
+    # Receiver address -> display name for {{ receiver_name }}
+    address_book: NotRequired[dict[str, str]]
 
 
 class AttackRansomware(TypedDict):
@@ -66,6 +96,62 @@ class App(TypedDict):
     server_max_reconnect_delay: int
 
 
+class ProfilerConfig(TypedDict, total=False):
+    enabled: bool
+    # WebDriver command budgets keyed by "<behaviour>" or "<behaviour>:<step>"
+    budgets: dict[str, int]
+
+
+class StatsConfig(TypedDict, total=False):
+    enabled: bool
+    path: str
+    # Appended run records before the stats file is compacted into snapshots
+    compact_after: int
+
+
+class EventsConfig(TypedDict, total=False):
+    enabled: bool
+    # Events held in memory before they are spilled to disk
+    buffer_size: int
+    # Events per websocket message
+    batch_size: int
+    spool_path: str
+    # Events kept on disk while offline; the oldest are dropped beyond this
+    max_spooled_events: int
+
+
+class WatchdogConfig(TypedDict, total=False):
+    enabled: bool
+    # Seconds between periodic samples
+    interval: float
+    # Limits that trigger a restart between behaviours; unset limits are not checked
+    max_rss_mb: float
+    max_threads: int
+    max_handles: int
+    max_browser_processes: int
+
+
+class SupervisorConfig(TypedDict, total=False):
+    enabled: bool
+    # Files and directories (relative to the application directory) whose changes restart the worker
+    watch: list[str]
+    watch_interval: float
+    # Seconds to wait for a new worker to finish its imports
+    ready_timeout: float
+    # Keep a pre-imported spare worker, so restarts skip the cold start
+    spare: bool
+
+
 class AppConfig(TypedDict):
     app: App
     automation: AutomationConfig
+    tracing: NotRequired[TracingConfig]
+    profiling: NotRequired[ProfilerConfig]
+    stats: NotRequired[StatsConfig]
+    log_queue: NotRequired[LogQueueConfig]
+    events: NotRequired[EventsConfig]
+    replay: NotRequired[ReplayConfig]
+    clock: NotRequired[ClockConfig]
+    watchdog: NotRequired[WatchdogConfig]
+    supervisor: NotRequired[SupervisorConfig]
+    control: NotRequired[ControlConfig]
@@ -0,0 +1,278 @@
+"""Immutable, validated view of the application config.
+
+The config used to be a plain dict that the server connection merged into
+while behaviour threads read from it.  :class:`ConfigStore` instead builds a
+:class:`ConfigSnapshot` once per config revision: frozen, slotted
+dataclasses for the typed sections and read-only mappings for the free-form
+ones.  A new revision is swapped in with a single reference assignment, so
+readers take no locks and always see one consistent revision.
+
+A config that fails validation is rejected when it is applied, so the server
+gets an error on merge and the running snapshot stays as it was.  Before,
+a bad key only surfaced as a ``KeyError`` in the middle of a behaviour.
+
+Usage::
+
+    snapshot = current_config()
+    snapshot.general.email_client            # EmailClient.OWA
+    snapshot.behaviour("work_emails")        # read-only mapping, {} if absent
+
+    config_store.merge({"automation": {"general": {"email_client": "roundcube"}}})
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, Optional
+
+from lib.selenium.models import EmailClient
+
+EMPTY_MAPPING: Mapping[str, Any] = MappingProxyType({})
+
+
+class ConfigValidationError(ValueError):
+    def __init__(self, errors: list[str]):
+        self.errors = errors
+        super().__init__("Invalid config:\n  " + "\n  ".join(errors))
+
+
+def freeze(value: Any) -> Any:
+    """Deep read-only copy: dicts become mapping proxies, lists become tuples."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def deep_merge(target: dict[str, Any], source: Mapping[str, Any]) -> dict[str, Any]:
+    for key, value in source.items():
+        if key in target and isinstance(target[key], dict) and isinstance(value, Mapping):
+            deep_merge(target[key], value)
+        else:
+            target[key] = value
+    return target
+
+
+# -- sections -----------------------------------------------------------------
+
+
+@dataclass(frozen=True, slots=True)
+class AppSettings:
+    landscape_id: int
+    user_automation_server_http: str
+    user_automation_server_websocket: str
+    server_reconnect_delay: int = 5
+    server_max_reconnect_delay: int = 60
+
+
+@dataclass(frozen=True, slots=True)
+class UserSettings:
+    internal_email: str
+    internal_password: str
+    external_email: str = ""
+    external_password: str = ""
+    name: str = ""
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Mapping-style read, for helpers such as ``build_email_client_user``."""
+        return getattr(self, key, None) or default
+
+
+@dataclass(frozen=True, slots=True)
+class GeneralSettings:
+    email_client: EmailClient
+    user: UserSettings
+    use_hybrid_mail_domain: bool = False
+    use_web_office_apps: bool = False
+    is_conversation_starter: bool = False
+    organization_mail_server_url: str = ""
+    organization_web_url: str = ""
+    archive_path: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class ConfigSnapshot:
+    revision: int
+    app: AppSettings
+    general: GeneralSettings
+    idle_cycle: Mapping[str, Any]
+    behaviour_toggles: Mapping[str, bool]
+    behaviours: Mapping[str, Mapping[str, Any]]
+    # The whole config, read-only, for sections without a typed view (tracing, profiling, ...)
+    raw: Mapping[str, Any]
+
+    def behaviour(self, behaviour_id: str) -> Mapping[str, Any]:
+        return self.behaviours.get(behaviour_id, EMPTY_MAPPING)
+
+
+# -- validation ---------------------------------------------------------------
+
+
+def _section(config: Mapping[str, Any], key: str, path: str, errors: list[str]) -> Mapping[str, Any]:
+    value = config.get(key, {})
+    if value is None:
+        return {}
+    if not isinstance(value, Mapping):
+        errors.append(f"{path}{key}: expected a mapping, got {type(value).__name__}")
+        return {}
+    return value
+
+
+def _field(section: Mapping[str, Any], key: str, path: str, kind: type, errors: list[str], required: bool = True):
+    if key not in section or section[key] is None:
+        if required:
+            errors.append(f"{path}{key}: missing")
+        return None
+
+    value = section[key]
+    # bool is an int subclass, so check it explicitly for int fields
+    if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+        errors.append(f"{path}{key}: expected {kind.__name__}, got {type(value).__name__}")
+        return None
+    return value
+
+
+def _optional(section: Mapping[str, Any], key: str, path: str, kind: type, errors: list[str], default: Any) -> Any:
+    value = _field(section, key, path, kind, errors, required=False)
+    return default if value is None else value
+
+
+def build_snapshot(config: Mapping[str, Any], revision: int = 1) -> ConfigSnapshot:
+    """Validate *config* and build its snapshot; raises :class:`ConfigValidationError` listing every problem."""
+    errors: list[str] = []
+
+    app = _section(config, "app", "", errors)
+    landscape_id = _field(app, "landscape_id", "app.", int, errors)
+    server_http = _field(app, "user_automation_server_http", "app.", str, errors)
+    server_websocket = _field(app, "user_automation_server_websocket", "app.", str, errors)
+    reconnect_delay = _optional(app, "server_reconnect_delay", "app.", int, errors, 5)
+    max_reconnect_delay = _optional(app, "server_max_reconnect_delay", "app.", int, errors, 60)
+    if reconnect_delay <= 0 or max_reconnect_delay < reconnect_delay:
+        errors.append("app.server_reconnect_delay: must be positive and not above server_max_reconnect_delay")
+
+    automation = _section(config, "automation", "", errors)
+    general = _section(automation, "general", "automation.", errors)
+    path = "automation.general."
+
+    email_client = None
+    raw_email_client = _field(general, "email_client", path, str, errors)
+    if raw_email_client is not None:
+        try:
+            email_client = EmailClient(raw_email_client)
+        except ValueError:
+            options = ", ".join(client.value for client in EmailClient)
+            errors.append(f"{path}email_client: '{raw_email_client}' is not one of {options}")
+
+    user = _section(general, "user", path, errors)
+    user_path = f"{path}user."
+    use_hybrid_mail_domain = _optional(general, "use_hybrid_mail_domain", path, bool, errors, False)
+    user_settings = UserSettings(
+        internal_email=_field(user, "internal_email", user_path, str, errors) or "",
+        internal_password=_field(user, "internal_password", user_path, str, errors) or "",
+        external_email=_field(user, "external_email", user_path, str, errors, required=use_hybrid_mail_domain) or "",
+        external_password=_field(user, "external_password", user_path, str, errors, required=use_hybrid_mail_domain)
+        or "",
+        name=_optional(user, "name", user_path, str, errors, ""),
+    )
+
+    general_settings = GeneralSettings(
+        email_client=email_client or EmailClient.OWA,
+        user=user_settings,
+        use_hybrid_mail_domain=use_hybrid_mail_domain,
+        use_web_office_apps=_optional(general, "use_web_office_apps", path, bool, errors, False),
+        is_conversation_starter=_optional(general, "is_conversation_starter", path, bool, errors, False),
+        organization_mail_server_url=_optional(general, "organization_mail_server_url", path, str, errors, ""),
+        organization_web_url=_optional(general, "organization_web_url", path, str, errors, ""),
+        archive_path=_optional(general, "archive_path", path, str, errors, ""),
+    )
+
+    idle_cycle = _section(automation, "idle_cycle", "automation.", errors)
+    chance = idle_cycle.get("procrastination_chance", -1.0)
+    if isinstance(chance, bool) or not isinstance(chance, (int, float)) or chance > 1:
+        errors.append("automation.idle_cycle.procrastination_chance: expected a number <= 1 (negative disables)")
+
+    toggles = _section(automation, "behaviour_toggles", "automation.", errors)
+    for behaviour_id, enabled in toggles.items():
+        if not isinstance(enabled, bool):
+            errors.append(f"automation.behaviour_toggles.{behaviour_id}: expected bool, got {type(enabled).__name__}")
+
+    behaviours = _section(automation, "behaviours", "automation.", errors)
+    for behaviour_id, behaviour_config in behaviours.items():
+        if behaviour_config is not None and not isinstance(behaviour_config, Mapping):
+            errors.append(f"automation.behaviours.{behaviour_id}: expected a mapping")
+
+    if errors:
+        raise ConfigValidationError(errors)
+
+    return ConfigSnapshot(
+        revision=revision,
+        app=AppSettings(landscape_id, server_http, server_websocket, reconnect_delay, max_reconnect_delay),
+        general=general_settings,
+        idle_cycle=freeze(idle_cycle),
+        behaviour_toggles=freeze(toggles),
+        behaviours=freeze({key: value or {} for key, value in behaviours.items()}),
+        raw=freeze(config),
+    )
+
+
+# -- store --------------------------------------------------------------------
+
+
+class ConfigStore:
+    """Holds the current :class:`ConfigSnapshot`; writers validate and swap, readers never lock."""
+
+    def __init__(self, config: Mapping[str, Any]):
+        self._write_lock = threading.Lock()
+        self._validators: list[Callable[[ConfigSnapshot], None]] = []
+        self._source: dict[str, Any] = copy.deepcopy(dict(config))
+        self._snapshot = build_snapshot(self._source)
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        return self._snapshot
+
+    def add_validator(self, validator: Callable[[ConfigSnapshot], None]) -> None:
+        """Extra check run on every new revision; raise ``ValueError`` to reject it."""
+        self._validators.append(validator)
+
+    def _build(self, config: dict[str, Any]) -> ConfigSnapshot:
+        snapshot = build_snapshot(config, self._snapshot.revision + 1)
+        errors = []
+        for validator in self._validators:
+            try:
+                validator(snapshot)
+            except ValueError as e:
+                errors.append(str(e))
+        if errors:
+            raise ConfigValidationError(errors)
+        return snapshot
+
+    def replace(self, config: Mapping[str, Any]) -> ConfigSnapshot:
+        """Validate *config* as the new revision and swap it in; raises ``ConfigValidationError``."""
+        return self.update(lambda _: copy.deepcopy(dict(config)))
+
+    def merge(self, patch: Mapping[str, Any]) -> ConfigSnapshot:
+        """Deep-merge *patch* into the current revision, validate and swap it in."""
+        return self.update(lambda source: deep_merge(source, copy.deepcopy(dict(patch))))
+
+    def update(self, change: Callable[[dict[str, Any]], Optional[dict[str, Any]]]) -> ConfigSnapshot:
+        """Apply *change* to a private copy of the current revision, validate it and swap it in.
+
+        *change* may edit the copy in place or return a replacement.  Nothing
+        is swapped if it raises or the result does not validate.
+        """
+        with self._write_lock:
+            source = copy.deepcopy(self._source)
+            source = change(source) or source
+            snapshot = self._build(source)
+            self._source, self._snapshot = source, snapshot
+            return snapshot
+
+    def source(self) -> dict[str, Any]:
+        """Mutable deep copy of the current revision."""
+        with self._write_lock:
+            return copy.deepcopy(self._source)
@@ -105,6 +105,8 @@ class PopupWindow(QWidget):
         self.summary_available.setProperty("class", "hero-value")
         self.summary_running = QLabel()
         self.summary_running.setProperty("class", "hero-value")
+        self.summary_queued = QLabel()
+        self.summary_queued.setProperty("class", "hero-value")
 
         summary_layout.addWidget(self._metric_label("Idle Cycle"), 0, 0)
         summary_layout.addWidget(self.summary_idle, 0, 1)
@@ -112,6 +114,8 @@ class PopupWindow(QWidget):
         summary_layout.addWidget(self.summary_available, 1, 1)
         summary_layout.addWidget(self._metric_label("Current"), 2, 0)
         summary_layout.addWidget(self.summary_running, 2, 1)
+        summary_layout.addWidget(self._metric_label("Queued"), 3, 0)
+        summary_layout.addWidget(self.summary_queued, 3, 1)
 
         self.content_layout.addWidget(self.summary)
 
@@ -329,6 +333,11 @@ class PopupWindow(QWidget):
         self.update_idle_cycle_button(self.user_automation_manager.idle_cycle_status.value == "paused")
         current = self.behaviour_manager.current_behaviour
         self.summary_running.setText(current.display_name if current else "Idle")
+        queued = self.behaviour_manager.queued_behaviours()
+        self.summary_queued.setText(", ".join(entry["behaviour_id"] for entry in queued) if queued else "Empty")
+        self.summary_queued.setToolTip(
+            "\n".join(f"{entry['behaviour_id']} ({entry['source']}, priority {entry['priority']})" for entry in queued)
+        )
         self.update_status()
 
     def run_behaviour(self):
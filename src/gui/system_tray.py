@@ -1,8 +1,9 @@
 import os
 import platform
 import sys
+import threading
 
-from PyQt6.QtCore import QSize, Qt, QTimer
+from PyQt6.QtCore import QObject, QSize, Qt, QThread, QTimer, pyqtSignal
 from PyQt6.QtGui import QIcon, QPixmap
 from PyQt6.QtWidgets import QApplication, QMenu, QStyle, QSystemTrayIcon
 
@@ -11,6 +12,15 @@ from src.gui.popup_window import PopupWindow
 from src.logger import app_logger
 from user_automation_manager import IdleCycleStatus, UserAutomationManager
 
+# Seconds a restart from another thread waits for the tray to close
+CLOSE_TIMEOUT = 5.0
+
+
+class _CloseRequest(QObject):
+    """Carries a close request from a worker thread onto the Qt thread."""
+
+    requested = pyqtSignal()
+
 
 class SystemTrayApp:
     def __init__(self, user_automation_manager: UserAutomationManager):
@@ -45,6 +55,11 @@ class SystemTrayApp:
         self.status_timer.timeout.connect(self.update_status)
         self.status_timer.start(1000)
 
+        self._closed = threading.Event()
+        self._close_request = _CloseRequest()
+        self._close_request.requested.connect(self._close)
+        self.user_automation_manager.before_exit = self.close
+
     def init_system_tray(self):
         app_logger.debug(f"Attempting Qt tray init (attempt #{self.init_retry_count + 1})")
 
@@ -101,6 +116,10 @@ class SystemTrayApp:
             stop_action = self.tray_menu.addAction("Stop Current Behaviour")
             stop_action.triggered.connect(self.popup.stop_behaviour)
 
+            if self.user_automation_manager.supervisor is not None:
+                restart_action = self.tray_menu.addAction("Restart Worker")
+                restart_action.triggered.connect(self.restart_worker)
+
             self.tray_menu.addSeparator()
             quit_action = self.tray_menu.addAction("Quit")
             quit_action.triggered.connect(self.quit_app)
@@ -138,6 +157,12 @@ class SystemTrayApp:
         except Exception as e:
             app_logger.error(f"Error toggling idle cycle: {str(e)}")
 
+    def restart_worker(self):
+        try:
+            self.user_automation_manager.request_worker_restart("tray")
+        except Exception as e:
+            app_logger.error(f"Error requesting worker restart: {str(e)}")
+
     def update_status(self):
         try:
             if self.popup.isVisible():
@@ -195,6 +220,24 @@ class SystemTrayApp:
             app_logger.error(f"Error quitting app: {str(e)}")
             sys.exit(1)
 
+    def close(self):
+        """Hide the tray icon and quit Qt; from another thread, waits until the Qt thread has done so."""
+        if QThread.currentThread() == self.app.thread():
+            self._close()
+            return
+        self._closed.clear()
+        self._close_request.requested.emit()
+        if not self._closed.wait(CLOSE_TIMEOUT):
+            app_logger.warning("System tray did not close in time")
+
+    def _close(self):
+        try:
+            if self.tray:
+                self.tray.hide()
+            self.app.quit()
+        finally:
+            self._closed.set()
+
     def run(self):
         try:
             return self.app.exec()
@@ -0,0 +1,207 @@
+"""Queue-based logging: callers enqueue, one listener thread runs the handlers.
+
+With the ``log_queue`` section enabled, :func:`install` replaces the handlers
+that ``logging.config.dictConfig`` attached to each logger with a single
+:class:`BoundedQueueHandler`.  The original handlers (console, rotating file,
+...) then only run on the ``Log listener`` thread.  A slow disk, a scanned log
+file or a rollover no longer stalls behaviour steps, the websocket thread or
+the Qt thread.  Logging a record on those threads costs an enqueue.
+
+Records are queued unformatted and the listener formats them.  Exceptions
+are rendered to text when queued, because the traceback would otherwise keep
+the frames alive.  For lazy formatting the arguments must not be mutated
+after the call, which holds for the ``%s``-style calls used on hot paths.
+
+The queue is bounded.  When it is full, ``drop_policy`` decides what happens:
+
+- ``drop_oldest`` (default): discard the oldest queued record, keep the new one
+- ``drop_newest``: discard the new record
+- ``block``: wait up to ``block_timeout`` seconds for room, then discard it
+
+Records at ``ERROR`` or above always wait for room (up to ``block_timeout``).
+The listener reports how many records were dropped once the queue drains.
+
+Usage::
+
+    log_queue = install(cfg.get("log_queue"))   # after dictConfig
+    ...
+    log_queue.stop()                             # flushes; also registered with atexit
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from typing import Optional, TypedDict
+
+DEFAULT_MAX_SIZE: int = 10000
+DEFAULT_DROP_POLICY: str = "drop_oldest"
+DEFAULT_BLOCK_TIMEOUT: float = 0.05
+DROP_POLICIES: tuple[str, ...] = ("drop_oldest", "drop_newest", "block")
+# Minimum seconds between two "records dropped" reports
+DROP_REPORT_INTERVAL: float = 10.0
+
+_STOP = object()
+
+
+class LogQueueConfig(TypedDict, total=False):
+    enabled: bool
+    # Records held before the drop policy applies
+    max_size: int
+    drop_policy: str
+    block_timeout: float
+
+
+class BoundedQueueHandler(logging.Handler):
+    """Puts ``(handlers, record)`` on a shared bounded queue; never formats or writes."""
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        handlers: tuple[logging.Handler, ...],
+        drop_policy: str = DEFAULT_DROP_POLICY,
+        block_timeout: float = DEFAULT_BLOCK_TIMEOUT,
+    ):
+        super().__init__()
+        self.queue = log_queue
+        self.handlers = handlers
+        self.drop_policy = drop_policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            # Render now: the traceback pins every frame (and its locals) until the listener gets to it
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            item = (self.handlers, self.prepare(record))
+            blocking = self.drop_policy == "block" or record.levelno >= logging.ERROR
+            if blocking:
+                self.queue.put(item, timeout=self.block_timeout)
+                return
+            try:
+                self.queue.put_nowait(item)
+            except queue.Full:
+                if self.drop_policy != "drop_oldest":
+                    raise
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+                self.queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+        except Exception:
+            self.handleError(record)
+
+
+class LogQueue:
+    """Owns the queue, the per-logger queue handlers and the listener thread."""
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_MAX_SIZE,
+        drop_policy: str = DEFAULT_DROP_POLICY,
+        block_timeout: float = DEFAULT_BLOCK_TIMEOUT,
+    ):
+        if drop_policy not in DROP_POLICIES:
+            options = ", ".join(DROP_POLICIES)
+            raise ValueError(f"Unknown log queue drop policy '{drop_policy}', expected one of: {options}")
+
+        self.queue: queue.Queue = queue.Queue(maxsize=max(1, max_size))
+        self.drop_policy = drop_policy
+        self.block_timeout = block_timeout
+        self._queue_handlers: list[BoundedQueueHandler] = []
+        self._reported_drops = 0
+        self._last_report = 0.0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def dropped(self) -> int:
+        return sum(handler.dropped for handler in self._queue_handlers)
+
+    def attach(self, logger: logging.Logger) -> None:
+        """Move *logger*'s handlers behind the queue."""
+        handlers = tuple(logger.handlers)
+        if not handlers:
+            return
+        queue_handler = BoundedQueueHandler(self.queue, handlers, self.drop_policy, self.block_timeout)
+        self._queue_handlers.append(queue_handler)
+        for handler in handlers:
+            logger.removeHandler(handler)
+        logger.addHandler(queue_handler)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="Log listener", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Handle everything still queued, then stop the listener."""
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self.queue.put(_STOP)
+        thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                self._report_drops(force=True)
+                return
+
+            handlers, record = item
+            for handler in handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+            if self.queue.empty():
+                self._report_drops()
+
+    def _report_drops(self, force: bool = False) -> None:
+        dropped = self.dropped
+        if dropped == self._reported_drops:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_report < DROP_REPORT_INTERVAL:
+            return
+
+        count = dropped - self._reported_drops
+        self._reported_drops, self._last_report = dropped, now
+        record = logging.LogRecord(
+            "autoconfig", logging.WARNING, __file__, 0, "Log queue full: dropped %d record(s)", (count,), None
+        )
+        handlers = {handler for queue_handler in self._queue_handlers for handler in queue_handler.handlers}
+        for handler in handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+def install(config: Optional[LogQueueConfig]) -> Optional[LogQueue]:
+    """Route the configured loggers through a :class:`LogQueue`; ``None`` when disabled."""
+    config = config or {}
+    if not config.get("enabled", False):
+        return None
+
+    log_queue = LogQueue(
+        int(config.get("max_size", DEFAULT_MAX_SIZE)),
+        config.get("drop_policy", DEFAULT_DROP_POLICY),
+        float(config.get("block_timeout", DEFAULT_BLOCK_TIMEOUT)),
+    )
+    loggers = [logging.getLogger()] + [
+        logger for logger in logging.Logger.manager.loggerDict.values() if isinstance(logger, logging.Logger)
+    ]
+    for logger in loggers:
+        log_queue.attach(logger)
+    log_queue.start()
+    return log_queue
@@ -1,15 +1,41 @@
+import copy
 import logging
 import logging.config
+import multiprocessing
 import os
 
 from resource_path import resource_path
 from src.config.config_handler import load_config
+from src.log_queue import install as install_log_queue
 
 config_file_path = resource_path("config.yml")
 
+# Name of the supervisor's worker processes (see worker.py); set before the worker imports anything
+WORKER_PROCESS_NAME = "Automation worker"
+
+
+def is_worker_process() -> bool:
+    return multiprocessing.current_process().name == WORKER_PROCESS_NAME
+
+
+def worker_logging_config(config):
+    """*config* without handlers: every logger propagates to the root, where the worker forwards to its supervisor."""
+    config = copy.deepcopy(config)
+    config["handlers"] = {}
+    for logger_config in config.get("loggers", {}).values():
+        logger_config["handlers"] = []
+        logger_config["propagate"] = True
+    if "root" in config:
+        config["root"]["handlers"] = []
+    return config
+
 
 def configure_logger(cfg):
     if "logging" in cfg:
+        if is_worker_process():
+            # The supervisor owns the log file; a second RotatingFileHandler on it would interleave and rotate twice
+            logging.config.dictConfig(worker_logging_config(cfg["logging"]))
+            return
         log_folder_path = cfg["logging"]["handlers"]["file"]["filename"]
         log_folder = os.path.dirname(log_folder_path)
         if not os.path.exists(log_folder):
@@ -17,6 +43,9 @@ def configure_logger(cfg):
         logging.config.dictConfig(cfg["logging"])
 
 
+# Parsed once: app_config.py gets a copy of this parse from the config_handler cache
 cfg = load_config(config_file_path)
 configure_logger(cfg)
+# After dictConfig: moves the configured handlers onto the listener thread; workers have none to move
+log_queue = None if is_worker_process() else install_log_queue(cfg.get("log_queue"))
 app_logger = logging.getLogger("autoconfig")
@@ -0,0 +1,347 @@
+"""Supervisor mode: behaviours run in a worker process that is restarted between runs.
+
+Without it, picking up changed behaviour code or email templates, or
+getting rid of a leak, means restarting the whole client: the server
+connection drops and the tray disappears.  With ``supervisor.enabled``
+this process stays up as the supervisor.  It keeps the server connection,
+the tray, the behaviour queue, scheduling and statistics.  Behaviour threads
+run in a separate *worker* process instead (entry module :mod:`worker`).
+``BehaviourManager`` starts a :class:`RemoteBehaviour` stand-in, and the
+worker reports lifecycle events, log records and the outcome back over a
+pipe.
+
+The worker is replaced between behaviours, never during one, when:
+
+- a restart is requested on demand (tray, ``restart_worker`` server command);
+- the resource watchdog, which samples the worker in this mode, crosses a limit;
+- a file under ``supervisor.watch`` changes (by default ``behaviours/`` and
+  ``lib/email_manager/emails.yml``).
+
+Restarts avoid a cold start.  A spare worker is spawned in the background
+right after every swap and does its imports (Selenium, pyautogui, OpenCV,
+the behaviour registry) while idle, so swapping is usually just a pointer
+change.  A spare spawned before a watched file changed is stale.  It is
+replaced, and that one swap waits for a fresh worker to import.
+
+Usage::
+
+    supervisor = Supervisor(behaviour_manager, config_store.source())
+    supervisor.start()                      # worker + warm spare, file watch
+    supervisor.request_restart("tray")
+    if supervisor.restart_reason and not behaviour_manager.is_behaviour_running():
+        supervisor.restart_worker()
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from typing import Any, Optional, Type, cast
+
+import worker as worker_entry
+from app_config import config_store
+from behaviour.behaviour import BaseBehaviour
+from behaviour.events import event_stream
+from behaviour.models import BehaviourOutcome
+from behaviour_manager import BehaviourManager
+from cleanup_manager import CleanupManager
+from lib.clock import clock
+from src.config.models.config import AppConfig
+from src.logger import WORKER_PROCESS_NAME, app_logger
+
+APP_DIR: str = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_WATCH: tuple[str, ...] = ("behaviours", os.path.join("lib", "email_manager", "emails.yml"))
+DEFAULT_WATCH_INTERVAL: float = 2.0
+DEFAULT_READY_TIMEOUT: float = 60.0
+# Extra time a stopping behaviour gets to report its outcome over the pipe
+STOP_GRACE: float = 5.0
+
+
+# -- supervisor side -----------------------------------------------------------
+
+
+class RemoteBehaviour:
+    """Stand-in for a behaviour running in the worker.
+
+    Has the attributes of :class:`BaseBehaviour` that ``BehaviourManager``,
+    the tray and the status update read, and the thread methods they call.
+    """
+
+    def __init__(self, worker: "WorkerProcess", behaviour_class: Type[BaseBehaviour]):
+        self.worker = worker
+        self.id = behaviour_class.id
+        self.display_name = behaviour_class.display_name
+        self.category = behaviour_class.category
+        self.description = behaviour_class.description
+        self.trace_id: Optional[str] = None
+        self.outcome: Optional[BehaviourOutcome] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error_type: Optional[str] = None
+        self.cleanup_duration: Optional[float] = None
+        self._done = threading.Event()
+
+    @property
+    def ident(self) -> Optional[int]:
+        return self.worker.pid
+
+    @property
+    def duration(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or clock.monotonic()) - self.started_at
+
+    def start(self) -> None:
+        self.started_at = clock.monotonic()
+        if not self.worker.run(self):
+            self.finish(BehaviourOutcome.FAILED, "WorkerUnavailable")
+
+    def is_alive(self) -> bool:
+        return self.started_at is not None and not self._done.is_set()
+
+    def stop(self, timeout: float = 10) -> None:
+        app_logger.info(f"Stopping {self.id} in worker {self.worker.pid}...")
+        self.worker.send(("stop", timeout))
+        if not self._done.wait(timeout + STOP_GRACE):
+            app_logger.warning(f"{self.id} did not stop within {timeout}s")
+
+    def finish(
+        self,
+        outcome: BehaviourOutcome,
+        error_type: Optional[str] = None,
+        trace_id: Optional[str] = None,
+        duration: Optional[float] = None,
+        cleanup_duration: float = 0.0,
+    ) -> None:
+        if self._done.is_set():
+            return
+        self.outcome = outcome
+        self.error_type = error_type
+        self.trace_id = trace_id or self.trace_id
+        self.cleanup_duration = cleanup_duration
+        if self.started_at is not None:
+            # The worker's duration: its clock, not this one, timed the run
+            self.finished_at = self.started_at + duration if duration is not None else clock.monotonic()
+        self._done.set()
+
+
+class WorkerProcess:
+    """Supervisor-side handle of one worker process and its pipe."""
+
+    def __init__(self, context: Any, config: AppConfig):
+        self._conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=worker_entry.main,
+            args=(child_conn, copy.deepcopy(dict(config))),
+            name=WORKER_PROCESS_NAME,
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+        self.spawned_at = time.monotonic()
+        self.ready = threading.Event()
+        self.behaviour: Optional[RemoteBehaviour] = None
+        self._send_lock = threading.Lock()
+        self._reader = threading.Thread(target=self._read, name=f"Worker {self.pid} reader thread", daemon=True)
+        self._reader.start()
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid
+
+    @property
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def send(self, message: tuple) -> bool:
+        try:
+            with self._send_lock:
+                self._conn.send(message)
+            return True
+        except (OSError, ValueError) as e:
+            app_logger.error(f"Could not send '{message[0]}' to worker {self.pid}: {e}")
+            return False
+
+    def run(self, behaviour: RemoteBehaviour) -> bool:
+        self.behaviour = behaviour
+        return self.send(("run", behaviour.id))
+
+    def _read(self) -> None:
+        while True:
+            try:
+                message = self._conn.recv()
+            except (EOFError, OSError):
+                break
+
+            kind = message[0]
+            if kind == "ready":
+                self.ready.set()
+            elif kind == "event":
+                event_stream.emit(message[1], **message[2])
+            elif kind == "log":
+                # The worker has no handlers of its own; its records go through this process's
+                logging.getLogger(message[1].name).handle(message[1])
+            elif kind == "finished" and self.behaviour is not None and self.behaviour.id == message[1]:
+                _, _, outcome, error_type, trace_id, duration, cleanup_duration = message
+                self.behaviour.finish(BehaviourOutcome(outcome), error_type, trace_id, duration, cleanup_duration)
+
+        if self.behaviour is not None and self.behaviour.is_alive():
+            app_logger.error(f"Worker {self.pid} exited while running '{self.behaviour.id}'")
+            self.behaviour.finish(BehaviourOutcome.FAILED, "WorkerExited")
+
+    def close(self, timeout: float = 10) -> None:
+        self.send(("exit",))
+        self.process.join(timeout)
+        if self.process.is_alive():
+            app_logger.warning(f"Worker {self.pid} did not exit within {timeout}s, terminating it")
+            self.process.terminate()
+            self.process.join(timeout)
+        self._conn.close()
+
+
+class Supervisor:
+    def __init__(self, behaviour_manager: BehaviourManager, config: AppConfig):
+        settings = config.get("supervisor") or {}
+        self.behaviour_manager = behaviour_manager
+        self.watch_paths = [os.path.join(APP_DIR, path) for path in settings.get("watch", DEFAULT_WATCH)]
+        self.watch_interval = float(settings.get("watch_interval", DEFAULT_WATCH_INTERVAL))
+        self.ready_timeout = float(settings.get("ready_timeout", DEFAULT_READY_TIMEOUT))
+        self.keep_spare = bool(settings.get("spare", True))
+
+        self.restart_reason: Optional[str] = None
+        self.restarts = 0
+        # Spawn, not fork: this process runs Qt and websocket threads
+        self._context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._worker: Optional[WorkerProcess] = None
+        self._spare: Optional[WorkerProcess] = None
+        self._files: dict[str, int] = {}
+        self._code_changed_at = 0.0
+
+    def start(self) -> None:
+        self._files = self._scan()
+        self._worker = self._spawn()
+        if not self._worker.ready.wait(self.ready_timeout):
+            app_logger.warning(f"Worker {self._worker.pid} not ready after {self.ready_timeout}s; runs will queue up")
+        self.behaviour_manager.behaviour_factory = self._create_behaviour
+        self.behaviour_manager.watchdog.watch(self._worker.pid)
+        self._refill_spare()
+        threading.Thread(target=self._watch_files, name="Supervisor file watch thread", daemon=True).start()
+        app_logger.info(f"Supervisor started worker {self._worker.pid}")
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._lock:
+            workers = [w for w in (self._worker, self._spare) if w is not None]
+            self._worker = self._spare = None
+        for worker in workers:
+            worker.close()
+
+    # -- workers -------------------------------------------------------------
+
+    def _spawn(self) -> WorkerProcess:
+        return WorkerProcess(self._context, cast(AppConfig, config_store.source()))
+
+    def _refill_spare(self) -> None:
+        if self.keep_spare and not self._stop.is_set():
+            self._spare = self._spawn()
+
+    def _create_behaviour(self, behaviour_class: Type[BaseBehaviour], cleanup_manager: CleanupManager) -> BaseBehaviour:
+        if self._worker is None or not self._worker.alive:
+            self.restart_worker("worker exited")
+        return cast(BaseBehaviour, RemoteBehaviour(cast(WorkerProcess, self._worker), behaviour_class))
+
+    def request_restart(self, reason: str) -> None:
+        """Restart the worker before the next behaviour starts."""
+        if self.restart_reason is None:
+            app_logger.info(f"Worker restart requested: {reason}")
+            self.restart_reason = reason
+
+    def restart_worker(self, reason: Optional[str] = None) -> bool:
+        """Swap in a fresh worker; only call between behaviours.  False if none became ready in time."""
+        reason = reason or self.restart_reason or "requested"
+        started = time.monotonic()
+        with self._lock:
+            spare, self._spare = self._spare, None
+            if spare is not None and (not spare.alive or spare.spawned_at <= self._code_changed_at):
+                # Dead, or imported the code before the change that triggered this restart
+                threading.Thread(target=spare.close, daemon=True).start()
+                spare = None
+            worker = spare or self._spawn()
+
+        # Outside the lock: stop() must not wait for a worker to import
+        if not worker.ready.wait(self.ready_timeout) or self._stop.is_set():
+            if not self._stop.is_set():
+                app_logger.error(f"Replacement worker {worker.pid} not ready after {self.ready_timeout}s")
+            threading.Thread(target=worker.close, daemon=True).start()
+            return False
+
+        with self._lock:
+            old, self._worker = self._worker, worker
+            self.restart_reason = None
+            self.restarts += 1
+            self._refill_spare()
+
+        self.behaviour_manager.watchdog.watch(worker.pid)
+        if old is not None:
+            threading.Thread(target=old.close, name=f"Worker {old.pid} shutdown thread", daemon=True).start()
+
+        elapsed = time.monotonic() - started
+        previous = old.pid if old is not None else None
+        app_logger.info(f"Worker restarted in {elapsed:.2f}s ({reason}): pid {previous} -> {worker.pid}")
+        event_stream.emit("worker_restarted", reason=reason, pid=worker.pid, duration=round(elapsed, 3))
+        return True
+
+    def update_config(self, config: AppConfig) -> None:
+        message = ("config", copy.deepcopy(dict(config)))
+        for worker in (self._worker, self._spare):
+            if worker is not None:
+                worker.send(message)
+
+    def status(self) -> dict[str, Any]:
+        worker, spare = self._worker, self._spare
+        return {
+            "pid": worker.pid if worker else None,
+            "restarts": self.restarts,
+            "restart_reason": self.restart_reason,
+            "spare_ready": spare is not None and spare.ready.is_set(),
+        }
+
+    # -- file watch ----------------------------------------------------------
+
+    def _scan(self) -> dict[str, int]:
+        files = {}
+        for root in self.watch_paths:
+            if os.path.isfile(root):
+                paths = [root]
+            else:
+                paths = [
+                    os.path.join(dirpath, filename)
+                    for dirpath, dirnames, filenames in os.walk(root)
+                    for filename in filenames
+                    if "__pycache__" not in dirpath
+                ]
+            for path in paths:
+                try:
+                    files[path] = os.stat(path).st_mtime_ns
+                except OSError:
+                    pass
+        return files
+
+    def _watch_files(self) -> None:
+        while not self._stop.wait(self.watch_interval):
+            files = self._scan()
+            paths = files.keys() | self._files.keys()
+            changed = sorted(path for path in paths if files.get(path) != self._files.get(path))
+            if not changed:
+                continue
+            self._files = files
+            self._code_changed_at = time.monotonic()
+            names = ", ".join(os.path.relpath(path, APP_DIR) for path in changed[:3])
+            self.request_restart(f"changed: {names}" + (f" (+{len(changed) - 3})" if len(changed) > 3 else ""))
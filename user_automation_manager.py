@@ -1,22 +1,42 @@
-﻿import json
+﻿import copy
+import json
 import logging
+import os
 import socket
+import subprocess
 import threading
 import time
 from enum import Enum
-from typing import Any, MutableMapping, Optional, cast
+from typing import Any, Callable, Optional, cast
 
 import requests
 import websocket
 
-from app_config import AppConfig, app_config, automation_config, save_app_config
+from app_config import AppConfig, config_store, current_config, save_app_config
+from behaviour.events import event_stream
 from behaviour.ids import BehaviourId
 from behaviour.registry import BEHAVIOURS
+from behaviour.watchdog import restart_command
 from behaviour_manager import BehaviourManager
 from json_encoder import EnumEncoder
+from lib.instance import instance
+from lib.selenium.command_profiler import command_profiler
+from server_commands import ServerCommands
+from src.config.snapshot import ConfigValidationError, deep_merge
+from src.logger import log_queue
+from supervisor import Supervisor
 
 logger = logging.getLogger(__name__)
 
+# Actions that are de-duplicated and acknowledged via ServerCommands
+SERVER_COMMANDS = (
+    "config_update",
+    "update_behaviour_config",
+    "run_behaviour",
+    "cancel_queued_behaviour",
+    "restart_worker",
+)
+
 
 class IdleCycleStatus(Enum):
     RUNNING = "running"
@@ -31,8 +51,12 @@ class UserAutomationManager:
     """
 
     def __init__(self, config: AppConfig):
-        self.config: AppConfig = config
-        self.behaviour_manager = BehaviourManager(BEHAVIOURS, self.config)
+        self.behaviour_manager = BehaviourManager(BEHAVIOURS, config)
+        self.commands = ServerCommands(self.behaviour_manager)
+        # Supervisor mode: behaviours run in a restartable worker process, this one keeps connection and tray
+        self.supervisor: Optional[Supervisor] = None
+        if (config.get("supervisor") or {}).get("enabled", False):
+            self.supervisor = Supervisor(self.behaviour_manager, config)
 
         self.behaviour_cycle_thread = threading.Thread(
             target=self._run_behaviour_cycle, name="Behaviour cycle thread", daemon=True
@@ -47,17 +71,19 @@ class UserAutomationManager:
         self.access_token: Optional[str] = None
         self.websocket_connection: Optional[websocket.WebSocket] = None
         self.is_connected = False
+        # Called by restart() before the process exits; the tray sets it to remove its icon and quit Qt
+        self.before_exit: Optional[Callable[[], None]] = None
 
     def set_idle_cycle_status(self, status: IdleCycleStatus):
         self.idle_cycle_status = status
 
     def _authenticate_with_server(self) -> bool:
         try:
-            username = automation_config["general"]["user"]["internal_email"]
-            password = automation_config["general"]["user"]["internal_password"]
-            if automation_config["general"]["use_hybrid_mail_domain"]:
-                username = automation_config["general"]["user"]["external_email"]
-                password = automation_config["general"]["user"]["external_password"]
+            config = current_config()
+            user = config.general.user
+            username, password = user.internal_email, user.internal_password
+            if config.general.use_hybrid_mail_domain:
+                username, password = user.external_email, user.external_password
 
             hostname = socket.gethostname()
 
@@ -71,7 +97,7 @@ class UserAutomationManager:
                 "hostname": hostname,
             }
 
-            auth_url = f"{app_config['app']['user_automation_server_http']}/client/connect"
+            auth_url = f"{config.app.user_automation_server_http}/client/connect"
             logger.info(f"Authenticating with server at {auth_url}")
 
             response = requests.post(
@@ -104,7 +130,7 @@ class UserAutomationManager:
 
     def _connect_websocket(self) -> bool:
         try:
-            ws_url = app_config["app"]["user_automation_server_websocket"] + "/client/client_socket"
+            ws_url = current_config().app.user_automation_server_websocket + "/client/client_socket"
 
             logger.info(f"Connecting to WebSocket at {ws_url}")
 
@@ -124,25 +150,37 @@ class UserAutomationManager:
             data = json.loads(message)
             action = data.get("action")
 
+            if action in SERVER_COMMANDS and not self.commands.accept(data):
+                return
+
             if action == "config_update":
                 config = data.get("config", {})
                 if config:
-                    self._merge_config(config)
+                    applied = self._merge_config(config)
+                    self.commands.ack(data, "applied" if applied else "rejected")
 
             elif action == "update_behaviour_config":
                 behaviour_id = data.get("behaviour_id")
                 behaviour_config = data.get("config", {})
 
                 if behaviour_id and behaviour_config:
-                    self._update_behaviour_config(behaviour_id, behaviour_config)
+                    applied = self._update_behaviour_config(behaviour_id, behaviour_config)
+                    self.commands.ack(data, "applied" if applied else "rejected")
 
             elif action == "run_behaviour":
-                behaviour_id = data.get("behaviour_id")
-                if behaviour_id:
-                    self.run_behaviour(behaviour_id, True)
+                self.commands.schedule_behaviour(data)
+
+            elif action == "cancel_queued_behaviour":
+                self.commands.cancel(data)
+
+            elif action == "restart_worker":
+                if self.request_worker_restart(data.get("reason") or "server command"):
+                    self.commands.ack(data, "queued")
+                else:
+                    self.commands.ack(data, "rejected", "supervisor mode is disabled")
 
             else:
-                logger.debug(f"Unknown action type: {action}")
+                logger.debug("Unknown action type: %s", action)
 
         except json.JSONDecodeError as e:
             logger.error(f"Error parsing WebSocket message: {e}")
@@ -154,76 +192,108 @@ class UserAutomationManager:
         logger.info(f"Running behaviour: {behaviour_id}")
 
     def _save_and_refresh_config(self) -> None:
-        self.behaviour_manager.refresh_availability(self.config)
-        save_app_config(self.config)
+        config = config_store.source()
+        self.behaviour_manager.refresh_availability()
+        save_app_config(config)
+        if self.supervisor is not None:
+            self.supervisor.update_config(config)
+
+    def _apply_config_change(self, change: Callable[[dict[str, Any]], None], description: str) -> bool:
+        """Apply *change* to the config snapshot, then save and reload from the accepted revision.
+
+        Returns False (and keeps the running config) when the result does not validate.
+        """
+        try:
+            config_store.update(change)
+        except ConfigValidationError as e:
+            logger.error(f"Rejected {description}: {e}")
+            return False
+
+        self._save_and_refresh_config()
+        return True
 
-    def _merge_config(self, new_config: dict[str, Any]):
+    def _merge_config(self, new_config: dict[str, Any]) -> bool:
         try:
-            self._deep_merge_dict(cast(dict[str, Any], self.config), new_config)
-            self._save_and_refresh_config()
-            logger.info(f"Configuration updated and saved: {list(new_config.keys())}")
+            merged = self._apply_config_change(
+                lambda config: deep_merge(config, copy.deepcopy(new_config)), "config update"
+            )
+            if merged:
+                logger.info(f"Configuration updated and saved: {list(new_config.keys())}")
+            return merged
         except Exception as e:
             logger.error(f"Error merging config: {e}")
             raise e
 
-    def _deep_merge_dict(self, target: MutableMapping[str, Any], source: MutableMapping[str, Any]):
-        for key, value in source.items():
-            if key in target and isinstance(target[key], dict) and isinstance(value, dict):
-                self._deep_merge_dict(target[key], value)
-            else:
-                target[key] = value
+    def _update_behaviour_config(self, behaviour_id: str, behaviour_config: dict) -> bool:
+        def change(config: dict[str, Any]) -> None:
+            automation = config.setdefault("automation", {})
+            automation.setdefault("behaviours", {})[behaviour_id] = copy.deepcopy(behaviour_config)
 
-    def _update_behaviour_config(self, behaviour_id: str, behaviour_config: dict):
         try:
-            if "automation" not in self.config:
-                self.config["automation"] = {}
-            if "behaviours" not in self.config["automation"]:
-                self.config["automation"]["behaviours"] = {}
-            if behaviour_id not in self.config["automation"]["behaviours"]:
-                self.config["automation"]["behaviours"][behaviour_id] = {}
-
-            self.config["automation"]["behaviours"][behaviour_id] = behaviour_config
-            self._save_and_refresh_config()
-            logger.info(f"Behaviour configuration updated and saved for {behaviour_id}")
-
+            updated = self._apply_config_change(change, f"behaviour config for {behaviour_id}")
+            if updated:
+                logger.info(f"Behaviour configuration updated and saved for {behaviour_id}")
+            return updated
         except Exception as e:
             logger.error(f"Error updating behaviour config for {behaviour_id}: {e}")
             raise e
 
-    def update_behaviour_toggle(self, behaviour_id: BehaviourId, enabled: bool) -> None:
+    def update_behaviour_toggle(self, behaviour_id: BehaviourId, enabled: bool) -> bool:
+        def change(config: dict[str, Any]) -> None:
+            automation = config.setdefault("automation", {})
+            automation.setdefault("behaviour_toggles", {})[behaviour_id] = enabled
+
         try:
-            automation = self.config.setdefault("automation", {})
-            toggles = automation.setdefault("behaviour_toggles", {})
-            toggles[behaviour_id] = enabled
-            self._save_and_refresh_config()
-            logger.info(f"Behaviour toggle updated: {behaviour_id}={enabled}")
+            updated = self._apply_config_change(change, f"behaviour toggle {behaviour_id}={enabled}")
+            if updated:
+                logger.info(f"Behaviour toggle updated: {behaviour_id}={enabled}")
+            return updated
         except Exception as e:
             logger.error(f"Error updating behaviour toggle for {behaviour_id}: {e}")
             raise e
 
     def get_behaviour_toggles(self) -> dict[BehaviourId, bool]:
-        automation = self.config.get("automation", {})
-        toggles = automation.get("behaviour_toggles", {})
-        return cast(dict[BehaviourId, bool], toggles.copy())
+        return cast(dict[BehaviourId, bool], dict(current_config().behaviour_toggles))
+
+    def get_status(self) -> dict[str, Any]:
+        """What is running and what is next; sent to the server and served to local control clients."""
+        current_behaviour_data = None
+        current_behaviour = self.behaviour_manager.current_behaviour
+        if current_behaviour:
+            run = command_profiler.current_run(current_behaviour.trace_id) if current_behaviour.trace_id else None
+            current_behaviour_data = {
+                "id": current_behaviour.id,
+                "display_name": current_behaviour.display_name,
+                "category": current_behaviour.category.value,
+                "webdriver_commands": run.count if run else 0,
+            }
+
+        return {
+            "current_behaviour": current_behaviour_data,
+            "idle_cycle_status": self.idle_cycle_status.value,
+            "behaviour_queue": self.behaviour_manager.queued_behaviours(),
+            "server_connected": self.is_connected,
+            "worker": self.supervisor.status() if self.supervisor is not None else None,
+        }
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {
+            "webdriver_commands": command_profiler.behaviour_totals(),
+            "behaviour_stats": self.behaviour_manager.stats.snapshot(),
+            "resources": self.behaviour_manager.watchdog.snapshot(),
+            "pending_events": event_stream.pending,
+        }
 
     def _send_status_update(self):
         try:
             if not self.websocket_connection:
                 return
 
-            current_behaviour_data = None
-            if self.behaviour_manager.current_behaviour:
-                current_behaviour_data = {
-                    "id": self.behaviour_manager.current_behaviour.id,
-                    "display_name": self.behaviour_manager.current_behaviour.display_name,
-                    "category": self.behaviour_manager.current_behaviour.category.value,
-                }
-
             status_data = {
                 "type": "status_update",
                 "hostname": socket.gethostname(),
-                "current_behaviour": current_behaviour_data,
-                "idle_cycle_status": self.idle_cycle_status.value,
+                **self.get_status(),
+                **self.get_metrics(),
                 "timestamp": time.time(),
             }
 
@@ -231,11 +301,60 @@ class UserAutomationManager:
             logger.debug("Status update sent to server")
 
         except Exception as e:
-            logger.error(f"Error sending status update: {e}")
+            logger.error("Error sending status update: %s", e)
+
+    def handle_control(self, command: str, params: dict[str, Any]) -> Any:
+        """Local control endpoint (``lib.instance``); raises ``ValueError`` on bad requests."""
+        if command == "status":
+            return self.get_status()
+
+        if command == "metrics":
+            return self.get_metrics()
+
+        if command == "run":
+            behaviour = self.behaviour_manager.run_behaviour(params["behaviour_id"], bool(params.get("force", False)))
+            return {"started": behaviour is not None}
+
+        if command == "stop":
+            running = self.behaviour_manager.is_behaviour_running()
+            if running:
+                self.behaviour_manager.terminate_behaviour()
+            return {"stopped": running}
+
+        if command == "queue":
+            if "behaviour_id" not in params:
+                return self.behaviour_manager.queued_behaviours()
+            entry = self.behaviour_manager.queue_behaviour(
+                params["behaviour_id"], int(params.get("priority", 0)), ttl=params.get("ttl"), source="local"
+            )
+            if entry is None:
+                raise ValueError(f"Behaviour '{params['behaviour_id']}' is not available")
+            return entry.to_dict()
+
+        if command == "cancel":
+            return {"cancelled": self.behaviour_manager.cancel_queued_behaviour(str(params["queue_id"]))}
+
+        raise ValueError(f"Unknown control command '{command}'")
+
+    def _send_command_acks(self):
+        try:
+            if self.websocket_connection:
+                self.commands.flush_acks(self.websocket_connection.send)
+        except Exception as e:
+            logger.error("Error sending command acknowledgements: %s", e)
+
+    def _send_events(self):
+        try:
+            if self.websocket_connection:
+                sent = event_stream.flush(self.websocket_connection.send)
+                if sent:
+                    logger.debug("Sent %d behaviour event(s) to server", sent)
+        except Exception as e:
+            logger.error("Error sending behaviour events: %s", e)
 
     def _run_server_connection(self):
-        default_reconnect_delay = app_config["app"]["server_reconnect_delay"]
-        max_reconnect_delay = app_config["app"]["server_max_reconnect_delay"]
+        default_reconnect_delay = current_config().app.server_reconnect_delay
+        max_reconnect_delay = current_config().app.server_max_reconnect_delay
         reconnect_delay = default_reconnect_delay
 
         while True:
@@ -266,15 +385,20 @@ class UserAutomationManager:
                         self.is_connected = False
                         self.websocket_connection = None
                     except Exception as e:
-                        logger.error(f"Error in WebSocket communication: {e}")
+                        logger.error("Error in WebSocket communication: %s", e)
                         self.is_connected = False
                         self.websocket_connection = None
 
                 if self.is_connected:
                     self._send_status_update()
+                    self._send_events()
+                    self._send_command_acks()
+                else:
+                    # Offline: keep lifecycle events on disk until the next connection
+                    event_stream.spill()
 
                 if not self.is_connected:
-                    logger.info(f"Retrying connection in {reconnect_delay} seconds...")
+                    logger.info("Retrying connection in %s seconds...", reconnect_delay)
                     time.sleep(reconnect_delay)
                     reconnect_delay = min(reconnect_delay * 2, max_reconnect_delay)
                 else:
@@ -284,26 +408,30 @@ class UserAutomationManager:
                 logger.info("Server connection thread interrupted")
                 break
             except Exception as e:
-                logger.error(f"Unexpected error in server connection: {e}")
+                logger.error("Unexpected error in server connection: %s", e)
                 self.is_connected = False
                 time.sleep(reconnect_delay)
 
     def _run_behaviour_cycle(self):
-        old_config = self.config.copy()
+        revision = current_config().revision
 
         while True:
             try:
-                config_changed = old_config != self.config
-                if config_changed:
-                    old_config = self.config.copy()
-                    self.behaviour_manager.refresh_availability(self.config)
+                if current_config().revision != revision:
+                    revision = current_config().revision
+                    self.behaviour_manager.refresh_availability()
                     logger.info("Configuration changed - behaviour manager reloaded")
 
+                if not self.behaviour_manager.is_behaviour_running():
+                    self._restart_if_requested()
+
                 if (
-                    self.idle_cycle_status == IdleCycleStatus.RUNNING
+                    self.idle_cycle_status != IdleCycleStatus.STOPPED
                     and not self.behaviour_manager.is_behaviour_running()
                 ):
-                    self.behaviour_manager.run_next_behaviour()
+                    # Paused only stops idle picks; server-queued behaviours still run, as they did before queueing
+                    include_idle = self.idle_cycle_status == IdleCycleStatus.RUNNING
+                    self.behaviour_manager.run_next_behaviour(include_idle)
 
                 time.sleep(1)
 
@@ -313,6 +441,9 @@ class UserAutomationManager:
 
     def start(self):
         logger.info("Starting User Automation Manager")
+        if self.supervisor is not None:
+            self.supervisor.start()
+        self.behaviour_manager.watchdog.start()
         self.behaviour_cycle_thread.start()
         self.server_connection_thread.start()
 
@@ -327,13 +458,54 @@ class UserAutomationManager:
                 logging.error("Error closing WebSocket connection")
 
         self.is_connected = False
+        self.behaviour_manager.watchdog.stop()
+        if self.supervisor is not None:
+            self.supervisor.stop()
+
+    def request_worker_restart(self, reason: str) -> bool:
+        """Restart the worker before the next behaviour; False when not in supervisor mode."""
+        if self.supervisor is None:
+            return False
+        self.supervisor.request_restart(reason)
+        return True
+
+    def _restart_if_requested(self):
+        """Between behaviours: replace the worker, or without a supervisor this process, if a restart is due."""
+        watchdog_reason = self.behaviour_manager.watchdog.restart_reason
+        if self.supervisor is not None:
+            reason = watchdog_reason or self.supervisor.restart_reason
+            if reason is not None:
+                self.supervisor.restart_worker(reason)
+        elif watchdog_reason is not None:
+            self.restart(watchdog_reason)
+
+    def restart(self, reason: str):
+        """Replace this process with a fresh instance; only call between behaviours."""
+        logger.warning("Restarting client: %s", reason)
+        self.stop()
+        # Unsent events and the log tail survive the restart; queued server commands are already spooled
+        event_stream.emit("client_restarting", reason=reason)
+        event_stream.spill()
+        if log_queue is not None:
+            log_queue.stop()
+        # The new process takes over the session lock and control endpoint
+        instance.release()
+
+        subprocess.Popen(restart_command(), cwd=os.getcwd())
+        if self.before_exit is not None:
+            try:
+                self.before_exit()
+            except Exception as e:
+                logger.error("Error before exiting: %s", e)
+        # Skips atexit, whose handlers belong to the old instance
+        os._exit(0)
 
     def get_config(self):
-        return self.config.copy()
+        return config_store.source()
 
     def get_behaviour_config(self, behaviour_id: str):
         try:
-            return self.config.get("automation", {}).get("behaviours", {}).get(behaviour_id, {}).copy()
+            return config_store.source().get("automation", {}).get("behaviours", {}).get(behaviour_id) or {}
         except Exception:
             return {}
 
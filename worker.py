@@ -0,0 +1,140 @@
+"""Entry module of the supervisor's worker processes (see :mod:`supervisor`).
+
+Workers are spawned, so everything the worker needs is imported in the new
+process.  This module keeps that to the behaviour runtime: no Qt, no server
+connection and no supervisor-side code.
+
+Workers log through their supervisor.  ``src.logger`` configures a worker
+without handlers (see ``WORKER_PROCESS_NAME``), and :func:`main` installs a
+:class:`PipeLogHandler` on the root logger that sends each record over the
+pipe.  The supervisor hands the records to its own handlers, so only one
+process writes and rotates the log file.
+
+Usage::
+
+    process = context.Process(target=worker.main, args=(child_conn, config), name=WORKER_PROCESS_NAME)
+"""
+
+from __future__ import annotations
+
+import logging
+import logging.handlers
+import os
+import threading
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Optional, Type
+
+from app_config import config_store
+from behaviour.behaviour import BaseBehaviour
+from behaviour.events import event_stream
+from behaviour.models import BehaviourOutcome
+from behaviour.registry import BEHAVIOURS
+from cleanup_manager import CleanupManager
+from lib.clock import clock
+from lib.email_manager.address_book import address_book
+from lib.replay import recorder
+from lib.selenium.command_profiler import command_profiler
+from lib.tracing import tracer
+from src.config.models.config import AppConfig
+from src.config.snapshot import ConfigValidationError
+from src.logger import app_logger
+
+# Seconds the worker loop waits for a command before checking the running behaviour again
+WORKER_POLL_INTERVAL: float = 0.2
+
+
+def configure_runtime(config: AppConfig) -> None:
+    """Configure the process-wide singletons from *config*; used by the main process and every worker."""
+    clock.configure(config.get("clock"))
+    tracer.configure(config.get("tracing"))
+    command_profiler.configure(config.get("profiling"))
+    event_stream.configure(config.get("events"))
+    recorder.configure(config.get("replay"))
+    address_book.configure(config.get("automation", {}).get("general", {}).get("address_book"))
+
+
+class PipeLogHandler(logging.handlers.QueueHandler):
+    """Sends log records to the supervisor, formatted and without traceback objects, as ``("log", record)``."""
+
+    def __init__(self, send: Callable[[tuple], None]):
+        super().__init__(None)
+        self.send = send
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self.send(("log", record))
+
+
+def _apply_config(config: dict[str, Any]) -> None:
+    try:
+        config_store.replace(config)
+    except ConfigValidationError as e:
+        app_logger.error(f"Worker rejected config update: {e}")
+
+
+def main(conn: Connection, config: dict[str, Any]) -> None:
+    """Worker process entry point.  Everything is imported by the time this runs, so "ready" means warm."""
+    send_lock = threading.Lock()
+
+    def send(message: tuple) -> None:
+        with send_lock:
+            conn.send(message)
+
+    logging.getLogger().addHandler(PipeLogHandler(send))
+    _apply_config(config)
+    configure_runtime(config)
+
+    event_stream.redirect(lambda event_type, fields: send(("event", event_type, fields)))
+    behaviour_classes: dict[str, Type[BaseBehaviour]] = {cls.id: cls for cls in BEHAVIOURS}
+    send(("ready", os.getpid()))
+
+    behaviour: Optional[BaseBehaviour] = None
+
+    def report(finished: BaseBehaviour) -> None:
+        outcome = finished.outcome or BehaviourOutcome.FAILED
+        send(
+            (
+                "finished",
+                finished.id,
+                outcome.value,
+                finished.error_type,
+                finished.trace_id,
+                finished.duration,
+                finished.cleanup_duration or 0.0,
+            )
+        )
+
+    while True:
+        if behaviour is not None and not behaviour.is_alive():
+            report(behaviour)
+            behaviour = None
+
+        try:
+            if not conn.poll(WORKER_POLL_INTERVAL):
+                continue
+            message = conn.recv()
+        except (EOFError, OSError):
+            # Supervisor is gone
+            message = ("exit",)
+
+        kind = message[0]
+        if kind == "run":
+            if behaviour is not None:
+                app_logger.error(f"Worker is busy with '{behaviour.id}', cannot run '{message[1]}'")
+                send(("finished", message[1], BehaviourOutcome.FAILED.value, "WorkerBusy", None, 0.0, 0.0))
+                continue
+            try:
+                behaviour = behaviour_classes[message[1]](cleanup_manager=CleanupManager())
+                behaviour.start()
+            except Exception as ex:
+                app_logger.error(f"Worker could not start '{message[1]}': {ex}", exc_info=True)
+                send(("finished", message[1], BehaviourOutcome.FAILED.value, type(ex).__name__, None, 0.0, 0.0))
+                behaviour = None
+        elif kind == "stop":
+            if behaviour is not None:
+                behaviour.stop(message[1])
+        elif kind == "config":
+            _apply_config(message[1])
+        elif kind == "exit":
+            if behaviour is not None:
+                behaviour.stop()
+            return